@@ -0,0 +1,32 @@
+"""add_candidates_phone_normalized_index
+
+Revision ID: 7f5c1b3d8e90
+Revises: e41b6d2f9c03
+Create Date: 2026-10-19 16:08:51.236447
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f5c1b3d8e90'
+down_revision: Union[str, None] = 'e41b6d2f9c03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Candidates are looked up by normalized phone number on every webhook
+    op.create_index(
+        'ix_candidates_phone_normalized',
+        'candidates',
+        [sa.text("regexp_replace(phone, '[^0-9+]', '', 'g')")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_candidates_phone_normalized', table_name='candidates')
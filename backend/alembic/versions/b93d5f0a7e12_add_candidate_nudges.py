@@ -0,0 +1,36 @@
+"""add_candidate_nudges
+
+Revision ID: b93d5f0a7e12
+Revises: 4a8e2d6f1c37
+Create Date: 2026-10-19 19:26:40.118352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b93d5f0a7e12'
+down_revision: Union[str, None] = '4a8e2d6f1c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('candidates', sa.Column('nudge_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('candidates', sa.Column('last_nudged_at', sa.DateTime(), nullable=True))
+    # Stalled conversations are swept by status, interview position and last activity
+    op.create_index(
+        'ix_candidates_status_current_question_updated_at',
+        'candidates',
+        ['status', 'current_question', 'updated_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_candidates_status_current_question_updated_at', table_name='candidates')
+    op.drop_column('candidates', 'last_nudged_at')
+    op.drop_column('candidates', 'nudge_count')
@@ -0,0 +1,29 @@
+"""add_webhook_event_claimed_at
+
+Revision ID: f3a9c6d2b814
+Revises: d7e4a1c9b305
+Create Date: 2026-10-19 21:42:35.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c6d2b814'
+down_revision: Union[str, None] = 'd7e4a1c9b305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing claims count from when they were created
+    op.add_column('webhook_event', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE webhook_event SET claimed_at = created_at")
+    op.alter_column('webhook_event', 'claimed_at', nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column('webhook_event', 'claimed_at')
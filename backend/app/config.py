@@ -30,6 +30,149 @@ class Settings(BaseSettings):
 
     OPENAI_API_KEY: str
 
+    # bcrypt runs in this many worker processes, verified JWT claims are cached for up to the TTL
+    PASSWORD_HASH_WORKERS: int = 2
+    TOKEN_CACHE_SIZE: int = 1024
+    TOKEN_CACHE_TTL_SECONDS: float = 60.0
+
+    # Provider API endpoints, pointed at local fakes by scripts/loadtest.py (empty: the provider's default)
+    TWILIO_API_BASE_URL: str = ""
+    VAPI_API_URL: str = "https://api.vapi.ai"
+    ELEVEN_LABS_API_URL: str = "https://api.elevenlabs.io"
+    OPENAI_BASE_URL: str = ""
+    RELEVANCE_AI_API_URL: str = ""
+    # Timeout for the VAPI call-creation request
+    VAPI_REQUEST_TIMEOUT_SECONDS: float = 15.0
+
+    # development or production, production logs plain JSON lines instead of rich console output
+    ENVIRONMENT: str = "development"
+
+    # Logging: level, format (auto, rich or json), share of verbose payloads logged, records buffered before dropping
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "auto"
+    LOG_PAYLOAD_SAMPLE_RATE: float = 0.05
+    LOG_QUEUE_SIZE: int = 10000
+
+    # Log every SQL statement
+    DB_ECHO: bool = False
+
+    # JSON backend for webhooks, responses and stored answers: auto, orjson or json
+    JSON_CODEC: str = "auto"
+
+    # Stage latency histograms, each worker writes a snapshot here that /metrics merges (default: a temp dir)
+    METRICS_DIR: str = ""
+    METRICS_FLUSH_SECONDS: float = 5.0
+
+    # How often questions.json is checked for changes
+    QUESTION_CATALOG_RELOAD_SECONDS: float = 2.0
+
+    # Minimum local normalizer confidence required to skip the LLM validation call
+    ANSWER_NORMALIZER_MIN_CONFIDENCE: float = 0.9
+
+    # LLM validation result cache shared across workers
+    VALIDATION_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    VALIDATION_CACHE_LRU_SIZE: int = 4096
+
+    # Background candidate evaluation
+    EVALUATION_BATCH_SIZE: int = 20
+    EVALUATION_BATCH_WAIT_SECONDS: float = 2.0
+    EVALUATION_CONCURRENCY: int = 4
+    EVALUATION_TIMEOUT_SECONDS: float = 30.0
+    # A batch that fails to evaluate or store is retried with backoff from this delay
+    EVALUATION_MAX_ATTEMPTS: int = 3
+    EVALUATION_RETRY_BASE_SECONDS: float = 5.0
+    # Interviews left "pending" this long lost their evaluation (e.g. to a restart) and are queued
+    # again, checked at start-up and then on this interval
+    EVALUATION_RECOVER_AFTER_SECONDS: float = 900.0
+    EVALUATION_RECOVER_INTERVAL_SECONDS: float = 300.0
+
+    # Inbound SMS turns slower than this are acknowledged and answered through the REST API,
+    # Twilio gives up on a webhook after 15 seconds
+    SMS_REPLY_BUDGET_SECONDS: float = 8.0
+    SMS_REPLY_LATENCY_WINDOW: int = 50
+
+    # Webhook deliveries remembered for deduplicating provider retries
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60
+    IDEMPOTENCY_LRU_SIZE: int = 4096
+    IDEMPOTENCY_WAIT_SECONDS: float = 5.0
+    # A claim still without a response after this long belongs to a dead worker and is taken over
+    IDEMPOTENCY_CLAIM_LEASE_SECONDS: float = 120.0
+
+    # Per-candidate conversation actors stop after this long without messages
+    CONVERSATION_ACTOR_IDLE_SECONDS: float = 300.0
+    # Turns holding a cross-worker conversation lock at once, each keeps one of the 15 pooled connections
+    CONVERSATION_LOCK_CONNECTIONS: int = 7
+
+    # Durable outbound message queue, a long code sends about one message per second.
+    # The batch is capped at half the sends a sender can make in one lease.
+    OUTBOUND_BATCH_SIZE: int = 50
+    OUTBOUND_POLL_SECONDS: float = 1.0
+    OUTBOUND_LEASE_SECONDS: float = 60.0
+    OUTBOUND_CONCURRENCY: int = 8
+    # Per worker, with N workers set it to the number's limit divided by N
+    OUTBOUND_SENDS_PER_SECOND: float = 1.0
+    OUTBOUND_MAX_ATTEMPTS: int = 6
+    OUTBOUND_BACKOFF_BASE_SECONDS: float = 2.0
+    OUTBOUND_BACKOFF_MAX_SECONDS: float = 300.0
+
+    # Retries of the first contact when every channel failed, only placed within UK contact hours.
+    # Retries falling due when the window opens are spread over CONTACT_WINDOW_SPREAD_SECONDS
+    CONTACT_RETRY_BATCH_SIZE: int = 20
+    CONTACT_RETRY_POLL_SECONDS: float = 30.0
+    CONTACT_RETRY_LEASE_SECONDS: float = 600.0
+    CONTACT_RETRY_CONCURRENCY: int = 4
+    CONTACT_RETRY_MAX_ATTEMPTS: int = 5
+    CONTACT_RETRY_BACKOFF_BASE_SECONDS: float = 900.0
+    CONTACT_RETRY_BACKOFF_MAX_SECONDS: float = 6 * 60 * 60
+    CONTACT_TIMEZONE: str = "Europe/London"
+    CONTACT_HOURS_START: int = 9
+    CONTACT_HOURS_END: int = 20
+    CONTACT_DAYS: str = "0,1,2,3,4,5"  # Monday to Saturday
+    CONTACT_WINDOW_SPREAD_SECONDS: float = 1800.0
+
+    # Reminders for SMS and WhatsApp conversations with no activity for NUDGE_STALL_SECONDS, sent during
+    # contact hours in batches of NUDGE_BATCH_SIZE every NUDGE_BATCH_INTERVAL_SECONDS
+    NUDGE_INTERVAL_SECONDS: float = 15 * 60
+    NUDGE_STALL_SECONDS: float = 24 * 60 * 60
+    NUDGE_MAX_PER_CANDIDATE: int = 2
+    NUDGE_BATCH_SIZE: int = 50
+    NUDGE_BATCH_INTERVAL_SECONDS: float = 60.0
+    NUDGE_MAX_PER_RUN: int = 500
+
+    # Answers of candidates finished this long ago move to compressed cold storage. Codec: auto, zstd or gzip
+    TRANSCRIPT_ARCHIVE_AFTER_SECONDS: float = 7 * 24 * 60 * 60
+    TRANSCRIPT_ARCHIVE_INTERVAL_SECONDS: float = 6 * 60 * 60
+    TRANSCRIPT_ARCHIVE_BATCH_SIZE: int = 100
+    TRANSCRIPT_ARCHIVE_CODEC: str = "auto"
+    TRANSCRIPT_CACHE_SIZE: int = 256
+    TRANSCRIPT_CACHE_TTL_SECONDS: float = 60 * 60
+
+    # How often status waiters read the event table when Postgres LISTEN is unavailable
+    STATUS_FALLBACK_POLL_SECONDS: float = 1.0
+    # Backoff between attempts to re-establish a dropped LISTEN connection
+    STATUS_LISTEN_RECONNECT_BASE_SECONDS: float = 1.0
+    STATUS_LISTEN_RECONNECT_MAX_SECONDS: float = 60.0
+
+    # VAPI webhook ingest queue
+    VAPI_INGEST_QUEUE_SIZE: int = 1000
+    VAPI_INGEST_PUT_TIMEOUT_SECONDS: float = 0.5
+    VAPI_INGEST_BATCH_SIZE: int = 100
+    VAPI_INGEST_BATCH_WAIT_SECONDS: float = 0.5
+
+    # Event loop lag sampling, the block detector captures the stack of code holding the loop past the threshold
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.5
+    LOOP_BLOCK_DETECTOR: bool = False
+    LOOP_BLOCK_THRESHOLD_SECONDS: float = 0.1
+    LOOP_BLOCK_REPORTS: int = 50
+    LOOP_BLOCK_STACK_DEPTH: int = 15
+
+    # On-demand request profiling, off while the token is empty. Profiles are kept in PROFILE_DIR (default: a temp dir).
+    # The same token guards the /api/qualification/metrics/* and transcript endpoints.
+    PROFILING_TOKEN: str = ""
+    PROFILE_DIR: str = ""
+    PROFILE_KEEP: int = 20
+    PROFILE_SAMPLE_INTERVAL_SECONDS: float = 0.001
+
 
 @lru_cache
 def get_settings():
@@ -3,6 +3,12 @@ from .user.model import UserModel
 from .user.service import UserService
 from .candidate.crud import CandidateCRUD
 from .candidate.model import CandidateModel
+from .validation_cache.model import ValidationCacheModel
+from .webhook_event.model import WebhookEventModel
+from .outbound_message.model import OutboundMessageModel
+from .twilio_status_event.model import TwilioStatusEventModel
+from .contact_retry.model import ContactRetryModel
+from .transcript_archive.model import TranscriptArchiveModel
 
 __all__ = [
     "BaseModel",
@@ -11,4 +17,10 @@ __all__ = [
     "UserService",
     "CandidateCRUD",
     "CandidateModel",
+    "ValidationCacheModel",
+    "WebhookEventModel",
+    "OutboundMessageModel",
+    "TwilioStatusEventModel",
+    "ContactRetryModel",
+    "TranscriptArchiveModel",
 ]
@@ -1,5 +1,11 @@
-from typing import Optional, List, Dict
+from typing import AsyncIterator, Awaitable, Callable, Optional, List, Dict, Sequence
+from contextlib import asynccontextmanager
+from datetime import datetime
+import json
+from app.util import json_codec
+from sqlalchemy import func, update
 from sqlalchemy.future import select
+from sqlalchemy.orm import load_only
 from app.database.config import async_session_maker
 from .model import CandidateModel
 
@@ -12,6 +18,15 @@ class CandidateCRUD:
     async def get_candidate_by_phone(phone: str) -> Optional[CandidateModel]:
         return await CandidateModel.get_by_phone(phone)
 
+    @staticmethod
+    async def get_candidates_by_phones(phones: List[str]) -> Dict[str, CandidateModel]:
+        return await CandidateModel.get_by_phones(phones)
+
+    @staticmethod
+    async def get_by_id(candidate_id: int) -> Optional[CandidateModel]:
+        async with async_session_maker() as session:
+            return await session.get(CandidateModel, candidate_id)
+
     @staticmethod
     async def get_candidate_by_email(email: str) -> Optional[CandidateModel]:
         return await CandidateModel.get_by_email(email)
@@ -50,4 +65,159 @@ class CandidateCRUD:
                     result = await refresh_session.execute(query)
                     return result.scalar_one_or_none()
                     
-            return None
\ No newline at end of file
+            return None
+
+    @staticmethod
+    async def get_candidates_by_ids(candidate_ids: List[int]) -> List[CandidateModel]:
+        async with async_session_maker() as session:
+            query = select(CandidateModel).where(CandidateModel.id.in_(candidate_ids))
+            result = await session.execute(query)
+            return result.scalars().all()
+
+    @staticmethod
+    async def bulk_store_evaluations(updates: List[Dict]) -> None:
+        """Write evaluation statuses and scores for many candidates in one transaction"""
+        if not updates:
+            return
+        by_id = {update["id"]: update for update in updates}
+        async with async_session_maker() as session:
+            query = select(CandidateModel).where(CandidateModel.id.in_(list(by_id)))
+            result = await session.execute(query)
+            for candidate in result.scalars().all():
+                update = by_id[candidate.id]
+                candidate.status = update["status"]
+                if "disqualification_reason" in update:
+                    candidate.disqualification_reason = update["disqualification_reason"]
+                if update.get("scores") is not None:
+                    try:
+                        current_answers = json_codec.loads(candidate.answers)
+                    except (json.JSONDecodeError, TypeError):
+                        current_answers = []
+                    current_answers.append({
+                        "evaluation_scores": update["scores"],
+                        "timestamp": datetime.utcnow().isoformat()
+                    })
+                    candidate.answers = json_codec.dumps(current_answers)
+            await session.commit()
+
+    @staticmethod
+    async def bulk_append_answers(
+        entries: Dict[int, List[Dict]], read_archive: Callable[[str], Awaitable[str]]
+    ) -> None:
+        """
+        Append answer entries to many candidates and mark them pending in one transaction.
+        A candidate whose answers were archived gets them back in the row, read
+        with ``read_archive``, so the re-evaluated answers are complete and are
+        archived again once the candidate is finished.
+        """
+        if not entries:
+            return
+        async with async_session_maker() as session:
+            query = select(CandidateModel).where(CandidateModel.id.in_(list(entries))).with_for_update()
+            result = await session.execute(query)
+            for candidate in result.scalars().all():
+                try:
+                    current_answers = json_codec.loads(candidate.answers)
+                except (json.JSONDecodeError, TypeError):
+                    current_answers = []
+                if candidate.answers_archive is not None:
+                    current_answers = json_codec.loads(await read_archive(candidate.answers_archive)) + current_answers
+                    candidate.answers_archive = None
+                current_answers.extend(entries[candidate.id])
+                candidate.answers = json_codec.dumps(current_answers)
+                candidate.status = "pending"
+            await session.commit()
+
+    @staticmethod
+    async def claim_unevaluated(stale_before: datetime, claimed_at: datetime) -> List[int]:
+        """
+        Ids of finished interviews still "pending" evaluation since before
+        ``stale_before``. Their updated_at moves to ``claimed_at`` in the same
+        statement, so workers sweeping at once never claim the same candidate.
+        """
+        statement = (
+            update(CandidateModel)
+            .where(CandidateModel.status == "pending", CandidateModel.updated_at < stale_before)
+            .values(updated_at=claimed_at)
+            .returning(CandidateModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        async with async_session_maker() as session:
+            result = await session.execute(statement)
+            await session.commit()
+            return list(result.scalars().all())
+
+    @staticmethod
+    async def stream_stalled_candidates(
+        statuses: Sequence[str],
+        channels: Sequence[str],
+        stalled_before: datetime,
+        max_nudges: int,
+        batch_size: int,
+        lock_key: int,
+    ) -> AsyncIterator[List[CandidateModel]]:
+        """
+        Candidates whose conversation hasn't moved since ``stalled_before``, in
+        batches read through a server-side cursor so the table is never loaded
+        at once. Only the columns needed to message them are loaded. The sweep
+        holds an advisory lock for its transaction, a worker that can't take it
+        gets nothing.
+        """
+        query = (
+            select(CandidateModel)
+            .options(load_only(
+                CandidateModel.id, CandidateModel.name, CandidateModel.phone, CandidateModel.status,
+                CandidateModel.current_question, CandidateModel.communication_method, CandidateModel.nudge_count,
+            ))
+            .where(
+                CandidateModel.status.in_(statuses),
+                CandidateModel.updated_at < stalled_before,
+                CandidateModel.communication_method.in_(channels),
+                CandidateModel.nudge_count < max_nudges,
+            )
+            .execution_options(yield_per=batch_size)
+        )
+        async with async_session_maker() as session:
+            locked = await session.scalar(select(func.pg_try_advisory_xact_lock(lock_key)))
+            if not locked:
+                return
+            result = await session.stream(query)
+            async for partition in result.scalars().partitions():
+                yield list(partition)
+
+    @staticmethod
+    @asynccontextmanager
+    async def conversation_lock(namespace: int, key: str) -> AsyncIterator[None]:
+        """
+        Hold an advisory lock on one conversation until the block exits. It is
+        scoped to a transaction on its own connection, so it is released when the
+        session closes even if the worker holding it fails.
+        """
+        async with async_session_maker() as session:
+            await session.execute(select(func.pg_advisory_xact_lock(namespace, func.hashtext(key))))
+            yield
+
+    @staticmethod
+    async def record_nudges(candidate_ids: List[int], nudged_at: datetime) -> None:
+        """Count a nudge for many candidates in one statement, which also restarts their stall timer"""
+        if not candidate_ids:
+            return
+        statement = (
+            update(CandidateModel)
+            .where(CandidateModel.id.in_(candidate_ids))
+            .values(nudge_count=CandidateModel.nudge_count + 1, last_nudged_at=nudged_at, updated_at=nudged_at)
+        )
+        async with async_session_maker() as session:
+            await session.execute(statement)
+            await session.commit()
+
+    @staticmethod
+    async def storage_stats() -> Dict[str, int]:
+        """Bytes held by live answers, and the candidates table on disk including TOAST and indexes"""
+        async with async_session_maker() as session:
+            result = await session.execute(select(
+                func.coalesce(func.sum(func.pg_column_size(CandidateModel.answers)), 0),
+                func.pg_total_relation_size(CandidateModel.__tablename__),
+            ))
+            answers_bytes, table_bytes = result.one()
+            return {"answers_bytes": int(answers_bytes), "table_bytes": int(table_bytes)}
@@ -1,14 +1,21 @@
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from sqlmodel import Field
 from app.database.base.model import BaseModel, TimeStampMixin
-from sqlalchemy import select, func
+from sqlalchemy import Index, select, func
 from app.database.config import async_session_maker
+from app.util import json_codec
+from app.util.logging import log_event, timed
 import json
+import logging
 from uuid import UUID, uuid4
 
 class CandidateModel(BaseModel, TimeStampMixin, table=True):
     __tablename__ = "candidates"
+    __table_args__ = (
+        # Stalled conversation sweep, see CandidateCRUD.stream_stalled_candidates
+        Index("ix_candidates_status_current_question_updated_at", "status", "current_question", "updated_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True, nullable=False)
     uuid: UUID = Field(default_factory=uuid4, nullable=False)  # Generate UUID automatically
@@ -18,13 +25,17 @@ class CandidateModel(BaseModel, TimeStampMixin, table=True):
     status: str = Field(default="registered")
     current_question: int = Field(default=0)
     answers: str = Field(default='[]')  # Store answers as JSON string
+    answers_archive: Optional[str] = Field(default=None)  # Digest of the archived answers, see transcript_archive
     disqualification_reason: Optional[str] = Field(default=None)
     communication_method: Optional[str] = Field(default=None)
+    nudge_count: int = Field(default=0)  # Reminders sent while the conversation was stalled
+    last_nudged_at: Optional[datetime] = Field(default=None)
 
     class Config:
         from_attributes = True
 
     @classmethod
+    @timed("db.candidate.create")
     async def create(cls, **kwargs) -> "CandidateModel":
         async with async_session_maker() as session:
             candidate = cls(**kwargs)
@@ -33,37 +44,68 @@ class CandidateModel(BaseModel, TimeStampMixin, table=True):
             await session.refresh(candidate)
             return candidate
 
+    @staticmethod
+    def normalize_phone(phone: str) -> str:
+        """Phone number without any characters other than digits and plus signs"""
+        return ''.join(char for char in phone if char.isdigit() or char == '+')
+
+    @classmethod
+    def normalized_phone_column(cls):
+        # Matches the ix_candidates_phone_normalized expression index
+        return func.regexp_replace(cls.phone, '[^0-9+]', '', 'g')
+
     @classmethod
+    @timed("db.candidate.get_by_phone")
     async def get_by_phone(cls, phone: str) -> Optional["CandidateModel"]:
         # Normalize phone number by removing all non-digit and plus characters
-        normalized_phone = ''.join(char for char in phone if char.isdigit() or char == '+')
+        normalized_phone = cls.normalize_phone(phone)
         
         async with async_session_maker() as session:
             # Also normalize the stored phone numbers in the query
-            query = select(cls).where(
-                func.regexp_replace(cls.phone, '[^0-9+]', '', 'g') == normalized_phone
-            )
+            query = select(cls).where(cls.normalized_phone_column() == normalized_phone)
             result = await session.execute(query)
             return result.scalar_one_or_none()
 
     @classmethod
+    @timed("db.candidate.get_by_phones")
+    async def get_by_phones(cls, phones: List[str]) -> Dict[str, "CandidateModel"]:
+        """Candidates for many phone numbers in one query, keyed by normalized number"""
+        normalized = {cls.normalize_phone(phone) for phone in phones}
+        async with async_session_maker() as session:
+            query = select(cls).where(cls.normalized_phone_column().in_(normalized))
+            result = await session.execute(query)
+            return {cls.normalize_phone(c.phone): c for c in result.scalars().all()}
+
+    @classmethod
+    @timed("db.candidate.get_by_email")
     async def get_by_email(cls, email: str) -> Optional["CandidateModel"]:
         async with async_session_maker() as session:
             query = select(cls).where(cls.email == email)
             result = await session.execute(query)
             return result.scalar_one_or_none()
 
+    @timed("db.candidate.save")
     async def save(self) -> None:
         async with async_session_maker() as session:
             session.add(self)
             await session.commit()
             await session.refresh(self)
 
+    def get_answers(self) -> List[Dict]:
+        """
+        Parsed answers, an unreadable column is treated as empty. Archived
+        answers are read with ``transcript_archive.answers``.
+        """
+        try:
+            return json_codec.loads(self.answers)
+        except (json.JSONDecodeError, TypeError):
+            return []
+
     async def store_answer(self, question_number: int, answer: str) -> None:
         """Store candidate's answer as part of JSON string array"""
         try:
             # Parse current answers
-            current_answers = json.loads(self.answers)
+            current_answers = json_codec.loads(self.answers)
         except json.JSONDecodeError:
             current_answers = []
         
@@ -75,18 +117,18 @@ class CandidateModel(BaseModel, TimeStampMixin, table=True):
         })
         
         # Convert back to string
-        self.answers = json.dumps(current_answers)
+        self.answers = json_codec.dumps(current_answers)
         await self.save()
 
     async def store_evaluation_scores(self, scores: Dict[str, float]) -> None:
         """Store AI evaluation scores"""
         try:
-            current_answers = json.loads(self.answers)
+            current_answers = json_codec.loads(self.answers)
             current_answers.append({
                 "evaluation_scores": scores,
                 "timestamp": datetime.utcnow().isoformat()
             })
-            self.answers = json.dumps(current_answers)
+            self.answers = json_codec.dumps(current_answers)
             await self.save()
         except Exception as e:
-            print(f"Error storing evaluation scores: {str(e)}")
\ No newline at end of file
+            log_event("evaluation_scores_store_error", logging.ERROR, candidate_id=self.id, error=str(e))
\ No newline at end of file
@@ -13,7 +13,7 @@ db_engine = create_async_engine(
     poolclass=AsyncAdaptedQueuePool,
     pool_size=5,
     max_overflow=10,
-    echo=True,
+    echo=settings.DB_ECHO,
 )
 
 async_session_maker = sessionmaker(
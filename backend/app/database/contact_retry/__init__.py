@@ -0,0 +1,3 @@
+from .model import ContactRetryModel
+
+__all__ = ['ContactRetryModel']
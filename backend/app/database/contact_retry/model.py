@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from uuid import UUID, uuid4
+from sqlmodel import Field
+from sqlalchemy import Index, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from app.database.base.model import BaseModel, TimeStampMixin
+from app.database.config import async_session_maker
+
+
+class ContactRetryModel(BaseModel, TimeStampMixin, table=True):
+    """
+    Scheduled retries of the first contact with a candidate.
+
+    Attributes:
+
+        candidate_id: Candidate to contact, at most one job per candidate.
+
+        status: ``queued``, ``running``, ``done`` or ``failed``.
+
+        attempts: Number of retries made so far.
+
+        next_attempt_at: When a queued job is due, or when the lease of a running job runs out.
+
+        last_error: Outcome of the last failed attempt.
+    """
+
+    __tablename__ = "contact_retry"
+    __table_args__ = (
+        Index("ix_contact_retry_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True, nullable=False)
+    uuid: UUID = Field(default_factory=uuid4, nullable=False)
+    candidate_id: int = Field(nullable=False, unique=True, index=True)
+    status: str = Field(default="queued", nullable=False)
+    attempts: int = Field(default=0, nullable=False)
+    next_attempt_at: datetime = Field(default_factory=datetime.now, nullable=False)
+    last_error: Optional[str] = Field(default=None, nullable=True)
+
+    @classmethod
+    async def schedule(cls, candidate_id: int, run_at: datetime) -> bool:
+        """
+        Queue a retry for the candidate, False when one is already queued or
+        running. A finished job is started over.
+        """
+        now = datetime.now()
+        statement = insert(cls).values(
+            uuid=uuid4(), candidate_id=candidate_id, status="queued", attempts=0,
+            next_attempt_at=run_at, created_at=now, updated_at=now,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[cls.candidate_id],
+            set_={"status": "queued", "attempts": 0, "next_attempt_at": run_at, "last_error": None, "updated_at": now},
+            where=cls.status.in_(("done", "failed")),
+        ).returning(cls.id)
+        async with async_session_maker() as session:
+            result = await session.execute(statement)
+            await session.commit()
+            return result.scalar_one_or_none() is not None
+
+    @classmethod
+    async def claim_due(cls, limit: int, lease: float) -> List["ContactRetryModel"]:
+        """
+        Lease up to ``limit`` due jobs, oldest first. Rows locked by another
+        worker are skipped, and jobs whose lease ran out are picked up again.
+        """
+        now = datetime.now()
+        due = (
+            select(cls.id)
+            .where(cls.status.in_(("queued", "running")), cls.next_attempt_at <= now)
+            .order_by(cls.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        statement = (
+            update(cls)
+            .where(cls.id.in_(due))
+            .values(status="running", next_attempt_at=now + timedelta(seconds=lease), updated_at=now)
+            .returning(cls)
+            .execution_options(synchronize_session=False)
+        )
+        async with async_session_maker() as session:
+            result = await session.execute(statement)
+            jobs = sorted(result.scalars().all(), key=lambda j: j.id)
+            await session.commit()
+            return jobs
+
+    @classmethod
+    async def bulk_record_results(cls, results: List[Dict]) -> None:
+        """Write the outcome of a batch of attempts in one transaction, each dict holds the id and changed columns"""
+        if not results:
+            return
+        now = datetime.now()
+        async with async_session_maker() as session:
+            await session.execute(update(cls), [{**r, "updated_at": now} for r in results])
+            await session.commit()
+
+    @classmethod
+    async def counts_by_status(cls) -> Dict[str, int]:
+        async with async_session_maker() as session:
+            result = await session.execute(select(cls.status, func.count()).group_by(cls.status))
+            return {status: count for status, count in result.all()}
@@ -0,0 +1,3 @@
+from .model import OutboundMessageModel
+
+__all__ = ['OutboundMessageModel']
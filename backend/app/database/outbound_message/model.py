@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from uuid import UUID, uuid4
+from sqlmodel import Field
+from sqlalchemy import Index, func, select, update
+from app.database.base.model import BaseModel, TimeStampMixin
+from app.database.config import async_session_maker
+
+
+class OutboundMessageModel(BaseModel, TimeStampMixin, table=True):
+    """
+    Durable queue of outbound SMS and WhatsApp messages.
+
+    Attributes:
+
+        candidate_id: Candidate the message is for, None for replies to unknown numbers.
+
+        to_number: Recipient in Twilio format, ``whatsapp:`` prefixed for WhatsApp.
+
+        from_number: Sender in Twilio format.
+
+        body: Message text.
+
+        status: ``queued``, ``sending``, ``sent`` or ``failed``.
+
+        attempts: Number of send attempts made so far.
+
+        next_attempt_at: When a queued message is due, or when the lease of a message being sent runs out.
+
+        sid: Twilio message SID once sent.
+
+        last_error: Error of the last failed attempt.
+    """
+
+    __tablename__ = "outbound_message"
+    __table_args__ = (
+        Index("ix_outbound_message_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True, nullable=False)
+    uuid: UUID = Field(default_factory=uuid4, nullable=False)
+    candidate_id: Optional[int] = Field(default=None, nullable=True, index=True)
+    to_number: str = Field(nullable=False)
+    from_number: str = Field(nullable=False)
+    body: str = Field(nullable=False)
+    status: str = Field(default="queued", nullable=False)
+    attempts: int = Field(default=0, nullable=False)
+    next_attempt_at: datetime = Field(default_factory=datetime.now, nullable=False)
+    sid: Optional[str] = Field(default=None, nullable=True, index=True)
+    last_error: Optional[str] = Field(default=None, nullable=True)
+
+    @classmethod
+    async def enqueue(cls, to_number: str, from_number: str, body: str, candidate_id: Optional[int] = None) -> "OutboundMessageModel":
+        async with async_session_maker() as session:
+            message = cls(candidate_id=candidate_id, to_number=to_number, from_number=from_number, body=body)
+            session.add(message)
+            await session.commit()
+            await session.refresh(message)
+            return message
+
+    @classmethod
+    async def claim_due(cls, limit: int, lease: float) -> List["OutboundMessageModel"]:
+        """
+        Lease up to ``limit`` due messages in queue order. Rows locked by another
+        worker are skipped, and messages whose lease ran out are picked up again.
+        """
+        now = datetime.now()
+        due = (
+            select(cls.id)
+            .where(cls.status.in_(("queued", "sending")), cls.next_attempt_at <= now)
+            .order_by(cls.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        statement = (
+            update(cls)
+            .where(cls.id.in_(due))
+            .values(status="sending", next_attempt_at=now + timedelta(seconds=lease), updated_at=now)
+            .returning(cls)
+            .execution_options(synchronize_session=False)
+        )
+        async with async_session_maker() as session:
+            result = await session.execute(statement)
+            messages = sorted(result.scalars().all(), key=lambda m: m.id)
+            await session.commit()
+            return messages
+
+    @classmethod
+    async def bulk_record_results(cls, results: List[Dict]) -> None:
+        """Write the outcome of a batch of send attempts in one transaction, each dict holds the id and changed columns"""
+        if not results:
+            return
+        now = datetime.now()
+        async with async_session_maker() as session:
+            await session.execute(update(cls), [{**r, "updated_at": now} for r in results])
+            await session.commit()
+
+    @classmethod
+    async def counts_by_status(cls) -> Dict[str, int]:
+        async with async_session_maker() as session:
+            result = await session.execute(select(cls.status, func.count()).group_by(cls.status))
+            return {status: count for status, count in result.all()}
@@ -0,0 +1,3 @@
+from .model import TranscriptArchiveModel
+
+__all__ = ['TranscriptArchiveModel']
@@ -0,0 +1,104 @@
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+from uuid import UUID, uuid4
+from sqlmodel import Field
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.base.model import BaseModel, CreatedAtOnlyTimeStampMixin
+from app.database.candidate.model import CandidateModel
+from app.database.config import async_session_maker
+
+
+class TranscriptArchiveModel(BaseModel, CreatedAtOnlyTimeStampMixin, table=True):
+    """
+    Compressed answers of finished interviews, content addressed.
+
+    Attributes:
+
+        digest: SHA-256 of the uncompressed answers, referenced by ``candidates.answers_archive``.
+
+        codec: Compression used for ``data``, ``zstd`` or ``gzip``.
+
+        data: Compressed answers JSON.
+
+        raw_bytes: Size of the answers before compression.
+
+        stored_bytes: Size of ``data``.
+    """
+
+    __tablename__ = "transcript_archive"
+
+    digest: str = Field(primary_key=True, nullable=False)
+    uuid: UUID = Field(default_factory=uuid4, nullable=False)
+    codec: str = Field(nullable=False)
+    data: bytes = Field(nullable=False)
+    raw_bytes: int = Field(nullable=False)
+    stored_bytes: int = Field(nullable=False)
+
+    @classmethod
+    async def store_many(cls, session: AsyncSession, rows: List[Dict]) -> None:
+        """Insert archive rows in the caller's transaction, identical content is stored once"""
+        if not rows:
+            return
+        now = datetime.now()
+        statement = insert(cls).values([{**row, "uuid": uuid4(), "created_at": now} for row in rows])
+        await session.execute(statement.on_conflict_do_nothing(index_elements=[cls.digest]))
+
+    @classmethod
+    async def archive_batch(
+        cls,
+        statuses: Sequence[str],
+        finished_before: datetime,
+        limit: int,
+        pack: Callable[[List[str]], Awaitable[List[Dict]]],
+    ) -> List[Dict]:
+        """
+        Move the answers of up to ``limit`` finished candidates into the archive.
+
+        ``pack`` turns the answers into archive rows, one per candidate in
+        order. The rows are stored and the candidates left with a reference in
+        the same transaction, so answers are never without a copy. Candidates
+        locked by another worker are skipped. Returns the packed rows.
+        """
+        query = (
+            select(CandidateModel.id, CandidateModel.answers)
+            .where(
+                CandidateModel.status.in_(statuses),
+                CandidateModel.answers_archive.is_(None),
+                CandidateModel.answers != "[]",
+                CandidateModel.updated_at < finished_before,
+            )
+            .order_by(CandidateModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        async with async_session_maker() as session:
+            candidates = (await session.execute(query)).all()
+            if not candidates:
+                return []
+            rows = await pack([answers for _, answers in candidates])
+            await cls.store_many(session, list({row["digest"]: row for row in rows}.values()))
+            # Archiving isn't activity, updated_at is left alone
+            await session.execute(
+                update(CandidateModel.__table__)
+                .where(CandidateModel.__table__.c.id == bindparam("candidate_id"))
+                .values(answers="[]", answers_archive=bindparam("digest")),
+                [{"candidate_id": candidate_id, "digest": row["digest"]} for (candidate_id, _), row in zip(candidates, rows)],
+            )
+            await session.commit()
+            return rows
+
+    @classmethod
+    async def get(cls, digest: str) -> Optional["TranscriptArchiveModel"]:
+        async with async_session_maker() as session:
+            return await session.get(cls, digest)
+
+    @classmethod
+    async def totals(cls) -> Dict[str, int]:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(func.count(), func.coalesce(func.sum(cls.raw_bytes), 0), func.coalesce(func.sum(cls.stored_bytes), 0))
+            )
+            count, raw, stored = result.one()
+            return {"transcripts": count, "raw_bytes": int(raw), "stored_bytes": int(stored)}
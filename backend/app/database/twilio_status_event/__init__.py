@@ -0,0 +1,3 @@
+from .model import TwilioStatusEventModel, STATUS_CHANNEL
+
+__all__ = ['TwilioStatusEventModel', 'STATUS_CHANNEL']
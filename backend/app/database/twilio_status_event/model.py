@@ -0,0 +1,52 @@
+from typing import Optional
+from uuid import UUID, uuid4
+from sqlmodel import Field
+from sqlalchemy import select, text
+from app.database.base.model import BaseModel, CreatedAtOnlyTimeStampMixin
+from app.database.config import async_session_maker
+
+# Postgres channel every recorded status is announced on, the payload is "<sid>:<status>"
+STATUS_CHANNEL = "twilio_status"
+
+
+class TwilioStatusEventModel(BaseModel, CreatedAtOnlyTimeStampMixin, table=True):
+    """
+    Status transitions reported by Twilio's message and call status callbacks.
+
+    Attributes:
+
+        sid: Message or call SID.
+
+        kind: ``message`` or ``call``.
+
+        status: MessageStatus or CallStatus from the callback.
+
+        error_code: Twilio error code reported with failed and undelivered messages.
+    """
+
+    __tablename__ = "twilio_status_event"
+
+    id: Optional[int] = Field(default=None, primary_key=True, nullable=False)
+    uuid: UUID = Field(default_factory=uuid4, nullable=False)
+    sid: str = Field(nullable=False, index=True)
+    kind: str = Field(nullable=False)
+    status: str = Field(nullable=False)
+    error_code: Optional[str] = Field(default=None, nullable=True)
+
+    @classmethod
+    async def record(cls, sid: str, kind: str, status: str, error_code: Optional[str] = None) -> None:
+        """Store a transition and notify listeners in the same transaction"""
+        async with async_session_maker() as session:
+            session.add(cls(sid=sid, kind=kind, status=status, error_code=error_code))
+            await session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": STATUS_CHANNEL, "payload": f"{sid}:{status}"},
+            )
+            await session.commit()
+
+    @classmethod
+    async def latest_status(cls, sid: str) -> Optional[str]:
+        async with async_session_maker() as session:
+            query = select(cls.status).where(cls.sid == sid).order_by(cls.id.desc()).limit(1)
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
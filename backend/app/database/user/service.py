@@ -1,8 +1,8 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from sqlmodel import select
 from sqlalchemy import desc
-from sqlalchemy.exc import NoResultFound
+from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 
 from app.database.base.service import BaseService
 from app.util import AuthUtil
@@ -14,9 +14,22 @@ class UserService(BaseService):
         super().__init__(**kwargs)
 
     async def add_user(self, user: UserModel):
-        user.password = AuthUtil.get_password_hash(user.password)
+        user.password = await AuthUtil.get_password_hash_async(user.password)
         await user.save(db_session=self.db_session)
         return user
+
+    async def add_users(self, users: List[UserModel]):
+        """Provision many users, passwords are hashed in parallel and the rows inserted in one commit"""
+        hashes = await AuthUtil.get_password_hashes([user.password for user in users])
+        for user, hashed in zip(users, hashes):
+            user.password = hashed
+        try:
+            self.db_session.add_all(users)
+            await self.db_session.commit()
+        except SQLAlchemyError as ex:
+            await self.db_session.rollback()
+            raise ex
+        return users
     
     async def get_users(self, uuid: Optional[UUID] = None):
         statement = select(UserModel)
@@ -55,6 +68,6 @@ class UserService(BaseService):
         result = await self.db_session.exec(statement)
         user = result.first()
         
-        if not user or not AuthUtil.verify_password(password, user.password):
+        if not user or not await AuthUtil.verify_password_async(password, user.password):
             return False
         return user
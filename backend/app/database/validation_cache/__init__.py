@@ -0,0 +1,3 @@
+from .model import ValidationCacheModel
+
+__all__ = ['ValidationCacheModel']
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID, uuid4
+from sqlmodel import Field
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
+from app.database.base.model import BaseModel, CreatedAtOnlyTimeStampMixin
+from app.database.config import async_session_maker
+
+
+class ValidationCacheModel(BaseModel, CreatedAtOnlyTimeStampMixin, table=True):
+    """
+    Shared cache of LLM answer validation results.
+
+    Attributes:
+
+        key: Hash of (kind, question id, prompt version, normalized answer).
+
+        question_id: Question the answer belongs to.
+
+        prompt_version: Version of questions.json and prompt templates the result was produced with.
+
+        answer: Case-folded, whitespace-normalized answer.
+
+        result: JSON encoded validation result.
+
+        expires_at: Time after which the entry is ignored and purged.
+    """
+
+    __tablename__ = "validation_cache"
+
+    key: str = Field(primary_key=True, nullable=False)
+    uuid: UUID = Field(default_factory=uuid4, nullable=False)
+    question_id: str = Field(nullable=False)
+    prompt_version: str = Field(nullable=False)
+    answer: str = Field(nullable=False)
+    result: str = Field(nullable=False)
+    expires_at: datetime = Field(nullable=False, index=True)
+
+    @classmethod
+    async def get_valid(cls, key: str) -> Optional["ValidationCacheModel"]:
+        async with async_session_maker() as session:
+            query = select(cls).where(cls.key == key, cls.expires_at > datetime.now())
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
+
+    @classmethod
+    async def upsert(cls, key: str, question_id: str, prompt_version: str, answer: str, result: str, ttl: int) -> None:
+        now = datetime.now()
+        values = {
+            "key": key,
+            "uuid": uuid4(),
+            "question_id": question_id,
+            "prompt_version": prompt_version,
+            "answer": answer,
+            "result": result,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=ttl),
+        }
+        statement = insert(cls).values(**values).on_conflict_do_update(
+            index_elements=[cls.key],
+            set_={k: values[k] for k in ("result", "created_at", "expires_at")},
+        )
+        async with async_session_maker() as session:
+            await session.execute(statement)
+            await session.commit()
+
+    @classmethod
+    async def purge_expired(cls) -> int:
+        async with async_session_maker() as session:
+            result = await session.execute(delete(cls).where(cls.expires_at <= datetime.now()))
+            await session.commit()
+            return result.rowcount
@@ -0,0 +1,3 @@
+from .model import WebhookEventModel
+
+__all__ = ['WebhookEventModel']
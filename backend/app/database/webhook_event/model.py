@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Set
+from uuid import UUID, uuid4
+from sqlmodel import Field
+from sqlalchemy import select, delete, update
+from sqlalchemy.dialects.postgresql import insert
+from app.database.base.model import BaseModel, CreatedAtOnlyTimeStampMixin
+from app.database.config import async_session_maker
+
+
+class WebhookEventModel(BaseModel, CreatedAtOnlyTimeStampMixin, table=True):
+    """
+    Provider webhook events that have been claimed for processing.
+
+    Attributes:
+
+        key: Provider event id, e.g. ``twilio:sms:<MessageSid>`` or ``vapi:<message id>``.
+
+        response: Response body returned for the event, None while it is being processed.
+
+        claimed_at: When the event was last claimed, a claim without a response older
+        than the lease is taken over by the next delivery.
+
+        expires_at: Time after which the event is forgotten and purged.
+    """
+
+    __tablename__ = "webhook_event"
+
+    key: str = Field(primary_key=True, nullable=False)
+    uuid: UUID = Field(default_factory=uuid4, nullable=False)
+    response: Optional[str] = Field(default=None, nullable=True)
+    claimed_at: datetime = Field(default_factory=datetime.now, nullable=False)
+    expires_at: datetime = Field(nullable=False, index=True)
+
+    @classmethod
+    async def claim(cls, key: str, ttl: int, lease: float) -> bool:
+        """
+        Insert the event, False when it has already been claimed. A claim that has
+        gone without a response for longer than ``lease`` seconds, its worker having
+        died, is taken over.
+        """
+        now = datetime.now()
+        expires_at = now + timedelta(seconds=ttl)
+        statement = insert(cls).values(
+            key=key, uuid=uuid4(), created_at=now, claimed_at=now, expires_at=expires_at
+        ).on_conflict_do_update(
+            index_elements=[cls.key],
+            set_={"claimed_at": now, "expires_at": expires_at},
+            where=cls.response.is_(None) & (cls.claimed_at < now - timedelta(seconds=lease)),
+        ).returning(cls.key)
+        async with async_session_maker() as session:
+            result = await session.execute(statement)
+            await session.commit()
+            return result.scalar_one_or_none() is not None
+
+    @classmethod
+    async def claim_many(cls, keys: List[str], ttl: int, lease: float) -> Set[str]:
+        """Insert many events at once, returns the keys that weren't claimed before or whose claim went stale"""
+        if not keys:
+            return set()
+        now = datetime.now()
+        expires_at = now + timedelta(seconds=ttl)
+        rows = [
+            {"key": key, "uuid": uuid4(), "created_at": now, "claimed_at": now, "expires_at": expires_at}
+            for key in keys
+        ]
+        statement = insert(cls).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[cls.key],
+            set_={"claimed_at": now, "expires_at": expires_at},
+            where=cls.response.is_(None) & (cls.claimed_at < now - timedelta(seconds=lease)),
+        ).returning(cls.key)
+        async with async_session_maker() as session:
+            result = await session.execute(statement)
+            await session.commit()
+            return set(result.scalars().all())
+
+    @classmethod
+    async def get_by_key(cls, key: str) -> Optional["WebhookEventModel"]:
+        async with async_session_maker() as session:
+            result = await session.execute(select(cls).where(cls.key == key))
+            return result.scalar_one_or_none()
+
+    @classmethod
+    async def complete(cls, key: str, response: str) -> None:
+        async with async_session_maker() as session:
+            await session.execute(update(cls).where(cls.key == key).values(response=response))
+            await session.commit()
+
+    @classmethod
+    async def complete_many(cls, keys: List[str], response: str) -> None:
+        if not keys:
+            return
+        async with async_session_maker() as session:
+            await session.execute(update(cls).where(cls.key.in_(keys)).values(response=response))
+            await session.commit()
+
+    @classmethod
+    async def release(cls, key: str) -> None:
+        """Forget a claimed event whose processing failed so the provider's retry is processed"""
+        await cls.release_many([key])
+
+    @classmethod
+    async def release_many(cls, keys: List[str]) -> None:
+        if not keys:
+            return
+        async with async_session_maker() as session:
+            await session.execute(delete(cls).where(cls.key.in_(keys), cls.response.is_(None)))
+            await session.commit()
+
+    @classmethod
+    async def purge_expired(cls) -> int:
+        async with async_session_maker() as session:
+            result = await session.execute(delete(cls).where(cls.expires_at <= datetime.now()))
+            await session.commit()
+            return result.rowcount
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+from typing import List, Optional
+from app.util.profiling import is_authorized, profile_store
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_profiling_token(token: Optional[str]) -> None:
+    if not is_authorized(token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+async def verify_profiling_token(x_profiling_token: Optional[str] = Header(None)) -> None:
+    """Route dependency for operator-only endpoints outside this router"""
+    require_profiling_token(x_profiling_token)
+
+@router.get("/profiles")
+async def list_profiles(x_profiling_token: Optional[str] = Header(None)) -> List[dict]:
+    """List stored request profiles, newest first"""
+    require_profiling_token(x_profiling_token)
+    return profile_store.list()
+
+@router.get("/profiles/{name}")
+async def download_profile(name: str, x_profiling_token: Optional[str] = Header(None)):
+    """Download a profile, .html from pyinstrument or .prof (pstats) from cProfile"""
+    require_profiling_token(x_profiling_token)
+    path = profile_store.path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=name)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Response, Request
+from fastapi import APIRouter, Depends, HTTPException, Response, Request
 from typing import Dict, List
 from app.database.candidate import CandidateCRUD, CandidateModel
 from app.util.interview_bot import InterviewBot
@@ -6,12 +6,29 @@ from app.schemas.candidate import CandidateCreate, CandidateResponse, CandidateQ
 from twilio.twiml.voice_response import VoiceResponse, Gather
 from twilio.twiml.messaging_response import MessagingResponse
 from app.util.voice_generator import VoiceGenerator
+from app.util.idempotency import IdempotencyStore, UnrecordedResponse
+from app.util.status_tracker import is_valid_twilio_request
+from app.util.vapi_ingest import VapiIngestQueue
+from app.util import json_codec
+from app.util.metrics import TimedRoute
+from app.util.loop_monitor import loop_monitor
+from app.util.transcript_archive import transcript_archive
+from app.util.logging import bind_candidate, log_event, log_payload
+from app.routers.admin import verify_profiling_token
+from uuid import uuid4
 import json
+import logging
 from datetime import datetime
 
-router = APIRouter(prefix="/qualification", tags=["qualification"])
+router = APIRouter(prefix="/qualification", tags=["qualification"], route_class=TimedRoute)
 interview_bot = InterviewBot()
 voice_generator = VoiceGenerator()
+idempotency = IdempotencyStore()
+vapi_ingest = VapiIngestQueue(interview_bot, idempotency)
+
+def voice_response_action() -> str:
+    """Gather action URL, the sequence number tells a retried callback apart from the next answer"""
+    return f"/api/qualification/webhook/voice/response?seq={uuid4().hex[:12]}"
 
 @router.post("/register", response_model=CandidateResponse)
 async def register_candidate(candidate_data: CandidateCreate):
@@ -27,12 +44,12 @@ async def register_candidate(candidate_data: CandidateCreate):
         if existing_candidate:
             raise HTTPException(status_code=400, detail="Candidate already registered with this phone number")
 
-        print("Creating candidate")
         # Create candidate
         candidate = await CandidateCRUD.create_candidate(candidate_data.dict())
+        bind_candidate(candidate.id)
+        log_event("candidate_registered")
 
         # Start qualification process with fallback methods
-        print("Starting qualification process")
         qualification_status = await interview_bot.start_qualification_process(candidate)
         
         if qualification_status["status"] == "success":
@@ -42,6 +59,7 @@ async def register_candidate(candidate_data: CandidateCreate):
                 data=CandidateInDB.from_orm(candidate)
             )
         else:
+            await interview_bot.contact_retries.schedule(candidate.id)
             return CandidateResponse(
                 status="error",
                 message="Registration successful but couldn't initiate contact. We will try again shortly.",
@@ -70,17 +88,17 @@ async def voice_webhook(request: Request):
         else:
             response.say("Sorry, we couldn't find your registration. Please register first.")
         return Response(content=str(response), media_type="application/xml")
+    bind_candidate(candidate.id)
 
     # Handle different stages of the voice interview
     if candidate.current_question == 0:
         welcome_text = "Welcome to the qualification interview. Press 1 to begin."
         voice_url = await voice_generator.generate_speech(welcome_text)
-        print(f"Voice URL: {voice_url}")
         
         gather = Gather(
             input='dtmf',
             num_digits=1, 
-            action="/api/qualification/webhook/voice/response",
+            action=voice_response_action(),
             method='GET',
             timeout=10
         )
@@ -93,11 +111,11 @@ async def voice_webhook(request: Request):
     else:
         # Continue with current question
         question = interview_bot.get_question(candidate.current_question)
-        voice_url = await voice_generator.generate_speech(question['text'])
+        voice_url = await voice_generator.generate_speech(question.tts_text)
         
         gather = Gather(
             input='speech',
-            action="/api/qualification/webhook/voice/response",
+            action=voice_response_action(),
             method='GET',
             timeout=3,
             language='en-GB'
@@ -106,7 +124,7 @@ async def voice_webhook(request: Request):
         if voice_url:
             gather.play(voice_url)
         else:
-            gather.say(question['text'])
+            gather.say(question.voice_text)
         response.append(gather)
         
         response.redirect("/api/qualification/webhook/voice", method='GET')
@@ -117,14 +135,29 @@ async def voice_webhook(request: Request):
 async def voice_response_webhook(request: Request):
     """Handle voice responses"""
     params = request.query_params
+    # Twilio retries a callback with the same CallSid and action URL
+    key = IdempotencyStore.key("twilio:voice", params.get('CallSid'), params.get('seq'))
+    pending = VoiceResponse()
+    pending.redirect("/api/qualification/webhook/voice", method='GET')
+    from_number = params.get('To', '').strip()
+    content = await idempotency.run(
+        key,
+        lambda: interview_bot.conversations.run(from_number, lambda: handle_voice_response(params)),
+        str(pending),
+    )
+    return Response(content=content, media_type="application/xml")
+
+async def handle_voice_response(params) -> str:
+    """Build the TwiML for a voice response"""
     response = VoiceResponse()
     from_number = params.get('To', '').strip()
     speech_result = params.get('SpeechResult')
     digits = params.get('Digits')
 
-    print("Speech result:", speech_result)
-    
     candidate = await CandidateCRUD.get_candidate_by_phone(from_number)
+    if candidate:
+        bind_candidate(candidate.id)
+    log_payload("voice_response_received", speech_result, digits=digits)
     
     if not candidate:
         voice_url = await voice_generator.generate_speech("Session expired. Please try again.")
@@ -132,16 +165,16 @@ async def voice_response_webhook(request: Request):
             response.play(voice_url)
         else:
             response.say("Session expired. Please try again.")
-        return Response(content=str(response), media_type="application/xml")
+        return str(response)
 
     # Handle initial "Press 1" response
     if candidate.current_question == 0 and digits == '1':
         question = interview_bot.get_question(0)
-        voice_url = await voice_generator.generate_speech(question['text'])
+        voice_url = await voice_generator.generate_speech(question.tts_text)
         
         gather = Gather(
             input='speech',
-            action="/api/qualification/webhook/voice/response",
+            action=voice_response_action(),
             method='GET',
             timeout=3,
             language='en-GB'
@@ -150,58 +183,49 @@ async def voice_response_webhook(request: Request):
         if voice_url:
             gather.play(voice_url)
         else:
-            gather.say(question['text'])
+            gather.say(question.voice_text)
             
         response.append(gather)
         response.redirect("/api/qualification/webhook/voice", method='GET')
-        return Response(content=str(response), media_type="application/xml")
+        return str(response)
 
     if speech_result:
-        # Store answer first
-        await candidate.store_answer(candidate.current_question, speech_result)
-        candidate.current_question += 1
-        await candidate.save()
-        
-        if candidate.current_question < interview_bot.total_questions:
-            # Get next question text
-            question = interview_bot.get_question(candidate.current_question)
-            
-            # Generate voice in background while preparing response
-            voice_url = await voice_generator.generate_speech(question['text'])
-            
+        # Normalized, checked against the disqualification rules and branched like an SMS answer
+        outcome = await interview_bot.process_answer(candidate, speech_result)
+        if outcome.question is not None:
+            tts_text = f"{outcome.message} {outcome.question.tts_text}".strip()
+            voice_url = await voice_generator.generate_speech(tts_text)
+
             gather = Gather(
                 input='speech',
-                action="/api/qualification/webhook/voice/response",
+                action=voice_response_action(),
                 method='GET',
                 timeout=3,  # Reduced timeout
                 language='en-GB'
             )
-            
+
             if voice_url:
                 gather.play(voice_url)
             else:
-                gather.say(question['text'])
-                
+                gather.say(f"{outcome.message} {outcome.question.voice_text}".strip())
+
             response.append(gather)
             response.redirect("/api/qualification/webhook/voice", method='GET')
         else:
-            completion_msg = "Thank you for completing the interview. We will review your answers and get back to you soon."
-            voice_url = await voice_generator.generate_speech(completion_msg)
-            
+            voice_url = await voice_generator.generate_speech(outcome.message)
+
             if voice_url:
                 response.play(voice_url)
             else:
-                response.say(completion_msg)
-                
-            await interview_bot.conclude_interview(candidate)
+                response.say(outcome.message)
     else:
         question = interview_bot.get_question(candidate.current_question)
-        error_msg = "I didn't catch that. " + question['text']
+        error_msg = "I didn't catch that. " + question.voice_text
         voice_url = await voice_generator.generate_speech(error_msg)
         
         gather = Gather(
             input='speech',
-            action="/api/qualification/webhook/voice/response",
+            action=voice_response_action(),
             method='GET',
             timeout=3,
             speechTimeout=2,
@@ -216,7 +240,7 @@ async def voice_response_webhook(request: Request):
         response.append(gather)
         response.redirect("/api/qualification/webhook/voice", method='GET')
 
-    return Response(content=str(response), media_type="application/xml")
+    return str(response)
 
 @router.post("/webhook/sms")
 async def sms_webhook(request: Request):
@@ -225,22 +249,60 @@ async def sms_webhook(request: Request):
     message = data.get('Body')
     from_number = data.get('From').strip()
 
-    print("Message:", message)
-    print("From number:", from_number)
-    
+    log_payload("sms_received", message, from_number=from_number)
+
     if not message or not from_number:
         raise HTTPException(status_code=400, detail="Invalid webhook data")
 
-    # Get bot response
-    print("Getting bot response")
-    bot_response = await interview_bot.handle_response(from_number, message)
-    print("Bot response:", bot_response)
-    
-    resp = MessagingResponse()
-    resp.message(bot_response)
-    
+    async def reply() -> str:
+        # Get bot response, slow turns are acknowledged now and answered through the REST API
+        try:
+            bot_response = await interview_bot.sms_responder.respond(from_number, message)
+        except UnrecordedResponse as e:
+            resp = MessagingResponse()
+            resp.message(e.response)
+            raise UnrecordedResponse(str(resp)) from e
+        log_payload("sms_reply", bot_response, deferred=bot_response is None)
+
+        resp = MessagingResponse()
+        if bot_response is not None:
+            resp.message(bot_response)
+        return str(resp)
+
+    # A retried delivery gets the original reply back without being processed again
+    key = IdempotencyStore.key("twilio:sms", data.get('MessageSid'))
+    content = await idempotency.run(key, reply, str(MessagingResponse()))
+
     # Return TwiML response
-    return Response(content=str(resp), media_type="application/xml")
+    return Response(content=content, media_type="application/xml")
+
+@router.post("/webhook/status/message")
+async def message_status_webhook(request: Request):
+    """Record a Twilio message delivery status callback"""
+    data = await request.form()
+    if not is_valid_twilio_request(request.url.path, data, request.headers.get('X-Twilio-Signature')):
+        interview_bot.status_tracker.reject()
+        raise HTTPException(status_code=403, detail="Invalid Twilio signature")
+
+    sid, status = data.get('MessageSid'), data.get('MessageStatus')
+    if not sid or not status:
+        raise HTTPException(status_code=400, detail="Invalid status callback")
+    await interview_bot.status_tracker.record(sid, "message", status, data.get('ErrorCode'))
+    return Response(status_code=204)
+
+@router.post("/webhook/status/call")
+async def call_status_webhook(request: Request):
+    """Record a Twilio call status callback"""
+    data = await request.form()
+    if not is_valid_twilio_request(request.url.path, data, request.headers.get('X-Twilio-Signature')):
+        interview_bot.status_tracker.reject()
+        raise HTTPException(status_code=403, detail="Invalid Twilio signature")
+
+    sid, status = data.get('CallSid'), data.get('CallStatus')
+    if not sid or not status:
+        raise HTTPException(status_code=400, detail="Invalid status callback")
+    await interview_bot.status_tracker.record(sid, "call", status)
+    return Response(status_code=204)
 
 @router.get("/status/{candidate_id}", response_model=CandidateQualification)
 async def get_qualification_status(candidate_id: int):
@@ -256,72 +318,82 @@ async def get_qualification_status(candidate_id: int):
         "qualified": candidate.status == "qualified"
     } 
 
+@router.get("/transcript/{candidate_id}", dependencies=[Depends(verify_profiling_token)])
+async def get_transcript(candidate_id: int):
+    """Get candidate's answers, read back from cold storage once archived. Needs the X-Profiling-Token header"""
+    candidate = await CandidateCRUD.get_by_id(candidate_id)
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return {"candidate_id": candidate.id, "archived": candidate.answers_archive is not None,
+            "answers": await transcript_archive.answers(candidate)}
+
+@router.get("/metrics/normalizer", dependencies=[Depends(verify_profiling_token)])
+async def get_normalizer_metrics():
+    """Report local answer normalizer hit rate and LLM latency saved per question"""
+    return interview_bot.openai_client.normalizer.stats.snapshot()
+
+@router.get("/metrics/validation-cache", dependencies=[Depends(verify_profiling_token)])
+async def get_validation_cache_metrics():
+    """Report LLM validation cache hit rate"""
+    return interview_bot.openai_client.cache.stats()
+
+@router.get("/metrics/sms-replies", dependencies=[Depends(verify_profiling_token)])
+async def get_sms_reply_metrics():
+    """Report inline and deferred SMS reply counts and turn latency"""
+    return interview_bot.sms_responder.stats()
+
+@router.get("/metrics/outbound", dependencies=[Depends(verify_profiling_token)])
+async def get_outbound_metrics():
+    """Report outbound queue throughput and messages by delivery state"""
+    return await interview_bot.outbound.stats()
+
+@router.get("/metrics/contact-retries", dependencies=[Depends(verify_profiling_token)])
+async def get_contact_retry_metrics():
+    """Report scheduled first-contact retries and their outcomes"""
+    return await interview_bot.contact_retries.stats()
+
+@router.get("/metrics/nudges", dependencies=[Depends(verify_profiling_token)])
+async def get_nudge_metrics():
+    """Report reminders sent to candidates with stalled conversations"""
+    return interview_bot.nudges.stats()
+
+@router.get("/metrics/transcript-archive", dependencies=[Depends(verify_profiling_token)])
+async def get_transcript_archive_metrics():
+    """Report archived transcripts, compression and how much the candidates table shrank"""
+    return await transcript_archive.stats()
+
+@router.get("/metrics/status-callbacks", dependencies=[Depends(verify_profiling_token)])
+async def get_status_callback_metrics():
+    """Report received Twilio status callbacks and waiters"""
+    return interview_bot.status_tracker.stats()
+
+@router.get("/metrics/conversations", dependencies=[Depends(verify_profiling_token)])
+async def get_conversation_metrics():
+    """Report active conversation actors and queued turns"""
+    return interview_bot.conversations.stats()
+
+@router.get("/metrics/idempotency", dependencies=[Depends(verify_profiling_token)])
+async def get_idempotency_metrics():
+    """Report processed and duplicate webhook deliveries"""
+    return idempotency.stats()
+
+@router.get("/metrics/vapi-ingest", dependencies=[Depends(verify_profiling_token)])
+async def get_vapi_ingest_metrics():
+    """Report VAPI ingest queue depth, back-pressure and batching"""
+    return vapi_ingest.stats()
+
+@router.get("/metrics/event-loop", dependencies=[Depends(verify_profiling_token)])
+async def get_event_loop_metrics():
+    """Report event loop lag and the code found blocking the loop"""
+    return loop_monitor.stats()
+
 @router.post("/webhook/vapi")
 async def vapi_webhook(request: Request):
-    """Handle VAPI webhooks for call updates"""
-    data = await request.json()
-    print("VAPI Webhook Data:", data)
-    try:
-        # Get the customer phone number from the message data structure
-        message_data = data.get('message', {})
-        
-        # Get customer info from the call object if it exists
-        call_data = message_data.get('call', {})
-        customer_data = call_data.get('customer', {}) or message_data.get('customer', {})
-        customer_number = customer_data.get('number')
-        
-        if not customer_number:
-            return {"status": "error", "message": "No customer number provided"}
-        print("Customer number:", customer_number)
-
-        # Get the candidate
-        candidate = await CandidateCRUD.get_candidate_by_phone(customer_number)
-        if not candidate:
-            return {"status": "error", "message": "Candidate not found"}
-        print("Candidate:", candidate)
-
-        # Handle status updates
-        if message_data.get('type') == 'status-update':
-            status = message_data.get('status')
-            ended_reason = message_data.get('endedReason')
-            print("Status, ended reason:", status, ended_reason)
-            
-            # If call was declined/busy/no-answer, try SMS
-            if status == 'ended' and ended_reason in ['customer-busy', 'no-answer', 'declined', 'voicemail', 'customer-did-not-answer', 'assistant-said-end-call-phrase']:
-                print(f"Call ended with reason: {ended_reason}. Trying SMS...")
-                sms_status = await interview_bot.try_sms(candidate)
-                if sms_status.get("success"):
-                    candidate.communication_method = "sms"
-                    await candidate.save()
-                    print("Successfully switched to SMS")
-                else:
-                    print("SMS fallback failed:", sms_status.get("error"))
-
-        # Handle end-of-call report
-        elif message_data.get('type') == 'end-of-call-report':
-            # Get transcript directly from message_data
-            transcript = message_data.get('artifact', {}).get('messages', [])
-            if transcript:
-                try:
-                    # Parse current answers
-                    try:
-                        current_answers = json.loads(candidate.answers)
-                    except (json.JSONDecodeError, TypeError):
-                        current_answers = []
-                    
-                    # Add full transcript
-                    current_answers.extend(transcript)
-                    
-                    # Update candidate's answers
-                    candidate.answers = json.dumps(current_answers)
-                    candidate.status = "pending"
-                    await candidate.save()
-                    
-                except Exception as e:
-                    print(f"Error saving transcript: {str(e)}")
-
-        return {"status": "success"}
+    """Handle VAPI webhooks for call updates, events are processed in batches off the request path"""
+    data = json_codec.loads(await request.body())
+    message_data = data.get('message', {})
+    log_event("vapi_webhook", logging.DEBUG, type=message_data.get('type'), call_id=message_data.get('call', {}).get('id'))
 
-    except Exception as e:
-        print(f"Error processing VAPI webhook: {str(e)}")
-        return {"status": "error", "message": str(e)}
\ No newline at end of file
+    if not await vapi_ingest.offer(data):
+        raise HTTPException(status_code=503, detail="VAPI ingest queue is full")
+    return {"status": "success"}
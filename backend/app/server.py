@@ -1,17 +1,74 @@
+import time
+from contextlib import asynccontextmanager
+
+# Measured from here, so /ready can report what importing the app cost this worker
+IMPORT_STARTED = time.perf_counter()
+
 from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
-from app.routers.qualification import router as qualification_router
+from app.util import AuthUtil, metrics
+from app.util.logging import RequestContextMiddleware
+from app.util.loop_monitor import loop_monitor
+from app.util.profiling import ProfilingMiddleware
+from app.util.transcript_archive import transcript_archive
+from app.util.providers import providers
+from app.util.json_codec import CodecJSONResponse
+from app.routers.admin import router as admin_router
+from app.routers.qualification import router as qualification_router, interview_bot, vapi_ingest
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    providers.record_boot("import", time.perf_counter() - IMPORT_STARTED)
+    await providers.start()
+    await metrics.registry.start()
+    await loop_monitor.start()
+    await interview_bot.status_tracker.start()
+    await interview_bot.outbound.start()
+    await interview_bot.evaluation_worker.start()
+    await interview_bot.contact_retries.start()
+    await interview_bot.nudges.start()
+    await transcript_archive.start()
+    await vapi_ingest.start()
+    yield
+    await vapi_ingest.stop()
+    await interview_bot.sms_responder.stop()
+    await interview_bot.conversations.stop()
+    await transcript_archive.stop()
+    await interview_bot.nudges.stop()
+    await interview_bot.contact_retries.stop()
+    await interview_bot.evaluation_worker.stop()
+    await interview_bot.outbound.stop()
+    await interview_bot.status_tracker.stop()
+    await loop_monitor.stop()
+    await metrics.registry.stop()
+    await providers.stop()
+    AuthUtil.shutdown()
 
 # Create the FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=CodecJSONResponse)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(RequestContextMiddleware)
 
 # Index route
 @app.get("/")
 async def index():
     return {"message": "Master Server API"}
 
+# Readiness probe, 503 until the provider warm-ups have finished
+@app.get("/ready")
+async def ready():
+    return CodecJSONResponse(providers.stats(), status_code=200 if providers.ready else 503)
+
+# Prometheus scrape endpoint, merges the stage histograms of every worker
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.registry.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 app.include_router(qualification_router, prefix="/api")
+app.include_router(admin_router, prefix="/api")
 
 # Mount static directory
-app.mount("/static", StaticFiles(directory="app/static"), name="static") 
\ No newline at end of file
+app.mount("/static", StaticFiles(directory="app/static", check_dir=False), name="static") 
\ No newline at end of file
@@ -0,0 +1,271 @@
+import re
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+
+from app.util.question_catalog import Question
+from app.util.uk_gazetteer import get_gazetteer
+
+
+class NormalizedAnswer(NamedTuple):
+    value: str
+    confidence: float
+    reason: str
+
+
+_PUNCTUATION = re.compile(r"[^\w\s'-]")
+_FILLERS = {"please", "thanks", "thank", "you", "cheers", "i", "think", "so", "well", "um", "erm", "uh", "lol"}
+
+_YES_WORDS = {
+    "yes", "yeah", "yea", "yep", "yup", "ye", "ya", "yh", "y", "sure", "ok", "okay",
+    "absolutely", "definitely", "certainly", "correct", "affirmative", "indeed", "true",
+}
+_YES_PHRASES = ("of course", "i am", "i'm eligible", "i do", "i have", "i can", "that's right", "that is right")
+
+_NO_PHRASES = ("definitely not", "absolutely not", "certainly not", "of course not", "not at all", "sadly not")
+_NO_WORDS = {"no", "nope", "nah", "n", "never", "negative", "false", "none"}
+# "no problem", "no worries" and the like are usually a yes
+_NO_IDIOMS = {"problem", "problems", "prob", "probs", "worries", "worry", "bother", "trouble", "issue", "issues"}
+_NEGATIONS = (
+    "not", "don't", "dont", "do not", "doesn't", "haven't", "havent", "have not",
+    "i'm not", "im not", "am not", "can't", "cant", "cannot", "isn't", "aren't", "won't",
+)
+# "not a problem", "wouldn't mind" - a negation that reads as a yes
+_NEGATED_IDIOM = re.compile(
+    r"\b(?:not|don't|dont|do not|wouldn't|wouldnt|never)\s+(?:\w+\s+){0,2}?"
+    r"(?:problems?|issues?|bother|worry|worries|trouble|mind)\b"
+)
+# "yes but I need a visa" - a qualified answer the LLM has to weigh
+_QUALIFIERS = ("but", "however", "although", "though", "except", "unless")
+_UNSURE = ("not sure", "unsure", "maybe", "depends", "don't know", "dont know", "not certain", "possibly", "perhaps")
+
+_NUMBER_WORDS = {
+    "zero": 0, "none": 0, "no": 0, "one": 1, "a": 1, "single": 1, "two": 2, "couple": 2,
+    "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+}
+_WEEKDAYS = {
+    "monday": 0, "mon": 0,
+    "tuesday": 1, "tue": 1, "tues": 1,
+    "wednesday": 2, "wed": 2, "weds": 2,
+    "thursday": 3, "thu": 3, "thur": 3, "thurs": 3,
+    "friday": 4, "fri": 4,
+    "saturday": 5, "sat": 5,
+    "sunday": 6, "sun": 6,
+}
+_FULL_WEEK_PHRASES = (
+    "full time", "full-time", "fulltime", "every day", "everyday", "all week", "any day", "all days",
+    "every weekday", "weekdays", "whole week", "all the week",
+)
+_NUMBER_TOKEN = r"(\d+|zero|one|two|three|four|five|six|seven)"
+_RANGE = re.compile(_NUMBER_TOKEN + r"\s*(?:-|–|to|or|/)\s*" + _NUMBER_TOKEN)
+# A count of something other than days, "1 or 2 weeks", "6 hours", "3 days per fortnight"
+_OTHER_UNIT = re.compile(
+    r"\b(?:" + _NUMBER_TOKEN + r"\s*weeks?|weeks|fortnights?|months?|years?|hours?|hrs?|weekends?|shifts?|half)\b"
+)
+# "any day except monday", "3 days, mondays off" - exceptions change the count
+_EXCLUSIONS = re.compile(r"\b(?:except|excluding|apart|besides|but|not|off|other than|without)\b")
+_DAY_TOKEN = r"(" + "|".join(sorted(_WEEKDAYS, key=len, reverse=True)) + r")"
+_DAY_RANGE = re.compile(_DAY_TOKEN + r"\s*(?:-|–|to|through|till|until)\s*" + _DAY_TOKEN)
+
+
+def _clean(answer: str) -> str:
+    text = _PUNCTUATION.sub(" ", answer.lower().replace("’", "'"))
+    return " ".join(text.split())
+
+
+def _to_int(token: str) -> Optional[int]:
+    if token.isdigit():
+        return int(token)
+    return _NUMBER_WORDS.get(token)
+
+
+class NormalizerStats:
+    """Per-question fast-path hit rate and estimated LLM latency saved"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._questions: Dict[Any, Dict[str, float]] = {}
+
+    def _entry(self, question_id: Any) -> Dict[str, float]:
+        return self._questions.setdefault(
+            question_id, {"hits": 0, "llm_calls": 0, "llm_seconds": 0.0}
+        )
+
+    def record_hit(self, question_id: Any) -> None:
+        with self._lock:
+            self._entry(question_id)["hits"] += 1
+
+    def record_llm_call(self, question_id: Any, elapsed: float) -> None:
+        with self._lock:
+            entry = self._entry(question_id)
+            entry["llm_calls"] += 1
+            entry["llm_seconds"] += elapsed
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            all_calls = sum(e["llm_calls"] for e in self._questions.values())
+            all_seconds = sum(e["llm_seconds"] for e in self._questions.values())
+            report = {}
+            for question_id, entry in self._questions.items():
+                total = entry["hits"] + entry["llm_calls"]
+                # Fall back to the global average until this question has its own LLM samples
+                if entry["llm_calls"]:
+                    avg_llm = entry["llm_seconds"] / entry["llm_calls"]
+                else:
+                    avg_llm = all_seconds / all_calls if all_calls else 0.0
+                report[str(question_id)] = {
+                    "answers": total,
+                    "fast_path_hits": entry["hits"],
+                    "llm_calls": entry["llm_calls"],
+                    "hit_rate": round(entry["hits"] / total, 4) if total else 0.0,
+                    "avg_llm_latency_ms": round(avg_llm * 1000, 2),
+                    "latency_saved_ms": round(entry["hits"] * avg_llm * 1000, 2),
+                }
+            return report
+
+
+class AnswerNormalizer:
+    """
+    Deterministic normalizer for unambiguous answers.
+
+    Boolean questions are handled by type; other questions opt in through the
+    ``normalizer`` key in questions.json (e.g. ``"days_per_week"``).
+    """
+
+    def __init__(self):
+        self.stats = NormalizerStats()
+        self._handlers = {
+            "boolean": self.normalize_boolean,
+            "days_per_week": self.normalize_days_per_week,
+            "location": self.normalize_location,
+            "free_text": self.normalize_free_text,
+        }
+
+    def normalize(self, question: Question, answer: str) -> Optional[NormalizedAnswer]:
+        """Normalize an answer locally, returns None when no local handler applies"""
+        handler = self._handlers.get(question.normalizer or question.type)
+        if handler is None or not answer or not answer.strip():
+            return None
+        return handler(answer)
+
+    def normalize_boolean(self, answer: str) -> NormalizedAnswer:
+        text = _clean(answer)
+        padded = f" {text} "
+        words = [w for w in text.split() if w not in _FILLERS] or text.split()
+
+        if any(f" {phrase} " in padded for phrase in _UNSURE):
+            return NormalizedAnswer("", 0.0, "Answer is uncertain")
+
+        if _NEGATED_IDIOM.search(text):
+            return NormalizedAnswer("", 0.0, "Negated idiom")
+        if any(f" {word} " in padded for word in _QUALIFIERS):
+            return NormalizedAnswer("", 0.0, "Qualified answer")
+
+        if any(f" {phrase} " in padded for phrase in _NO_PHRASES):
+            return NormalizedAnswer("No", 0.95, "Emphatic negative")
+
+        has_yes_word = any(w in _YES_WORDS for w in words)
+        has_yes_phrase = any(f" {p} " in padded for p in _YES_PHRASES)
+        pairs = list(zip(words, words[1:] + [""]))
+        has_no = any(w in _NO_WORDS and nxt not in _NO_IDIOMS for w, nxt in pairs)
+        has_idiom = any(w in _NO_WORDS and nxt in _NO_IDIOMS for w, nxt in pairs)
+        negative = has_no or any(f" {n} " in padded for n in _NEGATIONS)
+
+        if has_idiom and not has_no and not (has_yes_word or has_yes_phrase):
+            # "no worries, happy to" - leave idioms to the LLM rather than read them as a no
+            return NormalizedAnswer("", 0.0, "Negative idiom")
+
+        if len(words) == 1:
+            if words[0] in _YES_WORDS:
+                return NormalizedAnswer("Yes", 1.0, "Exact yes synonym")
+            if words[0] in _NO_WORDS:
+                return NormalizedAnswer("No", 1.0, "Exact no synonym")
+
+        if (has_yes_word or has_yes_phrase) and not negative:
+            return NormalizedAnswer("Yes", 0.95 if words[0] in _YES_WORDS else 0.9, "Affirmative answer")
+        if negative and not has_yes_word:
+            # Covers "no", "not really" and negated statements such as "I am not"
+            if has_idiom:
+                return NormalizedAnswer("No", 0.5, "Negative answer alongside an idiom")
+            return NormalizedAnswer("No", 0.95 if words[0] in _NO_WORDS else 0.9, "Negative answer")
+        if words[0] in _YES_WORDS and not has_no:
+            # "yes, I don't need a visa" - leading yes with a trailing negated clause
+            return NormalizedAnswer("Yes", 0.6, "Affirmative answer with negation")
+        return NormalizedAnswer("", 0.0, "Could not determine yes or no")
+
+    def normalize_days_per_week(self, answer: str) -> NormalizedAnswer:
+        text = _clean(answer)
+        padded = f" {text} "
+
+        if any(f" {phrase} " in padded for phrase in _UNSURE):
+            return NormalizedAnswer("", 0.0, "Answer is uncertain")
+        if re.search(r"\bnot\b", text):
+            return NormalizedAnswer("", 0.0, "Negated availability")
+        if _EXCLUSIONS.search(text):
+            return NormalizedAnswer("", 0.3, "Availability with exceptions")
+
+        if _OTHER_UNIT.search(text):
+            return NormalizedAnswer("", 0.3, "Counted in a unit other than days")
+
+        numbers = self._numbers_mentioned(text)
+        days = self._weekdays_mentioned(text)
+        full_week = any(f" {phrase} " in padded for phrase in _FULL_WEEK_PHRASES) or re.search(
+            r"\bmon(day)?\s*(-|to)\s*fri(day)?\b", text
+        )
+        if numbers and (days or full_week):
+            # "3 days, mondays", "2 weekdays" - the count and the days may not agree
+            return NormalizedAnswer("", 0.3, "Number and days both mentioned")
+        if days:
+            return NormalizedAnswer(str(len(days)), 0.95, "Counted weekdays")
+        if full_week:
+            return NormalizedAnswer("5", 0.95, "Full week availability")
+
+        if _RANGE.search(text):
+            # "2 or 3", "3-4 days" - which number counts is for the LLM to judge
+            return NormalizedAnswer("", 0.3, "Range of days")
+
+        if len(set(numbers)) == 1:
+            value = numbers[0]
+            if value > 7:
+                return NormalizedAnswer("", 0.0, "More days than in a week")
+            bare = text in {str(value), "day", "days"} or re.fullmatch(r"\w+( days?)?( a| per| each)?( week)?", text)
+            return NormalizedAnswer(str(value), 1.0 if bare else 0.9, "Number of days")
+        if len(set(numbers)) > 1:
+            return NormalizedAnswer("", 0.3, "Multiple numbers mentioned")
+        return NormalizedAnswer("", 0.0, "No number of days found")
+
+    def normalize_free_text(self, answer: str) -> NormalizedAnswer:
+        return NormalizedAnswer(" ".join(answer.split()), 1.0, "Free text answer")
+
+    def normalize_location(self, answer: str) -> NormalizedAnswer:
+        if get_gazetteer().lookup(answer) is None:
+            return NormalizedAnswer("", 0.0, "Location not in gazetteer")
+        return NormalizedAnswer(" ".join(answer.split()).strip(" ."), 1.0, "Known location")
+
+    def _weekdays_mentioned(self, text: str) -> Set[int]:
+        days: Set[int] = set()
+        for start, end in _DAY_RANGE.findall(text):
+            first, last = _WEEKDAYS[start], _WEEKDAYS[end]
+            if last < first:
+                last += 7
+            days.update(d % 7 for d in range(first, last + 1))
+        for word in _DAY_RANGE.sub(" ", text).split():
+            # Accept plurals such as "mondays"
+            day = _WEEKDAYS.get(word, _WEEKDAYS.get(word[:-1]) if word.endswith("s") else None)
+            if day is not None:
+                days.add(day)
+        return days
+
+    def _numbers_mentioned(self, text: str) -> List[int]:
+        numbers = []
+        for word in text.split():
+            if word == "a" or word == "no":
+                # "a day", "no days" only count when followed by "day"
+                continue
+            value = _to_int(word)
+            if value is not None:
+                numbers.append(value)
+        if not numbers:
+            match = re.search(r"\b(a|no)\s+days?\b", text)
+            if match:
+                numbers.append(_NUMBER_WORDS[match.group(1)])
+        return numbers
@@ -1,11 +1,45 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Union
+from typing import List, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import constants
+from app.util.lru_cache import LRUCache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified token -> subject, so repeated requests with the same token skip the decode
+_token_cache = LRUCache(constants.TOKEN_CACHE_SIZE)
+
+# bcrypt is CPU bound for ~100ms per call, it runs in worker processes off the event loop
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_slots: Optional[asyncio.Semaphore] = None
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+async def _in_hash_pool(func, *args):
+    global _hash_pool, _hash_slots
+    if _hash_pool is None:
+        # Spawned rather than forked, the server process has threads running
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=constants.PASSWORD_HASH_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+        _hash_slots = asyncio.Semaphore(constants.PASSWORD_HASH_WORKERS * 2)
+    # Bound the backlog so a burst of logins queues here rather than inside the pool
+    async with _hash_slots:
+        return await asyncio.get_running_loop().run_in_executor(_hash_pool, func, *args)
+
+
 class AuthUtil:
 
     @classmethod
@@ -21,11 +55,18 @@ class AuthUtil:
 
     @classmethod
     def verify_token(self, token: str, credentials_exception):
+        cached = _token_cache.get(token)
+        if cached is not None:
+            return cached
         try:
             payload = jwt.decode(token, constants.SECRET_KEY, algorithms=[constants.ALGORITHM])
             email: str = payload.get("sub")
             if email is None:
                 raise credentials_exception
+            # Never cache past the token's own expiry
+            ttl = min(constants.TOKEN_CACHE_TTL_SECONDS, payload.get("exp", 0) - time.time())
+            if ttl > 0:
+                _token_cache.set(token, email, ttl)
             return email
         except JWTError:
             raise credentials_exception
@@ -37,3 +78,25 @@ class AuthUtil:
     @classmethod
     def get_password_hash(self, password):
         return pwd_context.hash(password)
+
+    @classmethod
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """verify_password in the hash process pool, for use from async code"""
+        return await _in_hash_pool(_verify, plain_password, hashed_password)
+
+    @classmethod
+    async def get_password_hash_async(self, password: str) -> str:
+        """get_password_hash in the hash process pool, for use from async code"""
+        return await _in_hash_pool(_hash, password)
+
+    @classmethod
+    async def get_password_hashes(self, passwords: List[str]) -> List[str]:
+        """Hash many passwords in parallel across the pool's processes"""
+        return await asyncio.gather(*(self.get_password_hash_async(p) for p in passwords))
+
+    @classmethod
+    def shutdown(self) -> None:
+        global _hash_pool, _hash_slots
+        if _hash_pool is not None:
+            _hash_pool.shutdown(cancel_futures=True)
+            _hash_pool, _hash_slots = None, None
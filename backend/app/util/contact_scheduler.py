@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from app.config import constants
+from app.database.candidate import CandidateCRUD, CandidateModel
+from app.database.contact_retry import ContactRetryModel
+from app.util.logging import bind_candidate, log_event, span
+
+
+class ContactWindow:
+    """Days and hours in which candidates may be called or messaged, in CONTACT_TIMEZONE"""
+
+    def __init__(self):
+        self.zone = ZoneInfo(constants.CONTACT_TIMEZONE)
+        self.start = constants.CONTACT_HOURS_START
+        self.end = constants.CONTACT_HOURS_END
+        self.days = {int(day) for day in constants.CONTACT_DAYS.split(",") if day.strip()}
+        self.spread = constants.CONTACT_WINDOW_SPREAD_SECONDS
+
+    def _bounds(self, day) -> Optional[tuple]:
+        if day.weekday() not in self.days:
+            return None
+        opens = datetime(day.year, day.month, day.day, self.start, tzinfo=self.zone)
+        closes = datetime(day.year, day.month, day.day, self.end, tzinfo=self.zone)
+        return opens, closes
+
+    def contains(self, when: datetime) -> bool:
+        local = when.astimezone(self.zone)
+        bounds = self._bounds(local.date())
+        return bounds is not None and bounds[0] <= local < bounds[1]
+
+    def next_opening(self, when: datetime) -> datetime:
+        """
+        ``when`` if it falls inside the window, otherwise a time shortly after
+        the window next opens. Naive datetimes are in server local time, like
+        every timestamp in the database.
+        """
+        local = when.astimezone(self.zone)
+        for offset in range(8):
+            bounds = self._bounds((local + timedelta(days=offset)).date())
+            if bounds is None or local >= bounds[1]:
+                continue
+            opens, closes = bounds
+            if local >= opens:
+                return when
+            # Everything deferred overnight would otherwise fire at the same minute
+            spread = min(self.spread, (closes - opens).total_seconds() / 2)
+            run_at = opens + timedelta(seconds=random.uniform(0, spread))
+            return run_at.astimezone().replace(tzinfo=None)
+        raise ValueError("CONTACT_DAYS does not allow any day of the week")
+
+
+class ContactRetryScheduler:
+    """
+    Retries the first contact with candidates that could not be reached.
+
+    When every channel fails at registration a job is written to
+    ``contact_retry``. A poll task leases due jobs with FOR UPDATE SKIP LOCKED,
+    so any number of workers can run it, and runs the contact fallback chain
+    again. Failures back off exponentially with jitter up to
+    CONTACT_RETRY_MAX_ATTEMPTS. Retries are only placed inside the UK contact
+    window, those landing outside it move to when the window next opens.
+    """
+
+    def __init__(self, interview_bot):
+        self.interview_bot = interview_bot
+        self.window = ContactWindow()
+        self.batch_size = constants.CONTACT_RETRY_BATCH_SIZE
+        self.poll_interval = constants.CONTACT_RETRY_POLL_SECONDS
+        self.lease = constants.CONTACT_RETRY_LEASE_SECONDS
+        self.max_attempts = constants.CONTACT_RETRY_MAX_ATTEMPTS
+        self._semaphore = asyncio.Semaphore(constants.CONTACT_RETRY_CONCURRENCY)
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"scheduled": 0, "attempted": 0, "contacted": 0, "deferred": 0, "retried": 0, "failed": 0, "errors": 0}
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(
+            constants.CONTACT_RETRY_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1),
+            constants.CONTACT_RETRY_BACKOFF_MAX_SECONDS,
+        )
+        return delay * random.uniform(0.5, 1.0)
+
+    async def schedule(self, candidate_id: int) -> bool:
+        """Queue a contact retry for the candidate, False when it could not be stored"""
+        run_at = self.window.next_opening(datetime.now() + timedelta(seconds=self._backoff(1)))
+        try:
+            if await ContactRetryModel.schedule(candidate_id, run_at):
+                self._stats["scheduled"] += 1
+            return True
+        except Exception as e:
+            self._stats["errors"] += 1
+            log_event("contact_retry_schedule_error", logging.ERROR, candidate_id=candidate_id, error=str(e))
+            return False
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        # Jobs interrupted here are picked up again once their lease runs out
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                self._stats["errors"] += 1
+                log_event("contact_retry_run_error", logging.ERROR, exc_info=e)
+                claimed = 0
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def run_once(self) -> int:
+        jobs = await ContactRetryModel.claim_due(self.batch_size, self.lease)
+        if not jobs:
+            return 0
+        candidates = {
+            c.id: c for c in await CandidateCRUD.get_candidates_by_ids([job.candidate_id for job in jobs])
+        }
+        results = await asyncio.gather(*(self._attempt(job, candidates.get(job.candidate_id)) for job in jobs))
+        await ContactRetryModel.bulk_record_results(results)
+        return len(jobs)
+
+    async def _attempt(self, job: ContactRetryModel, candidate: Optional[CandidateModel]) -> Dict[str, Any]:
+        if candidate is None or candidate.communication_method or candidate.current_question > 0:
+            # Deleted, or the candidate got in touch in the meantime
+            return {"id": job.id, "status": "done"}
+
+        now = datetime.now()
+        if not self.window.contains(now):
+            # Claimed late, after the window closed, it keeps its attempt count
+            self._stats["deferred"] += 1
+            return {"id": job.id, "status": "queued", "next_attempt_at": self.window.next_opening(now)}
+
+        bind_candidate(candidate.id)
+        attempts = job.attempts + 1
+        self._stats["attempted"] += 1
+        async with self._semaphore:
+            with span("contact_retry.attempt"):
+                outcome = await self.interview_bot.start_qualification_process(candidate)
+
+        if outcome["status"] == "success":
+            self._stats["contacted"] += 1
+            log_event("contact_retry_succeeded", attempt=attempts, method=outcome["method"])
+            return {"id": job.id, "status": "done", "attempts": attempts, "last_error": None}
+
+        error = outcome.get("message", outcome["status"])
+        if attempts >= self.max_attempts:
+            self._stats["failed"] += 1
+            log_event("contact_retry_gave_up", logging.WARNING, attempt=attempts, error=error)
+            return {"id": job.id, "status": "failed", "attempts": attempts, "last_error": error}
+
+        self._stats["retried"] += 1
+        run_at = self.window.next_opening(now + timedelta(seconds=self._backoff(attempts + 1)))
+        log_event("contact_retry_rescheduled", attempt=attempts, next_attempt_at=run_at.isoformat(), error=error)
+        return {"id": job.id, "status": "queued", "attempts": attempts, "last_error": error, "next_attempt_at": run_at}
+
+    async def stats(self) -> Dict[str, Any]:
+        try:
+            statuses = await ContactRetryModel.counts_by_status()
+        except Exception as e:
+            statuses = {"error": str(e)}
+        return {**self._stats, "in_contact_window": self.window.contains(datetime.now()), "statuses": statuses}
@@ -0,0 +1,129 @@
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.config import constants
+from app.database.candidate import CandidateCRUD, CandidateModel
+
+# First key of the two-key advisory locks taken on conversations, the second is a hash of the phone number
+CONVERSATION_LOCK_NAMESPACE = 0x636F6E76
+
+Turn = Callable[[], Awaitable[Any]]
+
+
+class ConversationActor:
+    """Runs one conversation's turns strictly in arrival order"""
+
+    def __init__(self, key: str, registry: "ConversationActors"):
+        self.key = key
+        self.registry = registry
+        self.mailbox: "asyncio.Queue[Tuple[Turn, asyncio.Future, contextvars.Context]]" = asyncio.Queue()
+        self.busy = False
+        self.task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Not wait_for, which can swallow a cancellation arriving as a turn is taken (stop() then hangs)
+                async with asyncio.timeout(self.registry.idle_timeout):
+                    turn, future, context = await self.mailbox.get()
+            except TimeoutError:
+                # Nothing can be enqueued between this check and the removal, both run without yielding
+                if self.mailbox.empty():
+                    self.registry._retire(self)
+                    return
+                continue
+
+            if future.cancelled():
+                continue
+            self.busy = True
+            # Run in the submitter's context so the turn logs with its request and candidate ids
+            task = asyncio.create_task(self.registry._turn(self.key, turn), context=context)
+            try:
+                await asyncio.wait({task})
+            finally:
+                # Resolved whatever happened, including the actor being cancelled, so the caller never hangs
+                self.busy = False
+                if not task.done():
+                    task.cancel()
+                    future.cancel()
+                elif not future.done():
+                    if task.cancelled():
+                        future.cancel()
+                    elif task.exception() is not None:
+                        future.set_exception(task.exception())
+                    else:
+                        future.set_result(task.result())
+
+
+class ConversationActors:
+    """
+    Serializes inbound events per conversation.
+
+    Each active conversation, keyed by the candidate's normalized phone number
+    (SMS, WhatsApp and voice webhooks format it differently), gets an
+    ordered mailbox and an actor task that processes one turn at a time. Every
+    turn therefore reads the state its predecessor left behind, with no global
+    lock, so different candidates still run concurrently. An actor with an
+    empty mailbox stops after the idle timeout and is dropped from the registry.
+
+    The actors only order turns within one process. With several uvicorn
+    workers, each turn also holds a Postgres advisory lock on the conversation,
+    so a turn for the same candidate on another worker waits for it. Each lock
+    ties up a pooled connection for the turn, the number held at once is capped
+    to leave connections for the turns' own queries.
+    """
+
+    def __init__(self, cross_worker: bool = True):
+        self.idle_timeout = constants.CONVERSATION_ACTOR_IDLE_SECONDS
+        self.cross_worker = cross_worker
+        self._lock_slots = asyncio.Semaphore(constants.CONVERSATION_LOCK_CONNECTIONS)
+        self._actors: Dict[str, ConversationActor] = {}
+        self._stats = {"turns": 0, "queued_behind": 0, "started": 0, "retired": 0}
+
+    def submit(self, key: str, turn: Turn) -> "asyncio.Future":
+        """Queue a turn on the conversation's actor, the future resolves with its result"""
+        key = CandidateModel.normalize_phone(key)
+        actor = self._actors.get(key)
+        if actor is None:
+            actor = self._actors[key] = ConversationActor(key, self)
+            self._stats["started"] += 1
+        elif actor.busy or not actor.mailbox.empty():
+            self._stats["queued_behind"] += 1
+        future = asyncio.get_running_loop().create_future()
+        actor.mailbox.put_nowait((turn, future, contextvars.copy_context()))
+        self._stats["turns"] += 1
+        return future
+
+    async def run(self, key: str, turn: Turn) -> Any:
+        return await self.submit(key, turn)
+
+    async def _turn(self, key: str, turn: Turn) -> Any:
+        if not self.cross_worker:
+            return await turn()
+        async with self._lock_slots, CandidateCRUD.conversation_lock(CONVERSATION_LOCK_NAMESPACE, key):
+            return await turn()
+
+    def _retire(self, actor: ConversationActor) -> None:
+        if self._actors.get(actor.key) is actor:
+            del self._actors[actor.key]
+            self._stats["retired"] += 1
+
+    async def stop(self) -> None:
+        actors = list(self._actors.values())
+        for actor in actors:
+            actor.task.cancel()
+        await asyncio.gather(*(actor.task for actor in actors), return_exceptions=True)
+        for actor in actors:
+            # Turns that never started, their callers get a CancelledError rather than waiting forever
+            while not actor.mailbox.empty():
+                _, future, _ = actor.mailbox.get_nowait()
+                future.cancel()
+        self._actors.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "active": len(self._actors),
+            "queued": sum(actor.mailbox.qsize() for actor in self._actors.values()),
+        }
@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.config import constants
+from app.database.candidate import CandidateCRUD, CandidateModel
+from app.util.logging import log_event
+
+
+class EvaluationWorker:
+    """
+    Evaluates finished interviews off the webhook path.
+
+    Candidate ids are collected into micro-batches, evaluated with bounded
+    concurrency and a per-candidate timeout, written back in a single
+    transaction and the outcome messages are sent afterwards. A batch that
+    fails, e.g. on a database error, is queued again with exponential backoff
+    up to EVALUATION_MAX_ATTEMPTS times.
+
+    The queue lives in memory, so at start-up and every
+    EVALUATION_RECOVER_INTERVAL_SECONDS the worker also claims candidates left
+    "pending" for EVALUATION_RECOVER_AFTER_SECONDS, whose evaluation was lost
+    to a restart or given up on, and queues them again.
+    """
+
+    def __init__(self, interview_bot):
+        self.interview_bot = interview_bot
+        self.batch_size = constants.EVALUATION_BATCH_SIZE
+        self.batch_wait = constants.EVALUATION_BATCH_WAIT_SECONDS
+        self.timeout = constants.EVALUATION_TIMEOUT_SECONDS
+        self.max_attempts = constants.EVALUATION_MAX_ATTEMPTS
+        self._semaphore = asyncio.Semaphore(constants.EVALUATION_CONCURRENCY)
+        self._queue: "asyncio.Queue[int]" = asyncio.Queue()
+        self._pending: set = set()
+        self._attempts: Dict[int, int] = {}
+        self._retries: Dict[int, asyncio.TimerHandle] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._recovery: Optional[asyncio.Task] = None
+        self._stats = {"evaluated": 0, "retried": 0, "gave_up": 0, "recovered": 0}
+
+    def enqueue(self, candidate_id: int) -> None:
+        """Schedule a candidate for evaluation, duplicates already waiting are ignored"""
+        if candidate_id in self._pending:
+            return
+        self._pending.add(candidate_id)
+        self._queue.put_nowait(candidate_id)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            self._recovery = asyncio.create_task(self._recover_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._recovery.cancel()
+        # Give batches already queued a chance to finish before shutting down
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.batch_wait + self.timeout)
+        except asyncio.TimeoutError:
+            pass
+        for handle in self._retries.values():
+            handle.cancel()
+        dropped = sorted(self._pending | set(self._retries))
+        if dropped:
+            log_event("evaluation_worker_stopped", logging.WARNING, pending=len(dropped), candidate_ids=dropped)
+        self._retries.clear()
+        self._task.cancel()
+        self._task = None
+
+    async def recover(self) -> int:
+        """Queue again the interviews whose evaluation was lost, returns how many"""
+        now = datetime.now()
+        stale_before = now - timedelta(seconds=constants.EVALUATION_RECOVER_AFTER_SECONDS)
+        candidate_ids = [
+            candidate_id for candidate_id in await CandidateCRUD.claim_unevaluated(stale_before, now)
+            if candidate_id not in self._retries
+        ]
+        for candidate_id in candidate_ids:
+            self.enqueue(candidate_id)
+        if candidate_ids:
+            self._stats["recovered"] += len(candidate_ids)
+            log_event("evaluations_recovered", logging.WARNING, count=len(candidate_ids), candidate_ids=candidate_ids)
+        return len(candidate_ids)
+
+    async def _recover_forever(self) -> None:
+        while True:
+            try:
+                await self.recover()
+            except Exception as e:
+                log_event("evaluation_recovery_error", logging.ERROR, exc_info=e)
+            await asyncio.sleep(constants.EVALUATION_RECOVER_INTERVAL_SECONDS)
+
+    async def _next_batch(self) -> List[int]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self.process_batch(batch)
+            except Exception as e:
+                log_event("evaluation_batch_error", logging.ERROR, exc_info=e, size=len(batch))
+                self._retry(batch)
+            else:
+                self._stats["evaluated"] += len(batch)
+                for candidate_id in batch:
+                    self._attempts.pop(candidate_id, None)
+            finally:
+                for candidate_id in batch:
+                    self._pending.discard(candidate_id)
+                    self._queue.task_done()
+
+    def _retry(self, candidate_ids: List[int]) -> None:
+        loop = asyncio.get_running_loop()
+        for candidate_id in candidate_ids:
+            attempts = self._attempts.get(candidate_id, 0) + 1
+            if attempts >= self.max_attempts:
+                self._attempts.pop(candidate_id, None)
+                self._stats["gave_up"] += 1
+                log_event("evaluation_gave_up", logging.ERROR, candidate_id=candidate_id, attempts=attempts)
+                continue
+            self._attempts[candidate_id] = attempts
+            self._stats["retried"] += 1
+            delay = constants.EVALUATION_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+            self._retries[candidate_id] = loop.call_later(delay, self._requeue, candidate_id)
+
+    def _requeue(self, candidate_id: int) -> None:
+        self._retries.pop(candidate_id, None)
+        self.enqueue(candidate_id)
+
+    async def _evaluate(self, candidate: CandidateModel) -> Dict[str, Any]:
+        async with self._semaphore:
+            try:
+                return await asyncio.wait_for(
+                    self.interview_bot.evaluate_candidate_with_ai(candidate), timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                return {"error": "Evaluation timed out"}
+
+    async def process_batch(self, candidate_ids: List[int]) -> None:
+        candidates = await CandidateCRUD.get_candidates_by_ids(candidate_ids)
+        results = await asyncio.gather(*(self._evaluate(c) for c in candidates))
+
+        updates = []
+        outcomes = []
+        for candidate, result in zip(candidates, results):
+            if "error" in result:
+                # If AI evaluation fails, mark as pending review
+                updates.append({"id": candidate.id, "status": "pending_review"})
+            else:
+                updates.append({
+                    "id": candidate.id,
+                    "status": "qualified" if result['qualified'] else "disqualified",
+                    "disqualification_reason": None if result['qualified'] else "Did not meet qualification criteria",
+                    "scores": result['scores'],
+                })
+            outcomes.append((candidate, self.interview_bot.evaluation_outcome_message(result)))
+
+        await CandidateCRUD.bulk_store_evaluations(updates)
+
+        sends = await asyncio.gather(
+            *(self.interview_bot.send_message(candidate, message) for candidate, message in outcomes),
+            return_exceptions=True,
+        )
+        for (candidate, _), sent in zip(outcomes, sends):
+            if isinstance(sent, Exception):
+                log_event("evaluation_outcome_send_error", logging.ERROR, candidate_id=candidate.id, error=str(sent))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self._stats,
+            "queued": self._queue.qsize(),
+            "pending": len(self._pending),
+            "retrying": len(self._retries),
+        }
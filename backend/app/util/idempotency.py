@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.config import constants
+from app.database.webhook_event import WebhookEventModel
+from app.util.logging import log_event
+from app.util.lru_cache import LRUCache
+
+
+class UnrecordedResponse(Exception):
+    """
+    Raised by a handler that failed to process an event but still has a reply
+    for the provider, e.g. an apology to the candidate. The reply is returned
+    without being recorded and the claim is released, so a retry of the event
+    is processed again.
+    """
+
+    def __init__(self, response: str):
+        super().__init__(response)
+        self.response = response
+
+
+class IdempotencyStore:
+    """
+    Processes each provider webhook event once.
+
+    Events are keyed by the provider's event id. The first delivery claims the
+    key in the ``webhook_event`` table, runs the handler and records its
+    response. Retries get that response back without any processing, from the
+    in-process LRU when possible. A retry that arrives while the first delivery
+    is still running waits briefly for its response and gets ``pending`` if
+    it doesn't arrive in time. A failed handler releases the claim so the next
+    retry is processed normally, and a claim left without a response for
+    IDEMPOTENCY_CLAIM_LEASE_SECONDS, its worker having died, is taken over by
+    the next retry.
+    """
+
+    PURGE_EVERY = 500
+    POLL_INTERVAL = 0.25
+
+    def __init__(self):
+        self.ttl = constants.IDEMPOTENCY_TTL_SECONDS
+        self.wait = constants.IDEMPOTENCY_WAIT_SECONDS
+        self.lease = constants.IDEMPOTENCY_CLAIM_LEASE_SECONDS
+        self.local = LRUCache(constants.IDEMPOTENCY_LRU_SIZE)
+        self._in_flight: Dict[str, "asyncio.Future[str]"] = {}
+        self._claims = 0
+        self._stats = {"processed": 0, "duplicates": 0, "pending": 0, "released": 0, "errors": 0}
+
+    @staticmethod
+    def key(source: str, *parts: Any) -> Optional[str]:
+        """Event key for a provider event, None when the provider didn't send an id"""
+        if not parts or any(part in (None, "") for part in parts):
+            return None
+        return ":".join([source, *map(str, parts)])
+
+    async def run(self, key: Optional[str], handler: Callable[[], Awaitable[str]], pending: str) -> str:
+        if key is None:
+            try:
+                return await handler()
+            except UnrecordedResponse as e:
+                return e.response
+
+        cached = self.local.get(key)
+        if cached is not None:
+            self._stats["duplicates"] += 1
+            return cached
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            return await self._wait_in_process(in_flight, pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            claimed = await self._claim(key)
+            if not claimed:
+                response = await self._wait_in_db(key, pending)
+            else:
+                try:
+                    response = await handler()
+                except UnrecordedResponse as e:
+                    await self._release(key)
+                    self._stats["released"] += 1
+                    response = e.response
+                except Exception:
+                    await self._release(key)
+                    raise
+                else:
+                    self._stats["processed"] += 1
+                    await self._complete(key, response)
+            future.set_result(response)
+            return response
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved here so a future nobody else is waiting on doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def claim_many(self, keys: List[str]) -> Set[str]:
+        """
+        Claim a batch of events that need no response, returns the keys seen for
+        the first time. Used by batch consumers, where one insert covers the batch.
+        The caller completes the claims once the batch is stored, or releases them.
+        """
+        fresh = [key for key in dict.fromkeys(keys) if self.local.get(key) is None]
+        try:
+            claimed = await WebhookEventModel.claim_many(fresh, self.ttl, self.lease)
+        except Exception as e:
+            self._stats["errors"] += 1
+            log_event("idempotency_claim_error", logging.WARNING, error=str(e))
+            claimed = set(fresh)
+        self._stats["processed"] += len(claimed)
+        self._stats["duplicates"] += len(keys) - len(claimed)
+        return claimed
+
+    async def complete_many(self, keys: Set[str]) -> None:
+        for key in keys:
+            self.local.set(key, "", self.ttl)
+        try:
+            await WebhookEventModel.complete_many(list(keys), "")
+        except Exception as e:
+            self._stats["errors"] += 1
+            log_event("idempotency_write_error", logging.WARNING, error=str(e))
+
+    async def release_many(self, keys: Set[str]) -> None:
+        self._stats["released"] += len(keys)
+        try:
+            await WebhookEventModel.release_many(list(keys))
+        except Exception as e:
+            self._stats["errors"] += 1
+            log_event("idempotency_release_error", logging.WARNING, error=str(e))
+
+    async def _wait_in_process(self, future: "asyncio.Future[str]", pending: str) -> str:
+        try:
+            response = await asyncio.wait_for(asyncio.shield(future), timeout=self.wait)
+            self._stats["duplicates"] += 1
+            return response
+        except asyncio.TimeoutError:
+            self._stats["pending"] += 1
+            return pending
+
+    async def _wait_in_db(self, key: str, pending: str) -> str:
+        # Claimed by another worker, poll for the response it records
+        deadline = time.monotonic() + self.wait
+        while True:
+            try:
+                event = await WebhookEventModel.get_by_key(key)
+            except Exception as e:
+                self._stats["errors"] += 1
+                log_event("idempotency_read_error", logging.WARNING, error=str(e))
+                event = None
+            if event is not None and event.response is not None:
+                self.local.set(key, event.response, self.ttl)
+                self._stats["duplicates"] += 1
+                return event.response
+            if time.monotonic() >= deadline:
+                self._stats["pending"] += 1
+                return pending
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+    async def _claim(self, key: str) -> bool:
+        try:
+            claimed = await WebhookEventModel.claim(key, self.ttl, self.lease)
+        except Exception as e:
+            # Without the database only this process deduplicates
+            self._stats["errors"] += 1
+            log_event("idempotency_claim_error", logging.WARNING, error=str(e))
+            return True
+        self._claims += 1
+        if self._claims % self.PURGE_EVERY == 0:
+            try:
+                await WebhookEventModel.purge_expired()
+            except Exception as e:
+                log_event("idempotency_purge_error", logging.WARNING, error=str(e))
+        return claimed
+
+    async def _complete(self, key: str, response: str) -> None:
+        self.local.set(key, response, self.ttl)
+        try:
+            await WebhookEventModel.complete(key, response)
+        except Exception as e:
+            self._stats["errors"] += 1
+            log_event("idempotency_write_error", logging.WARNING, error=str(e))
+
+    async def _release(self, key: str) -> None:
+        try:
+            await WebhookEventModel.release(key)
+        except Exception as e:
+            self._stats["errors"] += 1
+            log_event("idempotency_release_error", logging.WARNING, error=str(e))
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "in_flight": len(self._in_flight), "memory_entries": len(self.local)}
@@ -1,33 +1,75 @@
-from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, NamedTuple
 import json
+import logging
 from app.config import constants
 from app.database.candidate import CandidateModel, CandidateCRUD
 import asyncio
 import requests
 from typing import List
-from vapi_python import Vapi
 from app.util.openai_client import OpenAIClient
+from app.util import json_codec
+from app.util.logging import bind_candidate, log_event, log_payload, span
+from app.util.evaluation_worker import EvaluationWorker
+from app.util.idempotency import UnrecordedResponse
+from app.util.sms_responder import SmsResponder
+from app.util.conversation_actors import ConversationActors
+from app.util.outbound_queue import OutboundQueue
+from app.util.contact_scheduler import ContactRetryScheduler
+from app.util.nudge_worker import NudgeWorker
+from app.util.status_tracker import StatusTracker, MESSAGE_STATUS_CALLBACK, CALL_STATUS_CALLBACK, CALL_STATUS_EVENTS
+from app.util.question_catalog import Question, QuestionCatalog, get_question_catalog
+from app.util.interview_flow import InterviewFlow, get_interview_flow
+from app.util.providers import providers
+
+class AnswerOutcome(NamedTuple):
+    """What to say after a voice answer: a message, then the question to ask, None when the call ends"""
+    message: str
+    question: Optional[Question]
+
 
 class InterviewBot:
     def __init__(self):
-        self.twilio_client = Client(constants.TWILIO_ACCOUNT_SID, constants.TWILIO_AUTH_TOKEN)
         self.phone_number = constants.TWILIO_FROM_PHONE  # Regular Twilio number
         self.whatsapp_number = constants.TWILIO_WHATSAPP_NUMBER  # WhatsApp-enabled number
-        self.questions = self._load_questions()
-        self.total_questions = len(self.questions['questions'])
-        # Initialize VAPI
-        self.vapi = Vapi(api_key=constants.VAPI_KEY)
+        self.relevance_ai_url = (
+            constants.RELEVANCE_AI_API_URL or f'https://api-{constants.RELEVANCE_AI_REGION}.stack.tryrelevance.com'
+        )
         self.openai_client = OpenAIClient()
-
-    def _load_questions(self) -> Dict:
-        """Load interview questions from JSON file"""
-        with open('app/data/questions.json', 'r') as f:
-            return json.load(f)
+        self.status_tracker = StatusTracker()
+        self.outbound = OutboundQueue()
+        self.evaluation_worker = EvaluationWorker(self)
+        self.contact_retries = ContactRetryScheduler(self)
+        self.nudges = NudgeWorker(self)
+        self.conversations = ConversationActors()
+        self.sms_responder = SmsResponder(self)
+
+    @property
+    def twilio_client(self):
+        """Twilio REST client, built on first use"""
+        return providers.get("twilio")
+
+    @property
+    def vapi(self):
+        return providers.get("vapi")
+
+    @property
+    def catalog(self) -> QuestionCatalog:
+        """Compiled interview questions, hot-reloaded when questions.json changes"""
+        return get_question_catalog()
+
+    @property
+    def flow(self) -> InterviewFlow:
+        """Interview state graph compiled from the current catalog"""
+        return get_interview_flow()
+
+    @property
+    def total_questions(self) -> int:
+        return len(self.catalog)
 
     async def start_qualification_process(self, candidate: CandidateModel) -> Dict:
         """Start the qualification process with fallback methods"""
+        bind_candidate(candidate.id)
         try:
             # Check if the number is a WhatsApp number
             is_whatsapp = await self.check_whatsapp_number(candidate.phone)
@@ -36,7 +78,7 @@ class InterviewBot:
             if is_whatsapp:
                 # Try WhatsApp call
                 whatsapp_call_status = await self.try_whatsapp_call(candidate)
-                print("WhatsApp call status", str(whatsapp_call_status))
+                log_event("contact_attempt", method="whatsapp_call", **whatsapp_call_status)
                 if whatsapp_call_status.get("success"):
                     candidate.communication_method = "whatsapp_call"
                     await candidate.save()
@@ -45,7 +87,7 @@ class InterviewBot:
                 # If WhatsApp call not answered, try WhatsApp message
                 if whatsapp_call_status.get("error") == "no_answer":
                     whatsapp_msg_status = await self.try_whatsapp_message(candidate)
-                    print("WhatsApp message status", str(whatsapp_msg_status))
+                    log_event("contact_attempt", method="whatsapp_message", **whatsapp_msg_status)
                     if whatsapp_msg_status.get("success"):
                         candidate.communication_method = "whatsapp_message"
                         await candidate.save()
@@ -53,7 +95,7 @@ class InterviewBot:
 
             # Try regular voice call
             voice_call_status = await self.try_voice_call(candidate)
-            print("Voice call status", str(voice_call_status))
+            log_event("contact_attempt", method="voice_call", **voice_call_status)
             if voice_call_status.get("success"):
                 candidate.communication_method = "voice_call"
                 await candidate.save()
@@ -62,7 +104,7 @@ class InterviewBot:
             # If voice call not answered, try SMS
             if voice_call_status.get("error") == "no_answer":
                 sms_status = await self.try_sms(candidate)
-                print("SMS status", str(sms_status))
+                log_event("contact_attempt", method="sms", **sms_status)
                 if sms_status.get("success"):
                     candidate.communication_method = "sms"
                     await candidate.save()
@@ -78,7 +120,7 @@ class InterviewBot:
             return {"status": "failed", "message": "All communication methods failed"}
 
         except Exception as e:
-            print("Qualification process error", str(e))
+            log_event("qualification_process_error", logging.ERROR, exc_info=e)
             return {"status": "error", "message": str(e)}
 
     async def check_whatsapp_number(self, phone_number: str) -> bool:
@@ -88,32 +130,34 @@ class InterviewBot:
             whatsapp_number = f'whatsapp:{phone_number}'
             
             # Simple status check message
-            message = self.twilio_client.messages.create(
-                from_=f'whatsapp:{self.whatsapp_number}',
-                body='Hi! This is a WhatsApp verification message.',
-                to=whatsapp_number
-            )
-            
-            # Wait briefly for status
-            await asyncio.sleep(2)
+            with span("twilio.messages.create"):
+                message = await asyncio.to_thread(
+                    self.twilio_client.messages.create,
+                    from_=f'whatsapp:{self.whatsapp_number}',
+                    body='Hi! This is a WhatsApp verification message.',
+                    to=whatsapp_number,
+                    status_callback=MESSAGE_STATUS_CALLBACK
+                )
             
-            # Fetch the message status
-            message = self.twilio_client.messages(message.sid).fetch()
+            # Wait briefly for the status callback, a message that is still queued counts as valid
+            status = await self.status_tracker.wait_for(
+                message.sid, ['sent', 'delivered', 'read', 'failed', 'undelivered'], timeout=2
+            ) or message.status
             
             # Consider queued or sent messages as valid WhatsApp numbers
-            return message.status in ['queued', 'sent', 'delivered']
+            return status in ['queued', 'sent', 'delivered', 'read']
             
         except TwilioRestException as e:
-            print(f"WhatsApp check error: {str(e)}")
+            log_event("whatsapp_check_error", logging.WARNING, error=str(e))
             return False
         except Exception as e:
-            print(f"Unexpected error in WhatsApp check: {str(e)}")
+            log_event("whatsapp_check_error", logging.ERROR, exc_info=e)
             return False
 
     async def try_voice_call(self, candidate: CandidateModel) -> Dict:
         """Attempt regular voice call with VAPI assistant"""
         try:
-            url = "https://api.vapi.ai/call/phone"
+            url = f"{constants.VAPI_API_URL}/call/phone"
             headers = {
                 "Authorization": constants.VAPI_KEY,
                 "Content-Type": "application/json"
@@ -197,8 +241,12 @@ Be professional but friendly. Listen carefully to answers and ask for clarificat
             }
 
             # Make the call request
-            response = requests.post(url, json=payload, headers=headers)
-            print("VAPI Response:", response)
+            with span("vapi.call.create"):
+                response = await asyncio.to_thread(
+                    requests.post, url, json=payload, headers=headers,
+                    timeout=constants.VAPI_REQUEST_TIMEOUT_SECONDS
+                )
+            log_event("vapi_call_created", status_code=response.status_code)
             
             if response.status_code == 200:
                 return {"success": True}
@@ -206,30 +254,35 @@ Be professional but friendly. Listen carefully to answers and ask for clarificat
                 return {"success": False, "error": response.text}
             
         except Exception as e:
-            print("Voice call error:", str(e))
+            log_event("voice_call_error", logging.ERROR, error=str(e))
             return {"success": False, "error": str(e)}
 
     async def try_whatsapp_call(self, candidate: CandidateModel) -> Dict:
         """Attempt WhatsApp call"""
         try:
-            call = self.twilio_client.calls.create(
-                url=f"{constants.BASE_URL}/api/qualification/webhook/voice",
-                to=f"whatsapp:{candidate.phone}",  # Format for WhatsApp recipient
-                from_=f"whatsapp:{self.whatsapp_number}",  # Use WhatsApp-enabled number
-                method='GET'
-            )
+            with span("twilio.calls.create"):
+                call = await asyncio.to_thread(
+                    self.twilio_client.calls.create,
+                    url=f"{constants.BASE_URL}/api/qualification/webhook/voice",
+                    to=f"whatsapp:{candidate.phone}",  # Format for WhatsApp recipient
+                    from_=f"whatsapp:{self.whatsapp_number}",  # Use WhatsApp-enabled number
+                    method='GET',
+                    status_callback=CALL_STATUS_CALLBACK,
+                    status_callback_event=CALL_STATUS_EVENTS
+                )
             
-            # Wait for call status (20 seconds timeout)
-            await asyncio.sleep(20)
-            call = self.twilio_client.calls(call.sid).fetch()
+            # Wait for the call to be answered or end (20 seconds timeout)
+            status = await self.status_tracker.wait_for(
+                call.sid, ['in-progress', 'completed', 'busy', 'no-answer', 'failed', 'canceled'], timeout=20
+            )
             
-            if call.status in ['completed', 'in-progress']:
+            if status in ['completed', 'in-progress']:
                 return {"success": True}
             else:
                 return {"success": False, "error": "no_answer"}
             
         except TwilioRestException as e:
-            print(str(e))
+            log_event("whatsapp_call_error", logging.WARNING, error=str(e), code=e.code)
             if e.code == 63001:  # WhatsApp number not found
                 return {"success": False, "error": "Not a WhatsApp number"}
             return {"success": False, "error": str(e)}
@@ -244,22 +297,26 @@ Be professional but friendly. Listen carefully to answers and ask for clarificat
                 "The process will take about 15-20 minutes."
             )
             
-            message = self.twilio_client.messages.create(
-                from_=f'whatsapp:{self.whatsapp_number}',  # Use WhatsApp-enabled number
-                body=welcome_msg,
-                to=f'whatsapp:{candidate.phone}'  # Format for WhatsApp recipient
-            )
+            with span("twilio.messages.create"):
+                message = await asyncio.to_thread(
+                    self.twilio_client.messages.create,
+                    from_=f'whatsapp:{self.whatsapp_number}',  # Use WhatsApp-enabled number
+                    body=welcome_msg,
+                    to=f'whatsapp:{candidate.phone}',  # Format for WhatsApp recipient
+                    status_callback=MESSAGE_STATUS_CALLBACK
+                )
             
-            # Wait briefly for message status
-            await asyncio.sleep(2)
-            message = self.twilio_client.messages(message.sid).fetch()
+            # Wait briefly for the delivery status callback
+            status = await self.status_tracker.wait_for(
+                message.sid, ['sent', 'delivered', 'read', 'failed', 'undelivered'], timeout=2
+            ) or message.status
             
-            if message.status in ['sent', 'delivered']:
+            if status in ['sent', 'delivered', 'read']:
                 return {"success": True}
-            return {"success": False, "error": message.status}
+            return {"success": False, "error": status}
             
         except Exception as e:
-            print("WhatsApp message error", str(e))
+            log_event("whatsapp_message_error", logging.WARNING, error=str(e))
             return {"success": False, "error": str(e)}
 
     async def try_sms(self, candidate: CandidateModel) -> Dict:
@@ -268,11 +325,13 @@ Be professional but friendly. Listen carefully to answers and ask for clarificat
             # Send initial message
             welcome_msg = f"Hi {candidate.name}, I'm from rTriibe. You have sent your details to us for school based work so I just wanted to run through some initial questions if that's ok?"
             
-            message = self.twilio_client.messages.create(
-                from_=self.phone_number,
-                body=welcome_msg,
-                to=candidate.phone
-            )
+            with span("twilio.messages.create"):
+                message = await asyncio.to_thread(
+                    self.twilio_client.messages.create,
+                    from_=self.phone_number,
+                    body=welcome_msg,
+                    to=candidate.phone
+                )
             
             if message.sid:
                 candidate.communication_method = "sms"
@@ -283,185 +342,102 @@ Be professional but friendly. Listen carefully to answers and ask for clarificat
             return {"success": False, "error": "Failed to send SMS"}
             
         except Exception as e:
-            print(f"SMS error: {str(e)}")
+            log_event("sms_error", logging.ERROR, error=str(e))
             return {"success": False, "error": str(e)}
 
-    async def evaluate_availability_answer(self, answer: str) -> bool:
-        """Evaluate if candidate meets availability criteria"""
-        try:
-            answer = answer.lower()
-            # Check for direct mentions of 2 or less days
-            if any(phrase in answer for phrase in ["2 days", "two days", "1 day", "one day"]):
-                return False
-                
-            # Check for numbers
-            import re
-            numbers = re.findall(r'\d+', answer)
-            if numbers and int(numbers[0]) <= 2:
-                return False
-                
-            return True
-        except Exception as e:
-            print(f"Error evaluating availability: {str(e)}")
-            return True  # Default to true if parsing fails
-
-    async def process_answer(self, candidate: CandidateModel, answer: str) -> str:
-        """Process candidate's answer and determine next action"""
-        print("Processing answer", answer)
-        print("current question", candidate.current_question)
-        current_question = self.get_question(candidate.current_question)
-        print("current question", current_question)
+    async def process_answer(self, candidate: CandidateModel, answer: str) -> "AnswerOutcome":
+        """Process a spoken answer through the flow, returns what to say next"""
+        bind_candidate(candidate.id)
+        current_question = self.flow.current_question(candidate.current_question, candidate.get_answers())
+        log_payload("processing_answer", answer, position=candidate.current_question,
+                    question=current_question.id if current_question else None)
         if not current_question:
-            return "Interview is already completed."
-
-        # Special handling for availability question
-        if current_question.get('id') == "availability":
-            is_qualified = await self.evaluate_availability_answer(answer)
-            if not is_qualified:
-                await self.disqualify_candidate(candidate, "Insufficient availability (less than 3 days per week)")
-                # Send disqualification message
-                disqualification_msg = (
-                    "Thank you for your interest. Unfortunately, we require a minimum availability "
-                    "of 3 days per week for this position. We cannot proceed with the qualification "
-                    "process at this time."
-                )
-                
-                if candidate.communication_method == "whatsapp_message":
-                    self.twilio_client.messages.create(
-                        from_=f'whatsapp:{self.whatsapp_number}',
-                        body=disqualification_msg,
-                        to=f'whatsapp:{candidate.phone}'
-                    )
-                else:
-                    self.twilio_client.messages.create(
-                        from_=self.phone_number,
-                        body=disqualification_msg,
-                        to=candidate.phone
-                    )
-                
-                return disqualification_msg
+            return AnswerOutcome("Interview is already completed.", None)
 
-        # Validate answer
-        # is_valid, error_msg = self.validate_answer(current_question, answer)
-        # if not is_valid:
-        #     return error_msg
+        # Rules compare against normalized answers, as on the SMS path
+        assessment = await self.openai_client.assess_answer(current_question, answer)
+        if not assessment.valid:
+            return AnswerOutcome(f"I didn't quite understand that. {assessment.reason}", current_question)
 
-        # Store answer and increment question counter
-        await candidate.store_answer(current_question['id'], answer)
-        candidate.current_question += 1
-        await candidate.save()
+        transition = self.flow.transition(current_question, assessment.normalized, assessment.model_disqualified)
+        if transition.disqualified:
+            await self.disqualify_candidate(candidate, transition.message)
+            return AnswerOutcome(transition.message, None)
 
-        # Check for follow-up question
-        if 'follow_up' in current_question and answer in current_question['follow_up']:
-            follow_up = current_question['follow_up'][answer]
-            self.twilio_client.messages.create(
-                from_=self.phone_number,
-                body=follow_up['text'],
-                to=candidate.phone
-            )
-            return "Please answer the follow-up question."
+        # Store answer
+        await candidate.store_answer(current_question.id, assessment.normalized)
+
+        # Ask the follow-up question before moving on
+        if transition.follow_up:
+            return AnswerOutcome("", transition.next_question)
 
         # Move to next question or conclude
-        if candidate.current_question < len(self.questions['questions']):
-            await self.send_next_question(candidate)
-            return "Answer recorded. Next question sent."
-        else:
-            await self.conclude_interview(candidate)
-            return "Thank you for completing the interview!"
+        candidate.current_question = transition.next_position
+        await candidate.save()
+        if transition.next_question is not None:
+            return AnswerOutcome("", transition.next_question)
+        await self.conclude_interview(candidate)
+        return AnswerOutcome(
+            "Thank you for completing the interview. We will review your answers and get back to you soon.", None
+        )
 
     async def send_next_question(self, candidate: CandidateModel) -> None:
         """Send next question to candidate"""
         question = self.get_question(candidate.current_question)
-        print("Question", question)
-        
-        message = question['text']
-        if question['type'] == 'choice':
-            options = '\n'.join([f"• {opt}" for opt in question['options']])
-            message = f"{message}\n\nOptions:\n{options}"
         
-        # Send message based on communication method
+        await self.send_message(candidate, question.text_for(candidate.communication_method))
+
+    async def conclude_interview(self, candidate: CandidateModel) -> None:
+        """Conclude the interview process, evaluation and the outcome message run on the evaluation worker"""
+        self.evaluation_worker.enqueue(candidate.id)
+
+    def evaluation_outcome_message(self, evaluation_result: Dict[str, Any]) -> str:
+        """Message sent to the candidate once their evaluation has finished"""
+        if "error" in evaluation_result:
+            return (
+                "Thank you for completing the interview! "
+                "Our team will review your answers and get back to you soon."
+            )
+        if evaluation_result['qualified']:
+            return (
+                "Congratulations! You have successfully completed the qualification process. "
+                "Our team will contact you shortly with next steps."
+            )
+        return (
+            "Thank you for your interest. After careful evaluation, we regret to inform you "
+            "that we cannot proceed with your application at this time."
+        )
+
+    async def send_message(self, candidate: CandidateModel, message: str) -> None:
+        """Queue a message over the candidate's channel, delivery and retries happen on the outbound queue"""
         if candidate.communication_method == "whatsapp_message":
-            self.twilio_client.messages.create(
-                from_=f'whatsapp:{self.phone_number}',
-                body=message,
-                to=f'whatsapp:{candidate.phone}'
+            await self.outbound.enqueue(
+                f'whatsapp:{candidate.phone}', f'whatsapp:{self.whatsapp_number}', message, candidate.id
             )
         else:
-            self.twilio_client.messages.create(
-                from_=self.phone_number,
-                body=message,
-                to=candidate.phone
-            )
+            await self.outbound.enqueue(candidate.phone, self.phone_number, message, candidate.id)
 
-    async def conclude_interview(self, candidate: CandidateModel) -> None:
-        """Conclude the interview process and evaluate candidate"""
-        try:
-            # Evaluate candidate using AI
-            evaluation_result = await self.evaluate_candidate_with_ai(candidate)
-            
-            if "error" in evaluation_result:
-                # If AI evaluation fails, mark as pending review
-                await CandidateCRUD.update_candidate_status(candidate.id, 'pending_review')
-                message = (
-                    "Thank you for completing the interview! "
-                    "Our team will review your answers and get back to you soon."
-                )
-            else:
-                # Update candidate status based on AI evaluation
-                new_status = 'qualified' if evaluation_result['qualified'] else 'disqualified'
-                await CandidateCRUD.update_candidate_status(
-                    candidate.id, 
-                    new_status,
-                    disqualification_reason=None if evaluation_result['qualified'] else "Did not meet qualification criteria"
-                )
-                
-                # Store evaluation scores
-                await candidate.store_evaluation_scores(evaluation_result['scores'])
-                
-                # Prepare appropriate message
-                if evaluation_result['qualified']:
-                    message = (
-                        "Congratulations! You have successfully completed the qualification process. "
-                        "Our team will contact you shortly with next steps."
-                    )
-                else:
-                    message = (
-                        "Thank you for your interest. After careful evaluation, we regret to inform you "
-                        "that we cannot proceed with your application at this time."
-                    )
-            
-            # Send conclusion message
-            if candidate.communication_method == "whatsapp_message":
-                self.twilio_client.messages.create(
-                    from_=f'whatsapp:{self.whatsapp_number}',
-                    body=message,
-                    to=f'whatsapp:{candidate.phone}'
-                )
-            else:
-                self.twilio_client.messages.create(
-                    from_=self.phone_number,
-                    body=message,
-                    to=candidate.phone
-                )
-                
-        except Exception as e:
-            print(f"Error in conclude_interview: {str(e)}")
-            # Handle error gracefully
-            await CandidateCRUD.update_candidate_status(candidate.id, 'error')
+    async def send_reply(self, to_number: str, message: str) -> None:
+        """Reply to an inbound message on the channel it arrived on"""
+        if to_number.startswith('whatsapp:'):
+            from_number = f'whatsapp:{self.whatsapp_number}'
+        else:
+            from_number = self.phone_number
+        await self.outbound.enqueue(to_number, from_number, message)
 
-    def validate_answer(self, question: Dict[str, Any], answer: str) -> tuple[bool, Optional[str]]:
+    def validate_answer(self, question: Question, answer: str) -> tuple[bool, Optional[str]]:
         """Validate answer based on question type"""
-        if question['type'] == 'boolean':
+        if question.type == 'boolean':
             if answer.lower() not in ['yes', 'no']:
                 return False, "Please answer with Yes or No"
-        elif question['type'] == 'number':
+        elif question.type == 'number':
             try:
                 float(answer)
             except ValueError:
                 return False, "Please provide a valid number"
-        elif question['type'] == 'choice':
-            if answer not in question['options']:
-                return False, f"Please choose from: {', '.join(question['options'])}"
+        elif question.type == 'choice':
+            if answer not in question.options:
+                return False, f"Please choose from: {', '.join(question.options)}"
         
         return True, None
 
@@ -479,12 +455,7 @@ Be professional but friendly. Listen carefully to answers and ask for clarificat
             "Please reply 'START' when you're ready to begin the interview. "
             "The process will take about 15-20 minutes."
         )
-        
-        self.twilio_client.messages.create(
-            from_=self.phone_number,
-            body=welcome_msg,
-            to=candidate.phone
-        )
+        await self.send_message(candidate, welcome_msg)
 
     async def handle_response(self, from_number: str, message: str) -> str:
         """Handle incoming SMS responses"""
@@ -493,88 +464,88 @@ Be professional but friendly. Listen carefully to answers and ask for clarificat
             candidate = await CandidateCRUD.get_candidate_by_phone(from_number)
             if not candidate:
                 return "Sorry, we couldn't find your registration. Please register first."
+            bind_candidate(candidate.id)
 
             # Handle initial confirmation
             if candidate.current_question == -1:
                 if any(word.lower() in message.lower() for word in ['yes', 'yeah', 'sure', 'ok', 'okay', 'yep', 'yup', 'y', 'ye']):
                     candidate.current_question = 0
+                    if candidate.status == "declined":
+                        candidate.status = "registered"
                     await candidate.save()
                     # Send first question
-                    return self.questions['questions'][0]['text']
+                    return self.catalog.at(0).sms_text
                 else:
+                    # Recorded so the nudge sweep stops asking them to start
+                    candidate.status = "declined"
+                    await candidate.save()
                     return "Thank you for your time. Goodbye."
 
-            # Get current question
-            if candidate.current_question >= len(self.questions['questions']):
+            # Get current question, a pending follow-up takes precedence
+            flow = self.flow
+            current_question = flow.current_question(candidate.current_question, candidate.get_answers())
+            if current_question is None:
                 return "Interview already completed. Thank you!"
 
-            current_question = self.questions['questions'][candidate.current_question]
+            # Validate and normalize the answer
+            assessment = await self.openai_client.assess_answer(current_question, message)
 
-            # Validate answer using OpenAI
-            is_valid, reason, normalized_answer = self.openai_client.validate_answer(current_question, message)
-            
-            if not is_valid:
-                return f"I didn't quite understand that. {reason}"
+            if not assessment.valid:
+                return f"I didn't quite understand that. {assessment.reason}"
 
-            # Check if interview should end based on answer
-            should_end, end_message = self.openai_client.should_end_interview(
-                current_question['id'], 
-                normalized_answer
-            )
-            
-            if should_end:
+            # Disqualification and follow-ups are evaluated locally from the questions.json rules
+            transition = flow.transition(current_question, assessment.normalized, assessment.model_disqualified)
+            if transition.disqualified:
                 candidate.status = "disqualified"
-                candidate.disqualification_reason = end_message
+                candidate.disqualification_reason = transition.message
                 await candidate.save()
-                return end_message
+                return transition.message
 
             # Store the answer
-            await candidate.store_answer(current_question['id'], normalized_answer)
+            await candidate.store_answer(current_question.id, assessment.normalized)
 
-            # Handle follow-up question for supply role
-            if current_question['id'] == 4 and message.lower() == 'yes':
-                return "Which agency did you work with?"
+            # Ask the follow-up question before moving on
+            if transition.follow_up:
+                return transition.next_question.sms_text
 
             # Move to next question
-            candidate.current_question += 1
+            candidate.current_question = transition.next_position
             await candidate.save()
 
             # Check if interview is complete
-            if candidate.current_question >= len(self.questions['questions']):
+            if transition.next_question is None:
                 candidate.status = "pending"
                 await candidate.save()
+                await self.conclude_interview(candidate)
                 return ("Thank you for that. That's all for now, You should receive a link for your application form "
                        "if you can complete this as soon as possible we will get you cleared and out working. "
                        "Many thanks and have a good day.")
 
             # Send next question
-            return self.questions['questions'][candidate.current_question]['text']
+            return transition.next_question.sms_text
 
         except Exception as e:
-            print(f"Error handling SMS response: {str(e)}")
-            return "Sorry, there was an error processing your response. Please try again."
+            log_event("sms_response_error", logging.ERROR, exc_info=e)
+            # Not recorded against the message, so a retried delivery is processed again
+            raise UnrecordedResponse("Sorry, there was an error processing your response. Please try again.") from e
 
-    def get_question(self, question_number: int, previous_answer: Optional[str] = None) -> Dict[str, Any]:
+    def get_question(self, question_number: int, previous_answer: Optional[str] = None) -> Optional[Question]:
         """Get question by number, considering follow-ups"""
-        if question_number >= len(self.questions['questions']):
+        question = self.catalog.at(question_number)
+        if question is None:
             return None
 
-        question = self.questions['questions'][question_number]
-        
         # If there's a previous answer and current question has follow-ups
-        if previous_answer and 'follow_up' in question and previous_answer in question['follow_up']:
-            return {
-                'id': f"{question['id']}_followup",
-                **question['follow_up'][previous_answer]
-            }
-        
+        if previous_answer and previous_answer in question.follow_up:
+            return question.follow_up[previous_answer]
+
         return question
 
     async def evaluate_candidate_with_ai(self, candidate: CandidateModel) -> Dict[str, Any]:
         """Evaluate candidate's answers using Relevance AI API"""
         try:
             # Get all answers in a structured format
-            answers = json.loads(candidate.answers)
+            answers = json_codec.loads(candidate.answers)
             
             # Prepare the evaluation prompt
             prompt = self._prepare_evaluation_prompt(answers)
@@ -594,11 +565,14 @@ Be professional but friendly. Listen carefully to answers and ask for clarificat
                 }
             }
             
-            response = requests.post(
-                f'https://api-{constants.RELEVANCE_AI_REGION}.stack.tryrelevance.com/latest/evaluate',
-                headers=headers,
-                json=payload
-            )
+            with span("relevance_ai.evaluate"):
+                response = await asyncio.to_thread(
+                    requests.post,
+                    f'{self.relevance_ai_url}/latest/evaluate',
+                    headers=headers,
+                    json=payload,
+                    timeout=constants.EVALUATION_TIMEOUT_SECONDS
+                )
             
             if response.status_code != 200:
                 raise Exception(f"Relevance AI API error: {response.text}")
@@ -613,7 +587,7 @@ Be professional but friendly. Listen carefully to answers and ask for clarificat
             }
             
         except Exception as e:
-            print(f"AI evaluation error: {str(e)}")
+            log_event("ai_evaluation_error", logging.ERROR, error=str(e))
             return {"error": str(e)}
 
     def _prepare_evaluation_prompt(self, answers: List[Dict]) -> str:
@@ -624,9 +598,9 @@ Be professional but friendly. Listen carefully to answers and ask for clarificat
         )
         
         for answer in answers:
-            question = next((q for q in self.questions['questions'] if q['id'] == answer['question']), None)
+            question = self.catalog.get(answer.get('question'))
             if question:
-                prompt += f"Question: {question['text']}\nAnswer: {answer['answer']}\n\n"
+                prompt += f"Question: {question.text}\nAnswer: {answer['answer']}\n\n"
         
         return prompt
 
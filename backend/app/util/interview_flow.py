@@ -0,0 +1,176 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from app.util.question_catalog import Question, QuestionCatalog, get_question_catalog
+from app.util.uk_gazetteer import get_gazetteer
+
+# A compiled predicate receives the normalized answer and the model's disqualification
+# verdict (None when the answer was normalized locally)
+Predicate = Callable[[str, Optional[bool]], bool]
+
+# Plain language description of each predicate, used when the LLM has to assess an answer
+PREDICATE_DESCRIPTIONS = {
+    "eq": "the normalized answer is '{value}'",
+    "ne": "the normalized answer is not '{value}'",
+    "in": "the normalized answer is one of {values}",
+    "not_in": "the normalized answer is not one of {values}",
+    "lt": "the normalized answer is a number less than {value}",
+    "lte": "the normalized answer is a number less than or equal to {value}",
+    "gt": "the normalized answer is a number greater than {value}",
+    "gte": "the normalized answer is a number greater than or equal to {value}",
+    "not_number": "the answer does not state a clear number",
+    "not_uk_location": "the location is not in the United Kingdom",
+}
+
+_COMPARISONS = {
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+}
+
+
+def _as_number(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def compile_predicate(spec: Dict[str, Any]) -> Predicate:
+    """Compile a declarative predicate from questions.json into a callable"""
+    if "all" in spec:
+        parts = [compile_predicate(s) for s in spec["all"]]
+        return lambda value, verdict: all(p(value, verdict) for p in parts)
+    if "any" in spec:
+        parts = [compile_predicate(s) for s in spec["any"]]
+        return lambda value, verdict: any(p(value, verdict) for p in parts)
+    if "not" in spec:
+        inner = compile_predicate(spec["not"])
+        return lambda value, verdict: not inner(value, verdict)
+
+    op = spec["op"]
+    if op in ("eq", "ne"):
+        expected = str(spec["value"]).casefold()
+        equal = op == "eq"
+        return lambda value, verdict: (value.casefold() == expected) == equal
+    if op in ("in", "not_in"):
+        options = frozenset(str(v).casefold() for v in spec["values"])
+        member = op == "in"
+        return lambda value, verdict: (value.casefold() in options) == member
+    if op in _COMPARISONS:
+        compare, threshold = _COMPARISONS[op], float(spec["value"])
+
+        def threshold_predicate(value: str, verdict: Optional[bool]) -> bool:
+            number = _as_number(value)
+            return number is not None and compare(number, threshold)
+        return threshold_predicate
+    if op == "not_number":
+        return lambda value, verdict: _as_number(value) is None
+    if op == "not_uk_location":
+        gazetteer = get_gazetteer()
+
+        def not_uk_location(value: str, verdict: Optional[bool]) -> bool:
+            # The model judged the raw answer, its normalized value can lose the qualifier
+            # ("Perth, Western Australia" -> "Perth"), so its verdict stands
+            if verdict is not None:
+                return verdict
+            # Normalized locally, the value is the raw answer the gazetteer already recognised
+            return gazetteer.lookup(value) is False
+        return not_uk_location
+    raise ValueError(f"Unknown predicate: {op}")
+
+
+def describe_predicate(spec: Dict[str, Any]) -> str:
+    if "all" in spec:
+        return " and ".join(f"({describe_predicate(s)})" for s in spec["all"])
+    if "any" in spec:
+        return " or ".join(f"({describe_predicate(s)})" for s in spec["any"])
+    if "not" in spec:
+        return f"it is not the case that {describe_predicate(spec['not'])}"
+    return PREDICATE_DESCRIPTIONS[spec["op"]].format(
+        value=spec.get("value"), values=", ".join(map(str, spec.get("values", [])))
+    )
+
+
+class Transition(NamedTuple):
+    disqualified: bool
+    message: str
+    next_question: Optional[Question]
+    next_position: int
+    follow_up: bool = False
+
+
+class FlowNode:
+    """A question in the state graph with its compiled disqualification rules and branches"""
+
+    __slots__ = ('question', 'disqualify', 'branches', 'next_position')
+
+    def __init__(self, question: Question, next_position: int):
+        self.question = question
+        self.next_position = next_position
+        self.disqualify: Tuple[Tuple[Predicate, str], ...] = tuple(
+            (compile_predicate(rule['if']), rule['message']) for rule in question.disqualify
+        )
+        self.branches: Tuple[Tuple[Predicate, Question], ...] = tuple(
+            (compile_predicate({"op": "eq", "value": answer}), follow_up)
+            for answer, follow_up in question.follow_up.items()
+        )
+
+
+class InterviewFlow:
+    """
+    Interview state graph compiled from the question catalog.
+
+    Each main question and follow-up is a node. A turn evaluates the node's
+    disqualification rules and follow-up branches against the normalized
+    answer and returns the next node, all in-process.
+    """
+
+    def __init__(self, catalog: QuestionCatalog):
+        self.version = catalog.version
+        self.catalog = catalog
+        self._nodes: Dict[Any, FlowNode] = {}
+        for question in catalog:
+            self._nodes[question.id] = FlowNode(question, question.position + 1)
+            for follow_up in question.follow_up.values():
+                # Follow-ups rejoin the main flow at the next main question
+                self._nodes[follow_up.id] = FlowNode(follow_up, question.position + 1)
+
+    def node(self, question: Question) -> FlowNode:
+        return self._nodes[question.id]
+
+    def transition(self, question: Question, normalized: str, verdict: Optional[bool] = None) -> Transition:
+        node = self._nodes[question.id]
+        value = str(normalized).strip()
+        for predicate, message in node.disqualify:
+            if predicate(value, verdict):
+                return Transition(True, message, None, question.position)
+        for predicate, follow_up in node.branches:
+            if predicate(value, verdict):
+                # Stay on the same position until the follow-up is answered
+                return Transition(False, "", follow_up, question.position, True)
+        return Transition(False, "", self.catalog.at(node.next_position), node.next_position)
+
+    def current_question(self, position: int, answers: List[Dict]) -> Optional[Question]:
+        """Question awaiting an answer, a pending follow-up takes precedence over the main question"""
+        question = self.catalog.at(position)
+        if question is None or not question.follow_up:
+            return question
+        last = next((a for a in reversed(answers) if 'question' in a), None)
+        if last is not None and last['question'] == question.id:
+            for predicate, follow_up in self._nodes[question.id].branches:
+                if predicate(str(last.get('answer', '')).strip(), None):
+                    return follow_up
+        return question
+
+
+_flow: Optional[InterviewFlow] = None
+
+
+def get_interview_flow() -> InterviewFlow:
+    """Interview flow for the current catalog, recompiled when questions.json changes"""
+    global _flow
+    catalog = get_question_catalog()
+    if _flow is None or _flow.version != catalog.version:
+        _flow = InterviewFlow(catalog)
+    return _flow
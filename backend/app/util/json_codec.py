@@ -0,0 +1,89 @@
+"""
+JSON encoding and decoding for webhooks, API responses and stored answers.
+
+The backend is chosen once at import from the JSON_CODEC setting: ``orjson``,
+``json`` (standard library) or ``auto``, which uses orjson when it is
+installed. Every caller goes through ``loads``/``dumps``/``dumps_bytes``, so
+the backend can be swapped without touching them.
+"""
+import json
+import logging
+from typing import Any, Union
+
+from fastapi.responses import JSONResponse
+
+from app.config import constants
+from app.util.logging import log_event
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+JSONInput = Union[str, bytes, bytearray, memoryview]
+
+
+class StdlibCodec:
+    name = "json"
+
+    def loads(self, data: JSONInput) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    def dumps_bytes(self, value: Any) -> bytes:
+        return self.dumps(value).encode()
+
+
+class OrjsonCodec:
+    name = "orjson"
+    # Dicts keyed by question id use int keys
+    OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+    def loads(self, data: JSONInput) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, value: Any) -> str:
+        return orjson.dumps(value, option=self.OPTIONS).decode()
+
+    def dumps_bytes(self, value: Any) -> bytes:
+        return orjson.dumps(value, option=self.OPTIONS)
+
+
+CODECS = ("auto", "orjson", "json")
+
+
+def _select_codec(name: str):
+    if name not in CODECS:
+        raise ValueError(f"Unknown JSON_CODEC {name!r}, expected one of {', '.join(CODECS)}")
+    if name == "json":
+        return StdlibCodec()
+    if orjson is None:
+        log_event("json_codec_unavailable", logging.WARNING, codec="orjson", fallback="json", requested=name)
+    return OrjsonCodec() if orjson is not None else StdlibCodec()
+
+
+codec = _select_codec(constants.JSON_CODEC)
+BACKEND = codec.name
+
+
+def loads(data: JSONInput) -> Any:
+    return codec.loads(data)
+
+
+def dumps(value: Any) -> str:
+    return codec.dumps(value)
+
+
+def dumps_bytes(value: Any) -> bytes:
+    return codec.dumps_bytes(value)
+
+
+class CodecJSONResponse(JSONResponse):
+    """Default FastAPI response class, renders with the selected codec"""
+
+    def render(self, content: Any) -> bytes:
+        return codec.dumps_bytes(content)
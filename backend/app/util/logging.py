@@ -1,21 +1,60 @@
+import asyncio
+import atexit
+import contextvars
+import functools
+import json
 import logging
+import queue
+import random
 import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
 
 from rich.console import Console
 from rich.logging import RichHandler
 
+from app.config import constants
+
+from . import metrics
 from .singleton import SingletonMeta
 
+# Correlation ids attached to every record logged while handling a request
+request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+candidate_id: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("candidate_id", default=None)
+
 
 class AppLogger(metaclass=SingletonMeta):
+    """
+    Application logger.
+
+    Callers only put records on a bounded queue. A listener thread formats
+    and writes them, so logging never blocks the event loop on stdout. When
+    the queue is full records are dropped and counted rather than waited on.
+    """
     _logger = None
 
     def __init__(self):
-        self._logger = logging.getLogger(__name__)
+        self._logger = logging.getLogger("rtriibe")
+        self._logger.setLevel(constants.LOG_LEVEL.upper())
+        self._logger.propagate = False
+        self._queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=constants.LOG_QUEUE_SIZE)
+        self.handler = NonBlockingQueueHandler(self._queue)
+        self._logger.addHandler(self.handler)
+        self._listener: Optional[QueueListener] = QueueListener(self._queue, _output_handler())
+        self._listener.start()
+        atexit.register(self.stop)
 
     def get_logger(self):
         return self._logger
 
+    def stop(self) -> None:
+        """Write out the queued records and stop the listener thread"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
 
 class RichConsoleHandler(RichHandler):
     def __init__(self, width=300, style=None, **kwargs):
@@ -24,16 +63,157 @@ class RichConsoleHandler(RichHandler):
         )
 
 
+class NonBlockingQueueHandler(QueueHandler):
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only the context is captured here, formatting happens on the listener thread
+        record.request_id = request_id.get()
+        record.candidate_id = candidate_id.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+
+def _fields(record: logging.LogRecord) -> dict:
+    fields = {"request_id": record.request_id, "candidate_id": record.candidate_id}
+    fields.update(getattr(record, "fields", None) or {})
+    return {k: v for k, v in fields.items() if v is not None}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line for log shipping"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "event": record.getMessage(),
+            **_fields(record),
+        }
+        if record.exc_info:
+            event["exc"] = self.formatException(record.exc_info)
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+class ContextFormatter(logging.Formatter):
+    """Message followed by its context and fields as key=value pairs, for the rich console"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        pairs = " ".join(f"{k}={v}" for k, v in _fields(record).items())
+        message = record.getMessage()
+        return f"{message} [{pairs}]" if pairs else message
+
+
+def _output_handler() -> logging.Handler:
+    log_format = constants.LOG_FORMAT
+    if log_format == "auto":
+        log_format = "json" if constants.ENVIRONMENT == "production" else "rich"
+    if log_format == "json":
+        handler = logging.StreamHandler()
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler = RichConsoleHandler()
+        handler.setFormatter(ContextFormatter())
+    return handler
+
+
+logger = AppLogger().get_logger()
+
+
+def log_event(event: str, level: int = logging.INFO, exc_info: Any = None, **fields: Any) -> None:
+    """Log a structured event, e.g. ``log_event("sms_reply_sent", to=number)``"""
+    if logger.isEnabledFor(level):
+        logger.log(level, event, exc_info=exc_info, extra={"fields": fields}, stacklevel=2)
+
+
+def log_payload(event: str, payload: Any, **fields: Any) -> None:
+    """Log a verbose payload (webhook body, message text) for a sample of events only"""
+    if logger.isEnabledFor(logging.DEBUG) or random.random() < constants.LOG_PAYLOAD_SAMPLE_RATE:
+        logger.info(event, extra={"fields": {**fields, "payload": payload}}, stacklevel=2)
+
+
+def bind_candidate(value: Optional[int]) -> None:
+    """Tag the rest of the current request's records with the candidate"""
+    candidate_id.set(value)
+
+
+class RequestContextMiddleware:
+    """Gives every HTTP request a request id, taken from X-Request-ID or generated, and echoes it back"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = dict(scope["headers"])
+        value = (headers.get(b"x-request-id") or headers.get(b"i-twilio-idempotency-token") or b"").decode()
+        value = value or uuid.uuid4().hex
+        request_token = request_id.set(value)
+        candidate_token = candidate_id.set(None)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", value.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id.reset(request_token)
+            candidate_id.reset(candidate_token)
+
+
 class ElapsedTimeLogger:
+    """
+    Times a block of code. With a ``stage`` the duration is also recorded in the
+    per-route, per-stage histograms served on /metrics, and ``log=False`` skips
+    the log lines for spans on hot paths.
+    """
     _logger = AppLogger().get_logger()
 
-    def __init__(self, message):
+    def __init__(self, message, stage: Optional[str] = None, log: bool = True):
         self.message = message
+        self.stage = stage
+        self.log = log
 
     def __enter__(self):
-        self._logger.info(self.message)
-        self.start = time.time()
+        if self.log:
+            self._logger.info(self.message)
+        self.start = time.perf_counter()
+        return self
 
     def __exit__(self, *args):
-        elapsed_time = time.time() - self.start
-        self._logger.info(f"Finished {self.message} in {elapsed_time} seconds")
+        elapsed_time = time.perf_counter() - self.start
+        if self.stage is not None:
+            metrics.registry.observe(self.stage, elapsed_time)
+        if self.log:
+            self._logger.info(f"Finished {self.message} in {elapsed_time} seconds")
+
+
+def span(stage: str) -> ElapsedTimeLogger:
+    """Time a provider call or DB operation, e.g. ``with span("twilio.messages.create"):``"""
+    return ElapsedTimeLogger(stage, stage=stage, log=False)
+
+
+def timed(stage: str):
+    """Decorator form of span for sync and async functions"""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
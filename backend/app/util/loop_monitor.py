@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import constants
+from app.util import metrics
+from app.util.logging import log_event
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _hot_spot(frames: traceback.StackSummary) -> str:
+    """Innermost application frame of a stack, where the blocking call was made from"""
+    for frame in reversed(frames):
+        if frame.filename.startswith(APP_DIR) and not frame.filename.endswith("loop_monitor.py"):
+            return f"{os.path.relpath(frame.filename, os.path.dirname(APP_DIR))}:{frame.lineno} in {frame.name}"
+    innermost = frames[-1]
+    return f"{innermost.filename}:{innermost.lineno} in {innermost.name}"
+
+
+class LoopMonitor:
+    """
+    Samples event loop lag and finds code that blocks the loop.
+
+    A task sleeps for a fixed tick and records how late it wakes up in the
+    ``event_loop.lag`` histogram on /metrics. With LOOP_BLOCK_DETECTOR on, a
+    watchdog thread also checks the task's heartbeat and, when the loop has
+    been stuck for longer than LOOP_BLOCK_THRESHOLD_SECONDS, captures the
+    loop thread's stack. Captures are grouped by the innermost application
+    frame so the remaining blocking hot spots rank by time lost.
+    """
+
+    def __init__(self):
+        self.interval = constants.LOOP_MONITOR_INTERVAL_SECONDS
+        self.threshold = constants.LOOP_BLOCK_THRESHOLD_SECONDS
+        self.detect_blocking = constants.LOOP_BLOCK_DETECTOR
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._pending: Optional[Dict[str, Any]] = None
+        self._reports: "deque[Dict[str, Any]]" = deque(maxlen=constants.LOOP_BLOCK_REPORTS)
+        self._hot_spots: Dict[str, Dict[str, Any]] = {}
+        self._stats = {"samples": 0, "lag_max_ms": 0.0, "lag_total_ms": 0.0, "blocked": 0}
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.create_task(self._run())
+        if self.detect_blocking:
+            self._stopped.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        self._task = None
+        self._stopped.set()
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    @property
+    def _tick(self) -> float:
+        # The heartbeat has to be finer than the threshold for stalls to be caught while they last
+        return min(self.interval, self.threshold / 2) if self.detect_blocking else self.interval
+
+    async def _run(self) -> None:
+        tick = self._tick
+        while True:
+            expected = time.monotonic() + tick
+            await asyncio.sleep(tick)
+            now = time.monotonic()
+            self._heartbeat = now
+            self._record_lag(max(0.0, now - expected))
+
+    def _record_lag(self, lag: float) -> None:
+        metrics.registry.observe("event_loop.lag", lag, "event_loop")
+        self._stats["samples"] += 1
+        self._stats["lag_total_ms"] += lag * 1000
+        self._stats["lag_max_ms"] = max(self._stats["lag_max_ms"], lag * 1000)
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            # The loop is running again, the lag is how long the captured call held it
+            pending["blocked_ms"] = round(lag * 1000, 1)
+            spot = self._hot_spots[pending["location"]]
+            spot["blocked_ms"] += lag * 1000
+            spot["max_ms"] = max(spot["max_ms"], lag * 1000)
+            log_event("event_loop_blocked", logging.WARNING, location=pending["location"], blocked_ms=pending["blocked_ms"])
+
+    def _watch(self) -> None:
+        reported = None
+        while not self._stopped.wait(self.threshold / 2):
+            beat = self._heartbeat
+            if time.monotonic() - beat < self.threshold or beat == reported:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            reported = beat
+            self._capture(traceback.extract_stack(frame))
+
+    def _capture(self, frames: traceback.StackSummary) -> None:
+        location = _hot_spot(frames)
+        report = {
+            "at": time.time(),
+            "location": location,
+            "blocked_ms": None,
+            "stack": traceback.format_list(frames[-constants.LOOP_BLOCK_STACK_DEPTH:]),
+        }
+        with self._lock:
+            self._stats["blocked"] += 1
+            spot = self._hot_spots.setdefault(location, {"location": location, "count": 0, "blocked_ms": 0.0, "max_ms": 0.0})
+            spot["count"] += 1
+            spot["stack"] = report["stack"]
+            self._reports.append(report)
+            self._pending = report
+
+    def hot_spots(self, limit: int = 10) -> List[Dict[str, Any]]:
+        with self._lock:
+            spots = [dict(spot) for spot in self._hot_spots.values()]
+        spots.sort(key=lambda s: s["blocked_ms"], reverse=True)
+        return [{**s, "blocked_ms": round(s["blocked_ms"], 1), "max_ms": round(s["max_ms"], 1)} for s in spots[:limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        samples = self._stats["samples"]
+        with self._lock:
+            recent = list(self._reports)[-5:]
+        return {
+            "pid": os.getpid(),
+            "samples": samples,
+            "lag_avg_ms": round(self._stats["lag_total_ms"] / samples, 2) if samples else 0.0,
+            "lag_max_ms": round(self._stats["lag_max_ms"], 2),
+            "block_detector": self.detect_blocking,
+            "threshold_ms": self.threshold * 1000,
+            "blocked": self._stats["blocked"],
+            "hot_spots": self.hot_spots(),
+            "recent": recent,
+        }
+
+
+loop_monitor = LoopMonitor()
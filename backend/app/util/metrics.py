@@ -0,0 +1,177 @@
+import asyncio
+import bisect
+import contextvars
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+
+from app.config import constants
+
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Route template of the request being handled, set by TimedRoute
+current_route: contextvars.ContextVar[str] = contextvars.ContextVar("current_route", default="background")
+
+Key = Tuple[str, str]
+
+
+class StageHistogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Per-route, per-stage latency histograms.
+
+    Each worker process aggregates in memory and periodically writes a
+    snapshot to ``METRICS_DIR/<pid>.json``. ``/metrics`` merges the
+    snapshots of all live workers, so any worker can answer a scrape.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or constants.METRICS_DIR or os.path.join(tempfile.gettempdir(), "rtriibe-metrics")
+        self._histograms: Dict[Key, StageHistogram] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def observe(self, stage: str, seconds: float, route: Optional[str] = None) -> None:
+        key = (route or current_route.get(), stage)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = StageHistogram()
+            histogram.observe(seconds)
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [
+                {"route": route, "stage": stage, "counts": list(h.counts), "sum": h.sum, "count": h.count}
+                for (route, stage), h in self._histograms.items()
+            ]
+
+    @property
+    def _path(self) -> str:
+        return os.path.join(self.directory, f"{os.getpid()}.json")
+
+    def flush(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{self._path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, self._path)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        self._task = None
+        try:
+            os.remove(self._path)
+        except OSError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(constants.METRICS_FLUSH_SECONDS)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                # Imported here, app.util.logging imports this module
+                from app.util.logging import log_event
+                log_event("metrics_snapshot_error", logging.WARNING, error=str(e))
+
+    def _worker_snapshots(self) -> Iterable[List[Dict]]:
+        yield self.snapshot()
+        own = f"{os.getpid()}.json"
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(".json") or name == own:
+                continue
+            try:
+                pid = int(name[:-5])
+                os.kill(pid, 0)  # Skip snapshots left behind by dead workers
+            except (ValueError, ProcessLookupError):
+                continue
+            except PermissionError:
+                pass
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    yield json.load(f)
+            except (OSError, ValueError):
+                continue
+
+    def collect(self) -> Dict[Key, Dict]:
+        merged: Dict[Key, Dict] = {}
+        for snapshot in self._worker_snapshots():
+            for entry in snapshot:
+                key = (entry["route"], entry["stage"])
+                total = merged.setdefault(key, {"counts": [0] * (len(BUCKETS) + 1), "sum": 0.0, "count": 0})
+                total["counts"] = [a + b for a, b in zip(total["counts"], entry["counts"])]
+                total["sum"] += entry["sum"]
+                total["count"] += entry["count"]
+        return merged
+
+    def render_prometheus(self) -> str:
+        name = "rtriibe_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Time spent per route and stage (provider call, DB operation or whole request).",
+            f"# TYPE {name} histogram",
+        ]
+        for (route, stage), total in sorted(self.collect().items()):
+            labels = f'route="{_escape(route)}",stage="{_escape(stage)}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (float("inf"),), total["counts"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {total['sum']}")
+            lines.append(f"{name}_count{{{labels}}} {total['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+class TimedRoute(APIRoute):
+    """Route class that tags spans with the route template and times the whole request"""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route = self.path_format
+
+        async def timed_handler(request):
+            token = current_route.set(route)
+            started = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                registry.observe("request", time.perf_counter() - started, route)
+                current_route.reset(token)
+        return timed_handler
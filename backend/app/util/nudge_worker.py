@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from contextlib import aclosing
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.config import constants
+from app.database.candidate import CandidateCRUD, CandidateModel
+from app.util.logging import log_event
+
+# Advisory lock held by the worker running a sweep
+NUDGE_LOCK_KEY = 0x6E75646765
+
+# A candidate who declined the consent prompt is "declined" and never nudged
+STALLED_STATUSES = ("registered", "in_progress")
+TEXT_CHANNELS = ("sms", "whatsapp_message")
+
+
+class NudgeWorker:
+    """
+    Re-engages candidates whose SMS or WhatsApp conversation stalled.
+
+    A candidate is stalled when the consent prompt (``current_question == -1``)
+    or an interview question has gone unanswered for NUDGE_STALL_SECONDS.
+    Every NUDGE_INTERVAL_SECONDS, within the contact window, one worker streams
+    the stalled candidates in batches and queues a reminder for each on the
+    outbound queue, pausing between batches so reminders never swamp the
+    sender. Each reminder is counted on the candidate, who gets at most
+    NUDGE_MAX_PER_CANDIDATE of them.
+    """
+
+    def __init__(self, interview_bot):
+        self.interview_bot = interview_bot
+        self.interval = constants.NUDGE_INTERVAL_SECONDS
+        self.stall = timedelta(seconds=constants.NUDGE_STALL_SECONDS)
+        self.max_nudges = constants.NUDGE_MAX_PER_CANDIDATE
+        self.batch_size = constants.NUDGE_BATCH_SIZE
+        self.batch_interval = constants.NUDGE_BATCH_INTERVAL_SECONDS
+        self.max_per_run = constants.NUDGE_MAX_PER_RUN
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"runs": 0, "nudged": 0, "batches": 0, "last_run_at": None, "last_run_nudged": 0, "errors": 0}
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self.interview_bot.contact_retries.window.contains(datetime.now()):
+                continue
+            try:
+                await self.run_once()
+            except Exception as e:
+                self._stats["errors"] += 1
+                log_event("nudge_run_error", logging.ERROR, exc_info=e)
+
+    def message_for(self, candidate: CandidateModel) -> str:
+        if candidate.current_question == -1:
+            return (
+                f"Hi {candidate.name}, just checking in from rTriibe. Are you still happy to run through "
+                "a few quick questions about school based work? Reply YES to get started."
+            )
+        return (
+            f"Hi {candidate.name}, you're part way through your rTriibe questions. "
+            "Just reply to the last question to carry on where you left off."
+        )
+
+    async def run_once(self) -> int:
+        """Nudge one sweep's worth of stalled candidates, returns how many were nudged"""
+        started = datetime.now()
+        nudged = 0
+        stream = CandidateCRUD.stream_stalled_candidates(
+            STALLED_STATUSES, TEXT_CHANNELS, started - self.stall, self.max_nudges, self.batch_size, NUDGE_LOCK_KEY
+        )
+        async with aclosing(stream) as batches:
+            async for batch in batches:
+                if nudged:
+                    await asyncio.sleep(self.batch_interval)
+                batch = batch[:self.max_per_run - nudged]
+                await self._nudge(batch)
+                nudged += len(batch)
+                if nudged >= self.max_per_run:
+                    break
+
+        self._stats["runs"] += 1
+        self._stats["last_run_at"] = started.isoformat()
+        self._stats["last_run_nudged"] = nudged
+        if nudged:
+            log_event("stalled_candidates_nudged", count=nudged)
+        return nudged
+
+    async def _nudge(self, batch: List[CandidateModel]) -> None:
+        for candidate in batch:
+            await self.interview_bot.send_message(candidate, self.message_for(candidate))
+        await CandidateCRUD.record_nudges([c.id for c in batch], datetime.now())
+        self._stats["batches"] += 1
+        self._stats["nudged"] += len(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
@@ -1,129 +1,115 @@
-from typing import Dict, Tuple
-from openai import OpenAI
+from typing import Any, Dict, NamedTuple, Optional
 from app.config import constants
-import json
+from app.util import json_codec
+from app.util.answer_normalizer import AnswerNormalizer
+from app.util.logging import log_event, log_payload, span
+from app.util.providers import providers
+from app.util.interview_flow import PREDICATE_DESCRIPTIONS, describe_predicate
+from app.util.question_catalog import Question
+from app.util.validation_cache import ValidationCache
+import time
+import logging
 
-class OpenAIClient:
-    def __init__(self):
-        self.client = OpenAI(api_key=constants.OPENAI_API_KEY)
-
-    def validate_answer(self, question: Dict, answer: str) -> Tuple[bool, str, str]:
-        """
-        Validate answer using OpenAI
-        Returns: (is_valid, normalized_answer, reason)
-        """
-        if question['id'] == 4 and answer.lower() not in ['yes', 'no']:
-            return True, "Valid answer", answer
-        
-        try:
-            # Prepare the prompt based on question type
-            if question['type'] == 'boolean':
-                prompt = f"""Question: {question['text']}
-Answer: {answer}
-
-Analyze if this answer means Yes or No and output 'Yes' or 'No' as the normalized answer. Consider variations and informal responses.
-Return exactly in this json format:
-{{
-    "valid": true,
-    "reason": explanation,
-    "normalized": normalized_answer
-}}"""
 
-            elif question['id'] == 2:  # Days availability
-                prompt = f"""Question: {question['text']}
-Answer: {answer}
+class AnswerAssessment(NamedTuple):
+    valid: bool
+    reason: str
+    normalized: str
+    # The model's disqualification verdict, None when the answer was normalized locally
+    model_disqualified: Optional[bool]
 
-Normalize the answer to a number of days.
-Return exactly in this json format:
-{{
-    "valid": true,
-    "reason": explanation,
-    "normalized": normalized_answer
-}}"""
 
-            elif question['id'] == 3:  # UK location
-                prompt = f"""Question: {question['text']}
+# Prompt templates are part of the validation cache version, editing one invalidates cached results
+PROMPT_TEMPLATES = {
+    "assess": """Question: {question}
 Answer: {answer}
 
-Analyze if this location is in the UK.
-Return exactly in this json format:
-{{
-    "valid": true,
-    "reason": explanation,
-    "normalized": normalized_answer
-}}"""
+{instruction}
 
-            else:
-                prompt = f"""Question: {question['text']}
-Answer: {answer}
+Disqualification rules:
+{rules}
 
-Analyze if this is a valid and clear answer.
-Return exactly in this json format:
-{{
-    "valid": true,
-    "reason": explanation,
-    "normalized": normalized_answer
-}}"""
+Set "disqualified" to true only if one of the disqualification rules applies to the normalized answer.""",
+    "boolean": "Analyze if this answer means Yes or No and output 'Yes' or 'No' as the normalized answer. Consider variations and informal responses.",
+    "days_per_week": "Normalize the answer to a number of days, output only the digits as the normalized answer.",
+    "location": "Normalize the answer to the name of the city or town and analyze if this location is in the UK.",
+    "default": "Analyze if this is a valid and clear answer.",
+    "system": "You are a strict answer validator for a job interview.",
+}
 
-            # Make OpenAI API call
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a strict answer validator for a job interview."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                response_format={ "type": "json_object" }
-            )
+ASSESSMENT_SCHEMA = {
+    "name": "answer_assessment",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "valid": {"type": "boolean"},
+            "reason": {"type": "string"},
+            "normalized": {"type": "string"},
+            "disqualified": {"type": "boolean"},
+        },
+        "required": ["valid", "reason", "normalized", "disqualified"],
+        "additionalProperties": False,
+    },
+}
 
-            # Parse response
-            result = response.choices[0].message.content
-            print(result)
-            is_valid = json.loads(result)['valid']
-            reason = json.loads(result)['reason']
-            normalized_answer = json.loads(result)['normalized']
 
-            return is_valid, reason, normalized_answer
+class OpenAIClient:
+    def __init__(self):
+        self.normalizer = AnswerNormalizer()
+        self.cache = ValidationCache(list(PROMPT_TEMPLATES.values()) + list(PREDICATE_DESCRIPTIONS.values()))
 
-        except Exception as e:
-            print(f"OpenAI validation error: {str(e)}")
-            return False, str(answer), "Validation error occurred"
+    @property
+    def client(self):
+        """AsyncOpenAI client, built on first use"""
+        return providers.get("openai")
 
-    def should_end_interview(self, question_id: int, normalized_answer: str) -> Tuple[bool, str]:
+    async def assess_answer(self, question: Question, answer: str) -> AnswerAssessment:
         """
-        Check if interview should be ended based on answer
-        Returns: (should_end, end_message)
+        Validate and normalize an answer, and get the model's verdict on the question's
+        disqualification rules in the same completion. The LLM is only called when neither
+        the local normalizer nor the cache can answer. The rules themselves are applied by
+        the interview flow.
         """
-        if question_id == 1 and normalized_answer.lower() != 'yes':
-            return True, "Thank you for your time, but we require UK work eligibility. Thank you for your interest. Goodbye."
-            
-        elif question_id == 2:
+        # Skip the LLM round trip when the answer can be normalized locally with confidence
+        local = self.normalizer.normalize(question, answer)
+        if local and local.confidence >= constants.ANSWER_NORMALIZER_MIN_CONFIDENCE:
+            self.normalizer.stats.record_hit(question.id)
+            return AnswerAssessment(True, local.reason, local.value, None)
+
+        with span("validation_cache.get"):
+            cached = await self.cache.get("assess", question.id, answer)
+        if cached is None:
             try:
-                days = int(normalized_answer)
-                if days < 3:
-                    return True, "Thank you for your time, but we require minimum 3 days availability. Thank you for your interest. Goodbye."
-            except ValueError:
-                return True, "Thank you for your time, but we require clear availability information. Thank you for your interest. Goodbye."
-                
-        elif question_id == 3:
-            if not self._is_uk_location(normalized_answer):
-                return True, "Thank you for your time, but we only accept candidates based in the UK. Thank you for your interest. Goodbye."
-        
-        return False, ""
+                started = time.perf_counter()
+                cached = await self._request_assessment(question, answer)
+                self.normalizer.stats.record_llm_call(question.id, time.perf_counter() - started)
+                await self.cache.set("assess", question.id, answer, cached)
+            except Exception as e:
+                log_event("openai_validation_error", logging.ERROR, question=question.id, error=str(e))
+                return AnswerAssessment(False, "Validation error occurred", str(answer), None)
 
-    def _is_uk_location(self, location: str) -> bool:
-        """Check if a location is in the UK using OpenAI"""
-        try:
-            response = self.client.chat.completions.create(
+        return AnswerAssessment(cached['valid'], cached['reason'], cached['normalized'], cached['disqualified'])
+
+    async def _request_assessment(self, question: Question, answer: str) -> Dict[str, Any]:
+        kind = question.normalizer or question.type
+        rules = question.disqualify
+        prompt = PROMPT_TEMPLATES["assess"].format(
+            question=question.text,
+            answer=answer,
+            instruction=PROMPT_TEMPLATES.get(kind, PROMPT_TEMPLATES["default"]),
+            rules="\n".join(f"- {describe_predicate(rule['if'])}" for rule in rules) or "- None",
+        )
+        with span("openai.assess"):
+            response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
-                    {"role": "system", "content": "You are a geography expert. Answer with only 'true' or 'false' in json format. For example: {'valid': true/false}"},
-                    {"role": "user", "content": f"Is {location} a location in the United Kingdom?"}
+                    {"role": "system", "content": PROMPT_TEMPLATES["system"]},
+                    {"role": "user", "content": prompt}
                 ],
                 temperature=0.1,
-                response_format={ "type": "json_object" }
+                response_format={"type": "json_schema", "json_schema": ASSESSMENT_SCHEMA}
             )
-            return json.loads(response.choices[0].message.content)['valid']
-        except Exception as e:
-            print(f"Location check error: {str(e)}")
-            return False 
\ No newline at end of file
+        result = json_codec.loads(response.choices[0].message.content)
+        log_payload("openai_assessment", result, question=question.id)
+        return result
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from twilio.base.exceptions import TwilioRestException
+
+from app.config import constants
+from app.database.outbound_message import OutboundMessageModel
+from app.util.logging import log_event, span
+from app.util.providers import providers
+from app.util.status_tracker import MESSAGE_STATUS_CALLBACK
+
+
+def is_transient(error: Exception) -> bool:
+    """Rate limiting, Twilio server errors and network failures are worth retrying"""
+    if isinstance(error, TwilioRestException):
+        return error.status == 429 or error.status >= 500
+    return True
+
+
+class SenderThrottle:
+    """
+    Spaces sends from the same Twilio number to stay within its throughput limit.
+    The throttle is per process, N workers together send at N times the rate.
+    """
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second
+        self._next_slot: Dict[str, float] = {}
+
+    async def acquire(self, sender: str) -> None:
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(sender, now))
+        self._next_slot[sender] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class OutboundQueue:
+    """
+    Durable queue for outbound SMS and WhatsApp messages.
+
+    Callers enqueue a row in ``outbound_message`` and return without waiting on
+    Twilio. A drain task leases due rows in batches, sends them within each
+    sender number's throughput limit and writes each outcome back as soon as
+    the send completes. Batches are sized so a batch for a single sender ends
+    well within the lease, and sends stop once the lease is nearly over,
+    leaving the rest to be leased again rather than sent twice. Messages to
+    the same recipient go out in queue order. Transient errors are retried with exponential backoff up to
+    OUTBOUND_MAX_ATTEMPTS, and permanent errors mark the message as failed.
+    """
+
+    def __init__(self):
+        self.poll_interval = constants.OUTBOUND_POLL_SECONDS
+        self.lease = constants.OUTBOUND_LEASE_SECONDS
+        # A batch all from one sender takes batch_size / per_second, keep that to half the lease
+        self.batch_size = max(1, min(
+            constants.OUTBOUND_BATCH_SIZE, int(self.lease * constants.OUTBOUND_SENDS_PER_SECOND / 2)
+        ))
+        self.max_attempts = constants.OUTBOUND_MAX_ATTEMPTS
+        self.throttle = SenderThrottle(constants.OUTBOUND_SENDS_PER_SECOND)
+        self._semaphore = asyncio.Semaphore(constants.OUTBOUND_CONCURRENCY)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._fallback_tasks: set = set()
+        self._stats = {"enqueued": 0, "sent": 0, "retried": 0, "failed": 0, "direct": 0, "expired": 0, "errors": 0}
+
+    @property
+    def twilio_client(self):
+        return providers.get("twilio")
+
+    async def enqueue(self, to_number: str, from_number: str, body: str, candidate_id: Optional[int] = None) -> None:
+        try:
+            await OutboundMessageModel.enqueue(to_number, from_number, body, candidate_id)
+            self._stats["enqueued"] += 1
+            self._wakeup.set()
+        except Exception as e:
+            # Without the queue table the message is still sent, just without retries
+            self._stats["errors"] += 1
+            log_event("outbound_enqueue_error", logging.WARNING, error=str(e))
+            task = asyncio.create_task(self._send_direct(to_number, from_number, body))
+            self._fallback_tasks.add(task)
+            task.add_done_callback(self._fallback_tasks.discard)
+
+    async def _send_direct(self, to_number: str, from_number: str, body: str) -> None:
+        try:
+            await self.throttle.acquire(from_number)
+            await asyncio.to_thread(self.twilio_client.messages.create, from_=from_number, body=body, to=to_number)
+            self._stats["direct"] += 1
+        except Exception as e:
+            self._stats["failed"] += 1
+            log_event("outbound_direct_send_error", logging.ERROR, to=to_number, error=str(e))
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self._fallback_tasks:
+            await asyncio.wait(set(self._fallback_tasks), timeout=self.lease)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                drained = await self.drain_once()
+            except Exception as e:
+                self._stats["errors"] += 1
+                log_event("outbound_drain_error", logging.ERROR, exc_info=e)
+                drained = 0
+            if drained < self.batch_size:
+                # Rows enqueued by other workers and retries falling due are picked up on the next poll
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def drain_once(self) -> int:
+        messages = await OutboundMessageModel.claim_due(self.batch_size, self.lease)
+        if not messages:
+            return 0
+
+        by_recipient: "OrderedDict[str, List[OutboundMessageModel]]" = OrderedDict()
+        for message in messages:
+            by_recipient.setdefault(message.to_number, []).append(message)
+
+        # Past this point another worker may lease the rows again, so they are left unsent
+        send_until = time.monotonic() + self.lease * 0.8
+        await asyncio.gather(*(self._send_in_order(group, send_until) for group in by_recipient.values()))
+        return len(messages)
+
+    async def _send_in_order(self, messages: List[OutboundMessageModel], send_until: float) -> None:
+        held = []
+        held_until = None
+        for message in messages:
+            if held_until is not None:
+                # An earlier message to this recipient is waiting to be retried, keep the order
+                held.append({"id": message.id, "status": "queued", "next_attempt_at": held_until})
+                continue
+            if time.monotonic() >= send_until:
+                self._stats["expired"] += 1
+                log_event("outbound_lease_expiring", logging.WARNING, message_id=message.id)
+                break
+            result = await self._send(message)
+            # Recorded straight away, a sent message must not stay leased as "sending"
+            await OutboundMessageModel.bulk_record_results([result])
+            if result["status"] == "queued":
+                held_until = result["next_attempt_at"]
+        await OutboundMessageModel.bulk_record_results(held)
+
+    async def _send(self, message: OutboundMessageModel) -> Dict[str, Any]:
+        attempts = message.attempts + 1
+        async with self._semaphore:
+            await self.throttle.acquire(message.from_number)
+            try:
+                with span("twilio.messages.create"):
+                    sent = await asyncio.to_thread(
+                        self.twilio_client.messages.create,
+                        from_=message.from_number,
+                        body=message.body,
+                        to=message.to_number,
+                        status_callback=MESSAGE_STATUS_CALLBACK
+                    )
+            except Exception as e:
+                return self._failure(message, attempts, e)
+
+        self._stats["sent"] += 1
+        return {"id": message.id, "status": "sent", "attempts": attempts, "sid": sent.sid, "last_error": None}
+
+    def _failure(self, message: OutboundMessageModel, attempts: int, error: Exception) -> Dict[str, Any]:
+        log_event("outbound_send_error", logging.WARNING, message_id=message.id, attempt=attempts, error=str(error))
+        if not is_transient(error) or attempts >= self.max_attempts:
+            self._stats["failed"] += 1
+            return {"id": message.id, "status": "failed", "attempts": attempts, "last_error": str(error)}
+
+        self._stats["retried"] += 1
+        delay = min(
+            constants.OUTBOUND_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1),
+            constants.OUTBOUND_BACKOFF_MAX_SECONDS,
+        )
+        delay *= random.uniform(0.5, 1.0)
+        return {
+            "id": message.id,
+            "status": "queued",
+            "attempts": attempts,
+            "last_error": str(error),
+            "next_attempt_at": datetime.now() + timedelta(seconds=delay),
+        }
+
+    async def stats(self) -> Dict[str, Any]:
+        try:
+            statuses = await OutboundMessageModel.counts_by_status()
+        except Exception as e:
+            statuses = {"error": str(e)}
+        return {**self._stats, "statuses": statuses}
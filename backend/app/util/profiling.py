@@ -0,0 +1,142 @@
+"""
+On-demand profiling of single requests.
+
+A request that carries ``X-Profile: <PROFILING_TOKEN>`` (or
+``?profile=<PROFILING_TOKEN>``) runs under pyinstrument when it is installed,
+a sampling profiler that follows the request across awaits, and under
+cProfile otherwise. cProfile also records whatever else the worker runs
+meanwhile, so it only profiles one request at a time. The profile is written to PROFILE_DIR, which keeps the
+newest PROFILE_KEEP files, and can be downloaded from /api/admin/profiles
+with the same token in ``X-Profiling-Token``.
+Requests without the flag only pay for a header lookup.
+"""
+import asyncio
+import cProfile
+import hmac
+import os
+import tempfile
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from app.config import constants
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # pragma: no cover - depends on the environment
+    Profiler = None
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    return bool(constants.PROFILING_TOKEN) and token is not None and hmac.compare_digest(token, constants.PROFILING_TOKEN)
+
+
+class ProfileStore:
+    """Bounded ring of profile files on disk, the oldest are removed first"""
+
+    def __init__(self, directory: Optional[str] = None, keep: Optional[int] = None):
+        self.directory = directory or constants.PROFILE_DIR or os.path.join(tempfile.gettempdir(), "rtriibe-profiles")
+        self.keep = keep or constants.PROFILE_KEEP
+
+    def new_name(self, path: str, suffix: str) -> str:
+        route = path.strip("/").replace("/", "_") or "root"
+        return f"{time.strftime('%Y%m%dT%H%M%S')}-{route}-{uuid.uuid4().hex[:8]}{suffix}"
+
+    def save(self, name: str, write: Callable[[str], None]) -> None:
+        """Write a profile through ``write(path)`` and drop the oldest beyond the limit"""
+        os.makedirs(self.directory, exist_ok=True)
+        write(os.path.join(self.directory, name))
+        self._trim()
+
+    def _trim(self) -> None:
+        for entry in self.list()[self.keep:]:
+            try:
+                os.remove(os.path.join(self.directory, entry["name"]))
+            except OSError:
+                pass
+
+    def list(self) -> List[Dict]:
+        """Profiles, newest first"""
+        try:
+            entries = [e for e in os.scandir(self.directory) if e.is_file()]
+        except OSError:
+            return []
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        return [{"name": e.name, "bytes": e.stat().st_size, "created": e.stat().st_mtime} for e in entries]
+
+    def path(self, name: str) -> Optional[str]:
+        # Only bare names from list() are served
+        if os.path.basename(name) != name:
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+
+profile_store = ProfileStore()
+
+
+class ProfilingMiddleware:
+    """Profiles the requests that ask for it, see the module docstring"""
+
+    def __init__(self, app):
+        self.app = app
+        # cProfile can only follow one request at a time, a second flagged request runs unprofiled
+        self._cprofile_busy = False
+
+    def _requested_token(self, scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                return value.decode()
+        if b"profile=" in scope.get("query_string", b""):
+            values = parse_qs(scope["query_string"].decode()).get("profile")
+            return values[0] if values else None
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not constants.PROFILING_TOKEN:
+            return await self.app(scope, receive, send)
+        token = self._requested_token(scope)
+        if token is None or not is_authorized(token):
+            return await self.app(scope, receive, send)
+
+        if Profiler is not None:
+            await self._run_pyinstrument(scope, receive, send)
+        elif not self._cprofile_busy:
+            await self._run_cprofile(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    def _send_with_profile(self, send, name: str):
+        async def wrapped(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", name.encode())]
+            await send(message)
+        return wrapped
+
+    async def _run_pyinstrument(self, scope, receive, send):
+        profiler = Profiler(interval=constants.PROFILE_SAMPLE_INTERVAL_SECONDS, async_mode="enabled")
+        name = profile_store.new_name(scope["path"], ".html")
+        profiler.start()
+        try:
+            await self.app(scope, receive, self._send_with_profile(send, name))
+        finally:
+            profiler.stop()
+            await asyncio.to_thread(profile_store.save, name, lambda path: _write_text(path, profiler.output_html()))
+
+    async def _run_cprofile(self, scope, receive, send):
+        self._cprofile_busy = True
+        profiler = cProfile.Profile()
+        name = profile_store.new_name(scope["path"], ".prof")
+        profiler.enable()
+        try:
+            await self.app(scope, receive, self._send_with_profile(send, name))
+        finally:
+            profiler.disable()
+            self._cprofile_busy = False
+            await asyncio.to_thread(profile_store.save, name, profiler.dump_stats)
+
+
+def _write_text(path: str, text: str) -> None:
+    with open(path, "w") as f:
+        f.write(text)
@@ -0,0 +1,128 @@
+"""
+Provider clients and other start-up work, created on first use.
+
+Importing the Twilio, VAPI and OpenAI SDKs and building their clients used
+to happen when the router module was imported, before a worker could serve
+anything. Each one is now a named factory. ``get`` builds it on first use,
+and the lifespan warms all of them up concurrently in the background. /ready
+answers 503 until every warm-up has finished. How long each took is kept
+for /ready and the ``startup`` stages on /metrics.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from app.config import constants
+from app.util import metrics
+from app.util.logging import log_event
+
+
+class ProviderRegistry:
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.boot: Dict[str, float] = {}
+        self.ready = False
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+        # Per-provider locks so warm-ups run side by side, but each is built once
+        with self._locks[name]:
+            if name not in self._instances:
+                started = time.perf_counter()
+                self._instances[name] = self._factories[name]()
+                self._seconds[name] = time.perf_counter() - started
+                metrics.registry.observe(f"startup.{name}", self._seconds[name], "startup")
+        return self._instances[name]
+
+    def record_boot(self, stage: str, seconds: float) -> None:
+        self.boot[stage] = seconds
+        metrics.registry.observe(f"startup.{stage}", seconds, "startup")
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.warm_up())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def warm_up(self) -> None:
+        started = time.perf_counter()
+        names = list(self._factories)
+        results = await asyncio.gather(*(asyncio.to_thread(self.get, name) for name in names), return_exceptions=True)
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                self._errors[name] = str(result)
+                log_event("provider_warm_up_error", logging.ERROR, provider=name, error=str(result))
+        self.record_boot("warm_up", time.perf_counter() - started)
+        self.ready = not self._errors
+        log_event("providers_ready" if self.ready else "providers_not_ready",
+                  **{k: round(v * 1000, 1) for k, v in self._seconds.items()})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "pid": os.getpid(),
+            "boot_ms": {k: round(v * 1000, 1) for k, v in self.boot.items()},
+            "providers_ms": {k: round(v * 1000, 1) for k, v in self._seconds.items()},
+            "errors": self._errors,
+        }
+
+
+def _twilio_client():
+    from twilio.rest import Client
+
+    client = Client(constants.TWILIO_ACCOUNT_SID, constants.TWILIO_AUTH_TOKEN)
+    if constants.TWILIO_API_BASE_URL:
+        client.api.base_url = constants.TWILIO_API_BASE_URL
+    # Touch the API domain so the first message doesn't pay for loading it
+    client.api.v2010.account
+    return client
+
+
+def _vapi_client():
+    from vapi_python import Vapi
+
+    return Vapi(api_key=constants.VAPI_KEY)
+
+
+def _openai_client():
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(api_key=constants.OPENAI_API_KEY, base_url=constants.OPENAI_BASE_URL or None)
+
+
+def _question_catalog():
+    from app.util.question_catalog import get_question_catalog
+
+    return get_question_catalog()
+
+
+def _audio_dir() -> str:
+    path = os.path.join('app', 'static', 'audio')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+providers = ProviderRegistry()
+providers.register("twilio", _twilio_client)
+providers.register("vapi", _vapi_client)
+providers.register("openai", _openai_client)
+providers.register("question_catalog", _question_catalog)
+providers.register("audio_dir", _audio_dir)
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+from app.config import constants
+from app.util.logging import log_event
+
+QUESTIONS_PATH = os.path.join('app', 'data', 'questions.json')
+
+
+class Question:
+    """A compiled, read-only interview question with its per-channel renderings"""
+
+    __slots__ = (
+        'id', 'position', 'text', 'type', 'options', 'normalizer', 'follow_up', 'disqualify',
+        'sms_text', 'whatsapp_text', 'voice_text', 'tts_text',
+    )
+
+    def __init__(self, data: Dict[str, Any], position: int, question_id: Any = None):
+        set_ = object.__setattr__
+        set_(self, 'id', question_id if question_id is not None else data['id'])
+        set_(self, 'position', position)
+        set_(self, 'text', data['text'])
+        set_(self, 'type', data.get('type', 'text'))
+        set_(self, 'options', tuple(data.get('options', ())))
+        set_(self, 'normalizer', data.get('normalizer'))
+        set_(self, 'disqualify', tuple(data.get('disqualify', ())))
+        set_(self, 'follow_up', MappingProxyType({
+            answer: Question(follow_up, position, f"{self.id}_followup")
+            for answer, follow_up in data.get('follow_up', {}).items()
+        }))
+
+        voice_text = data.get('voice_text') or self._spoken(self.text)
+        set_(self, 'sms_text', data.get('sms_text') or self._with_options(self.text, "Options:"))
+        set_(self, 'whatsapp_text', data.get('whatsapp_text') or self._with_options(self.text, "*Options:*"))
+        set_(self, 'voice_text', voice_text)
+        set_(self, 'tts_text', data.get('tts_text') or voice_text)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Question is immutable")
+
+    def __repr__(self) -> str:
+        return f"Question(id={self.id!r}, position={self.position})"
+
+    def _with_options(self, text: str, heading: str) -> str:
+        if self.type != 'choice' or not self.options:
+            return text
+        options = '\n'.join(f"• {opt}" for opt in self.options)
+        return f"{text}\n\n{heading}\n{options}"
+
+    @staticmethod
+    def _spoken(text: str) -> str:
+        # "Where do you live? (City/Town)" reads better aloud without brackets and slashes
+        text = re.sub(r"\s*\(([^)]*)\)", r". \1", text).replace("/", " or ")
+        text = re.sub(r"\?\.", "?", text)
+        return " ".join(text.split())
+
+    def text_for(self, communication_method: Optional[str]) -> str:
+        """Rendering of the question for a candidate's communication method"""
+        if communication_method == "whatsapp_message":
+            return self.whatsapp_text
+        return self.sms_text
+
+
+class QuestionCatalog:
+    """Immutable set of questions indexed by position, and by id including follow-ups"""
+
+    __slots__ = ('questions', 'by_id', 'version')
+
+    def __init__(self, questions: Tuple[Question, ...], version: str):
+        self.questions = questions
+        index = {}
+        for question in questions:
+            index[question.id] = question
+            index.update((f.id, f) for f in question.follow_up.values())
+        self.by_id: Mapping[Any, Question] = MappingProxyType(index)
+        self.version = version
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "QuestionCatalog":
+        data = json.loads(raw)
+        questions = tuple(Question(q, position) for position, q in enumerate(data['questions']))
+        return cls(questions, hashlib.sha256(raw).hexdigest()[:16])
+
+    @classmethod
+    def load(cls, path: str = QUESTIONS_PATH) -> "QuestionCatalog":
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def __iter__(self) -> Iterator[Question]:
+        return iter(self.questions)
+
+    def at(self, position: int) -> Optional[Question]:
+        if 0 <= position < len(self.questions):
+            return self.questions[position]
+        return None
+
+    def get(self, question_id: Any) -> Optional[Question]:
+        return self.by_id.get(question_id)
+
+
+class QuestionCatalogLoader:
+    """
+    Hot-reloading holder for the current catalog.
+
+    The file's mtime is checked at most once per reload interval. A changed
+    file is compiled into a new catalog which then replaces the old one in a
+    single reference assignment, so readers never see a half-built catalog.
+    An invalid file keeps the previous catalog in place.
+    """
+
+    def __init__(self, path: str = QUESTIONS_PATH, reload_interval: float = 1.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtime = os.path.getmtime(path)
+        self._catalog = QuestionCatalog.load(path)
+        self._checked_at = time.monotonic()
+
+    @property
+    def catalog(self) -> QuestionCatalog:
+        if time.monotonic() - self._checked_at >= self.reload_interval:
+            self._maybe_reload()
+        return self._catalog
+
+    def _maybe_reload(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            return  # Another thread is already reloading
+        try:
+            self._checked_at = time.monotonic()
+            mtime = os.path.getmtime(self.path)
+            if mtime == self._mtime:
+                return
+            catalog = QuestionCatalog.load(self.path)
+            self._mtime = mtime
+            if catalog.version != self._catalog.version:
+                log_event("question_catalog_reloaded", version=catalog.version)
+                self._catalog = catalog
+        except Exception as e:
+            log_event("question_catalog_reload_error", logging.ERROR, error=str(e))
+        finally:
+            self._lock.release()
+
+
+_loader: Optional[QuestionCatalogLoader] = None
+
+
+def get_question_catalog() -> QuestionCatalog:
+    """Current question catalog for this process"""
+    global _loader
+    if _loader is None:
+        _loader = QuestionCatalogLoader(reload_interval=constants.QUESTION_CATALOG_RELOAD_SECONDS)
+    return _loader.catalog
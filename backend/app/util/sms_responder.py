@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from app.config import constants
+from app.util.idempotency import UnrecordedResponse
+from app.util.logging import log_event
+
+
+class SmsResponder:
+    """
+    Answers inbound SMS within Twilio's webhook deadline.
+
+    Each message is handled on its own task. The webhook waits for it up to the
+    latency budget and replies inline in TwiML when it finishes in time.
+    Otherwise the webhook acknowledges with empty TwiML and the reply is sent
+    through the REST API once the task completes. When recent turns are
+    mostly over budget the webhook stops waiting and defers straight away,
+    and it switches back to inline replies once latency recovers.
+    """
+
+    def __init__(self, interview_bot):
+        self.interview_bot = interview_bot
+        self.budget = constants.SMS_REPLY_BUDGET_SECONDS
+        self._latencies: deque = deque(maxlen=constants.SMS_REPLY_LATENCY_WINDOW)
+        self._tasks: set = set()
+        self._stats = {"inline": 0, "deferred": 0, "deferred_sent": 0, "deferred_failed": 0}
+
+    def _percentile(self, fraction: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+    @property
+    def deferring(self) -> bool:
+        """Defer without waiting while the recent p90 turn latency is over budget"""
+        p90 = self._percentile(0.9)
+        return p90 is not None and p90 > self.budget
+
+    async def _handle(self, from_number: str, message: str) -> str:
+        started = time.perf_counter()
+        try:
+            # Turns from the same number run in order on its conversation actor
+            return await self.interview_bot.conversations.run(
+                from_number, lambda: self.interview_bot.handle_response(from_number, message)
+            )
+        finally:
+            self._latencies.append(time.perf_counter() - started)
+
+    async def respond(self, from_number: str, message: str) -> Optional[str]:
+        """Reply to return inline, or None when the reply will be sent through the REST API"""
+        task = asyncio.create_task(self._handle(from_number, message))
+        wait = 0 if self.deferring else self.budget
+        done, _ = await asyncio.wait({task}, timeout=wait)
+        if task in done:
+            self._stats["inline"] += 1
+            return task.result()
+
+        self._stats["deferred"] += 1
+        delivery = asyncio.create_task(self._deliver(from_number, task))
+        self._tasks.add(delivery)
+        delivery.add_done_callback(self._tasks.discard)
+        return None
+
+    async def _deliver(self, from_number: str, task: "asyncio.Task[str]") -> None:
+        try:
+            try:
+                reply = await task
+            except UnrecordedResponse as e:
+                # The webhook was already acknowledged, the candidate still hears about the failure
+                reply = e.response
+            await self.interview_bot.send_reply(from_number, reply)
+            self._stats["deferred_sent"] += 1
+        except Exception as e:
+            self._stats["deferred_failed"] += 1
+            log_event("deferred_sms_reply_error", logging.ERROR, to=from_number, error=str(e))
+
+    async def stop(self) -> None:
+        """Let replies still in flight finish before shutting down"""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=constants.EVALUATION_TIMEOUT_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        p50, p90 = self._percentile(0.5), self._percentile(0.9)
+        return {
+            **self._stats,
+            "in_flight": len(self._tasks),
+            "budget_seconds": self.budget,
+            "deferring": self.deferring,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p90_ms": round(p90 * 1000, 1) if p90 is not None else None,
+        }
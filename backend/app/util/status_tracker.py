@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import random
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import asyncpg
+from twilio.request_validator import RequestValidator
+
+from app.config import constants
+from app.database.config import db_engine
+from app.database.twilio_status_event import TwilioStatusEventModel, STATUS_CHANNEL
+from app.util.logging import log_event
+
+MESSAGE_STATUS_CALLBACK = f"{constants.BASE_URL}/api/qualification/webhook/status/message"
+CALL_STATUS_CALLBACK = f"{constants.BASE_URL}/api/qualification/webhook/status/call"
+CALL_STATUS_EVENTS = ['initiated', 'ringing', 'answered', 'completed']
+
+_validator = RequestValidator(constants.TWILIO_AUTH_TOKEN)
+
+
+def is_valid_twilio_request(path: str, params: Mapping[str, str], signature: Optional[str]) -> bool:
+    """Check the X-Twilio-Signature of a callback against the public URL it was sent to"""
+    if not signature:
+        return False
+    return _validator.validate(f"{constants.BASE_URL}{path}", dict(params), signature)
+
+
+class _Waiter:
+    __slots__ = ("statuses", "future")
+
+    def __init__(self, statuses: Set[str]):
+        self.statuses = statuses
+        self.future: "asyncio.Future[Optional[str]]" = asyncio.get_running_loop().create_future()
+
+
+class StatusTracker:
+    """
+    Lets callers wait for a Twilio message or call status instead of polling.
+
+    Status callbacks are stored in ``twilio_status_event`` and announced with
+    Postgres NOTIFY. A waiter subscribes to a SID and is woken by the
+    notification, whichever worker received the callback. The stored history
+    is checked first so a status that arrived before the subscription isn't
+    missed. If LISTEN isn't available the waiter falls back to reading the
+    table every STATUS_FALLBACK_POLL_SECONDS. A dropped LISTEN connection
+    switches waiters to that fallback and is re-established with backoff.
+    """
+
+    def __init__(self):
+        self._waiters: Dict[str, List[_Waiter]] = {}
+        self._connection: Optional[asyncpg.Connection] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stats = {"callbacks": 0, "rejected": 0, "notifications": 0, "waits": 0, "timeouts": 0, "reconnects": 0}
+
+    async def start(self) -> None:
+        try:
+            await self._listen()
+        except Exception as e:
+            log_event("status_tracker_listen_unavailable", logging.WARNING, error=str(e))
+            self._schedule_reconnect()
+
+    async def stop(self) -> None:
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            await asyncio.gather(self._reconnect_task, return_exceptions=True)
+            self._reconnect_task = None
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            await connection.close()
+
+    async def _listen(self) -> None:
+        url = db_engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        connection = await asyncpg.connect(url)
+        try:
+            await connection.add_listener(STATUS_CHANNEL, self._on_notify)
+            connection.add_termination_listener(self._on_terminated)
+        except Exception:
+            await connection.close()
+            raise
+        self._connection = connection
+
+    def _on_terminated(self, connection) -> None:
+        if connection is not self._connection:
+            # Closed by stop(), or an older connection
+            return
+        self._connection = None
+        log_event("status_tracker_listen_lost", logging.WARNING)
+        # Waiters blocked on a notification that can no longer arrive go back to polling
+        for waiters in self._waiters.values():
+            for waiter in waiters:
+                if not waiter.future.done():
+                    waiter.future.set_result(None)
+        self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        attempt = 0
+        while self._connection is None:
+            attempt += 1
+            delay = min(
+                constants.STATUS_LISTEN_RECONNECT_BASE_SECONDS * 2 ** (attempt - 1),
+                constants.STATUS_LISTEN_RECONNECT_MAX_SECONDS,
+            )
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            try:
+                await self._listen()
+            except Exception as e:
+                log_event("status_tracker_reconnect_error", logging.WARNING, attempt=attempt, error=str(e))
+                continue
+            self._stats["reconnects"] += 1
+            log_event("status_tracker_listen_restored", attempt=attempt)
+
+    def _on_notify(self, connection, pid, channel: str, payload: str) -> None:
+        sid, _, status = payload.rpartition(":")
+        self._stats["notifications"] += 1
+        self.publish(sid, status)
+
+    def publish(self, sid: str, status: str) -> None:
+        """Wake the waiters subscribed to this SID and status"""
+        waiters = self._waiters.get(sid)
+        if not waiters:
+            return
+        for waiter in list(waiters):
+            if status in waiter.statuses and not waiter.future.done():
+                waiter.future.set_result(status)
+
+    async def record(self, sid: str, kind: str, status: str, error_code: Optional[str] = None) -> None:
+        self._stats["callbacks"] += 1
+        try:
+            await TwilioStatusEventModel.record(sid, kind, status, error_code)
+        except Exception as e:
+            log_event("twilio_status_store_error", logging.ERROR, error=str(e))
+        if self._connection is None:
+            # Without LISTEN the notification doesn't come back, wake local waiters directly
+            self.publish(sid, status)
+
+    def reject(self) -> None:
+        self._stats["rejected"] += 1
+
+    async def wait_for(self, sid: str, statuses: Iterable[str], timeout: float) -> Optional[str]:
+        """First of ``statuses`` reported for the SID, None if none arrives within the timeout"""
+        self._stats["waits"] += 1
+        waiter = _Waiter(set(statuses))
+        self._waiters.setdefault(sid, []).append(waiter)
+        try:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while True:
+                latest = await self._latest_status(sid)
+                if latest in waiter.statuses:
+                    return latest
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    return None
+                # With LISTEN working the history only needs checking once
+                interval = remaining if self._connection is not None else constants.STATUS_FALLBACK_POLL_SECONDS
+                try:
+                    status = await asyncio.wait_for(asyncio.shield(waiter.future), timeout=min(interval, remaining))
+                except asyncio.TimeoutError:
+                    continue
+                if status is not None:
+                    return status
+                # Woken because LISTEN dropped, check the history again and poll from here on
+                waiter.future = loop.create_future()
+        finally:
+            self._waiters[sid].remove(waiter)
+            if not self._waiters[sid]:
+                del self._waiters[sid]
+
+    async def _latest_status(self, sid: str) -> Optional[str]:
+        try:
+            return await TwilioStatusEventModel.latest_status(sid)
+        except Exception as e:
+            log_event("twilio_status_read_error", logging.WARNING, error=str(e))
+            return None
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "listening": self._connection is not None, "waiting": len(self._waiters)}
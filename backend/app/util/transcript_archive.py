@@ -0,0 +1,180 @@
+"""
+Cold storage for the answers of finished interviews.
+
+Qualified and disqualified candidates keep their full answers, VAPI
+transcripts included, in ``candidates.answers`` forever, which bloats the
+hot table. Once a candidate has been finished for TRANSCRIPT_ARCHIVE_AFTER_SECONDS
+the answers are compressed (zstd when zstandard is installed, gzip otherwise)
+into ``transcript_archive``, keyed by the SHA-256 of their content, and the
+candidate keeps only that digest in ``answers_archive``. ``answers`` reads
+them back through an in-process LRU of decompressed transcripts.
+"""
+import asyncio
+import gzip
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.config import constants
+from app.database.candidate import CandidateCRUD, CandidateModel
+from app.database.transcript_archive import TranscriptArchiveModel
+from app.util import json_codec
+from app.util.logging import log_event, span
+from app.util.lru_cache import LRUCache
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+FINISHED_STATUSES = ("qualified", "disqualified")
+
+
+def _select_codec(name: str) -> str:
+    if name == "gzip":
+        return "gzip"
+    if name == "zstd" and zstandard is None:
+        log_event("transcript_codec_unavailable", logging.WARNING, codec="zstd", fallback="gzip")
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def compress(raw: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    return gzip.compress(raw, compresslevel=9)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("transcript was archived with zstd but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class TranscriptArchive:
+    """Archival job and cached reader for finished interview answers, see the module docstring"""
+
+    def __init__(self):
+        self.codec = _select_codec(constants.TRANSCRIPT_ARCHIVE_CODEC)
+        self.interval = constants.TRANSCRIPT_ARCHIVE_INTERVAL_SECONDS
+        self.after = timedelta(seconds=constants.TRANSCRIPT_ARCHIVE_AFTER_SECONDS)
+        self.batch_size = constants.TRANSCRIPT_ARCHIVE_BATCH_SIZE
+        self.cache = LRUCache(constants.TRANSCRIPT_CACHE_SIZE)
+        self.cache_ttl = constants.TRANSCRIPT_CACHE_TTL_SECONDS
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"archived": 0, "raw_bytes": 0, "stored_bytes": 0, "reads": 0, "cache_hits": 0, "errors": 0}
+        self._last_run: Optional[Dict[str, Any]] = None
+
+    async def answers(self, candidate: CandidateModel) -> List[Dict]:
+        """The candidate's answers, read back from the archive when they have been moved there"""
+        if candidate.answers_archive is None:
+            return candidate.get_answers()
+        return json_codec.loads(await self.read(candidate.answers_archive))
+
+    async def read(self, digest: str) -> str:
+        """Decompressed answers JSON for an archive digest"""
+        self._stats["reads"] += 1
+        # Content addressed, a cached transcript can never go stale
+        cached = self.cache.get(digest)
+        if cached is not None:
+            self._stats["cache_hits"] += 1
+            return cached
+        with span("db.transcript_archive.get"):
+            row = await TranscriptArchiveModel.get(digest)
+        if row is None:
+            raise LookupError(f"archived transcript {digest} not found")
+        text = (await asyncio.to_thread(decompress, row.data, row.codec)).decode()
+        self.cache.set(digest, text, self.cache_ttl)
+        return text
+
+    def _pack(self, answers: List[str]) -> List[Dict]:
+        rows = []
+        for text in answers:
+            raw = text.encode()
+            data = compress(raw, self.codec)
+            rows.append({
+                "digest": hashlib.sha256(raw).hexdigest(),
+                "codec": self.codec,
+                "data": data,
+                "raw_bytes": len(raw),
+                "stored_bytes": len(data),
+            })
+        return rows
+
+    async def _pack_async(self, answers: List[str]) -> List[Dict]:
+        return await asyncio.to_thread(self._pack, answers)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                self._stats["errors"] += 1
+                log_event("transcript_archive_error", logging.ERROR, exc_info=e)
+
+    async def run_once(self) -> Dict[str, Any]:
+        """Archive every candidate finished long enough ago, in batches, and measure the hot table around it"""
+        before = await CandidateCRUD.storage_stats()
+        finished_before = datetime.now() - self.after
+        archived, raw_bytes, stored_bytes = 0, 0, 0
+        while True:
+            with span("transcript_archive.batch"):
+                rows = await TranscriptArchiveModel.archive_batch(
+                    FINISHED_STATUSES, finished_before, self.batch_size, self._pack_async
+                )
+            archived += len(rows)
+            raw_bytes += sum(r["raw_bytes"] for r in rows)
+            stored_bytes += sum(r["stored_bytes"] for r in rows)
+            if len(rows) < self.batch_size:
+                break
+        after = await CandidateCRUD.storage_stats()
+
+        self._stats["archived"] += archived
+        self._stats["raw_bytes"] += raw_bytes
+        self._stats["stored_bytes"] += stored_bytes
+        # answers_bytes drops at once, table_bytes only as VACUUM hands the space back
+        self._last_run = {
+            "at": datetime.now().isoformat(),
+            "archived": archived,
+            "raw_bytes": raw_bytes,
+            "stored_bytes": stored_bytes,
+            "answers_bytes_before": before["answers_bytes"],
+            "answers_bytes_after": after["answers_bytes"],
+            "table_bytes_before": before["table_bytes"],
+            "table_bytes_after": after["table_bytes"],
+        }
+        if archived:
+            log_event("transcripts_archived", **self._last_run)
+        return self._last_run
+
+    async def stats(self) -> Dict[str, Any]:
+        try:
+            totals = await TranscriptArchiveModel.totals()
+        except Exception as e:
+            totals = {"error": str(e)}
+        raw, stored = self._stats["raw_bytes"], self._stats["stored_bytes"]
+        return {
+            **self._stats,
+            "codec": self.codec,
+            "compression_ratio": round(raw / stored, 2) if stored else None,
+            "cached": len(self.cache),
+            "last_run": self._last_run,
+            "archive": totals,
+        }
+
+
+transcript_archive = TranscriptArchive()
@@ -0,0 +1,106 @@
+import re
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from app.config import constants
+from app.util.answer_normalizer import AnswerNormalizer
+from app.util.question_catalog import Question, QuestionCatalog, get_question_catalog
+
+_WORD = re.compile(r"[a-z0-9']+")
+# "(City/Town)" and "(Please respond with Yes or No)" are hints the assistant may word differently or leave out
+_PARENTHETICAL = re.compile(r"\([^)]*\)")
+# Words that say nothing about which question is being asked
+_STOPWORDS = frozenset({
+    "a", "an", "the", "you", "your", "are", "do", "did", "have", "any", "to", "in", "on", "of", "or", "with",
+    "please", "respond", "yes", "no", "is", "that", "what", "which", "how", "where", "can", "could",
+})
+
+BOT_ROLES = frozenset({"bot", "assistant"})
+USER_ROLES = frozenset({"user", "customer"})
+
+
+def _content_words(text: str) -> FrozenSet[str]:
+    return frozenset(w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS)
+
+
+def _question_words(question: Question) -> FrozenSet[str]:
+    """Content words of the question itself, without its parenthesised hints"""
+    return _content_words(_PARENTHETICAL.sub(" ", question.text))
+
+
+class TranscriptExtractor:
+    """
+    Turns a VAPI call transcript into per-question answers.
+
+    Each assistant turn is matched against the catalog questions, follow-ups
+    included, by how many of the question's content words it repeats. The
+    candidate's turns up to the next matched question are that question's
+    replies, so clarifying exchanges in between count as well. The latest
+    reply the local normalizer is confident about becomes the answer. Without
+    one, the raw replies are kept with confidence 0 for review.
+    """
+
+    MATCH_THRESHOLD = 0.6
+
+    def __init__(self, normalizer: AnswerNormalizer):
+        self.normalizer = normalizer
+        self._version: Optional[str] = None
+        self._index: Tuple[Tuple[Question, FrozenSet[str]], ...] = ()
+
+    def _questions(self, catalog: QuestionCatalog) -> Tuple[Tuple[Question, FrozenSet[str]], ...]:
+        if catalog.version != self._version:
+            index = []
+            for question in catalog:
+                index.append((question, _question_words(question)))
+                index.extend((f, _question_words(f)) for f in question.follow_up.values())
+            self._index = tuple(index)
+            self._version = catalog.version
+        return self._index
+
+    def match_question(self, text: str, catalog: Optional[QuestionCatalog] = None) -> Optional[Question]:
+        """Question an assistant turn asks, None for small talk and clarifications"""
+        words = _content_words(text)
+        best, best_score = None, self.MATCH_THRESHOLD
+        for question, question_words in self._questions(catalog or get_question_catalog()):
+            if not question_words:
+                continue
+            score = len(question_words & words) / len(question_words)
+            if score > best_score:
+                best, best_score = question, score
+        return best
+
+    def extract(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        catalog = get_question_catalog()
+        replies: Dict[Any, List[str]] = {}
+        asked: List[Question] = []
+        current: Optional[Question] = None
+
+        for turn in messages:
+            role = turn.get('role')
+            text = (turn.get('message') or turn.get('content') or '').strip()
+            if not text:
+                continue
+            if role in BOT_ROLES:
+                question = self.match_question(text, catalog)
+                if question is not None:
+                    current = question
+                    if question.id not in replies:
+                        replies[question.id] = []
+                        asked.append(question)
+            elif role in USER_ROLES and current is not None:
+                replies[current.id].append(text)
+
+        timestamp = datetime.utcnow().isoformat()
+        answers = []
+        for question in asked:
+            if replies[question.id]:
+                answers.append({**self._answer(question, replies[question.id]), "source": "vapi", "timestamp": timestamp})
+        return answers
+
+    def _answer(self, question: Question, replies: List[str]) -> Dict[str, Any]:
+        raw = " ".join(replies)
+        for reply in reversed(replies):
+            normalized = self.normalizer.normalize(question, reply)
+            if normalized and normalized.confidence >= constants.ANSWER_NORMALIZER_MIN_CONFIDENCE:
+                return {"question": question.id, "answer": normalized.value, "raw": raw, "confidence": normalized.confidence}
+        return {"question": question.id, "answer": raw, "raw": raw, "confidence": 0.0}
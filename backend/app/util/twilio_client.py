@@ -1,6 +1,8 @@
 from twilio.rest import Client
 from typing import Optional
+import logging
 from config import settings
+from app.util.logging import log_event
 
 class TwilioClient:
     def __init__(self):
@@ -28,7 +30,7 @@ class TwilioClient:
             )
             return message.sid
         except Exception as e:
-            print(f"Error sending SMS: {str(e)}")
+            log_event("sms_send_error", logging.ERROR, error=str(e))
             return None
 
     def get_message_status(self, message_sid: str) -> Optional[str]:
@@ -45,5 +47,5 @@ class TwilioClient:
             message = self.client.messages(message_sid).fetch()
             return message.status
         except Exception as e:
-            print(f"Error getting message status: {str(e)}")
+            log_event("message_status_error", logging.WARNING, error=str(e))
             return None 
\ No newline at end of file
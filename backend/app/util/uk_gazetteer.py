@@ -0,0 +1,186 @@
+import os
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+GAZETTEER_PATH = os.path.join('app', 'data', 'uk_gazetteer.txt')
+
+_POSTCODE = re.compile(r"\b([A-Z]{1,2})(\d[A-Z\d]?)(?:\s*(\d[A-Z]{2}))?\b")
+_NON_WORD = re.compile(r"[^a-z0-9'\s]")
+
+# Filler words stripped before fuzzy matching a whole answer
+_STOPWORDS = {
+    "i", "im", "i'm", "live", "living", "in", "at", "near", "nr", "around", "outside", "just",
+    "currently", "based", "the", "city", "of", "town", "area", "from", "am", "a", "my", "is",
+    "it's", "its", "village", "county", "moved", "to", "recently", "now", "close", "by",
+}
+
+# Place names that are also common English words are only accepted when they are the whole answer.
+# Counties don't belong here, they are what qualifies a place name ("Paris, Kent").
+_COMMON_WORDS = {
+    "bath", "bow", "bury", "deal", "flint", "fleet", "hyde", "leven", "porth", "reading",
+    "sale", "wells", "wick", "ely", "barry", "nelson", "mold", "ayr", "hull", "derby",
+    "poole", "stoke", "sutton", "hayes", "street", "down", "rugby",
+}
+
+# Answers that negate a place ("not in the UK", "abroad, not England") are left to the LLM
+_NEGATIONS = {"not", "outside", "abroad", "overseas", "never", "isnt", "dont", "arent", "wasnt"}
+
+# Non-UK qualifiers that can't go in the non_uk list because they are also UK names ("Kent, Washington")
+_FOREIGN_QUALIFIERS = {"washington", "washington dc", "dc", "wa", "us"}
+
+
+def _negated(text: str) -> bool:
+    words = text.split()
+    return "no longer" in text or any(w in _NEGATIONS or w.endswith("n't") for w in words)
+
+
+def _clean(text: str) -> str:
+    text = text.lower().replace("’", "'").replace(".", "").replace("-", " ")
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def _within_distance(a: str, b: str, limit: int) -> bool:
+    """Bounded Levenshtein distance check with early exit"""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            current.append(value)
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+class UKGazetteer:
+    """
+    Offline index of UK place names, counties and postcode areas.
+
+    Names are kept in a single sorted tuple and searched with bisect, so the
+    index stays a few tens of kilobytes and a lookup takes microseconds.
+    ``lookup`` returns True for a known UK location, False for a known non-UK
+    location and None when the answer is not in the index, names both
+    ("Birmingham, Alabama") or is negated ("not in the UK").
+    """
+
+    def __init__(self, path: str = GAZETTEER_PATH):
+        sections = self._read_sections(path)
+        self._uk_names: Tuple[str, ...] = tuple(sorted({_clean(n) for n in sections.get("places", [])}))
+        self._non_uk_names: Tuple[str, ...] = tuple(sorted({_clean(n) for n in sections.get("non_uk", [])}))
+        self._postcode_areas = frozenset(
+            area for line in sections.get("postcode_areas", []) for area in line.split()
+        )
+        self._max_words = max(
+            (n.count(" ") + 1 for n in self._uk_names + self._non_uk_names), default=1
+        )
+
+    @staticmethod
+    def _read_sections(path: str) -> Dict[str, List[str]]:
+        sections: Dict[str, List[str]] = {}
+        current = None
+        with open(path, 'r', encoding='utf-8') as f:
+            for raw in f:
+                line = raw.strip()
+                if not line or line.startswith('#'):
+                    continue
+                if line.startswith('[') and line.endswith(']'):
+                    current = sections.setdefault(line[1:-1], [])
+                elif current is not None:
+                    current.append(line)
+        return sections
+
+    def __len__(self) -> int:
+        return len(self._uk_names) + len(self._postcode_areas)
+
+    @staticmethod
+    def _contains(names: Tuple[str, ...], name: str) -> bool:
+        index = bisect_left(names, name)
+        return index < len(names) and names[index] == name
+
+    def _fuzzy_contains(self, name: str) -> bool:
+        """Match a name allowing one typo (two for longer names) against names sharing its first letter"""
+        if len(name) < 5:
+            return False
+        limit = 1 if len(name) < 9 else 2
+        names = self._uk_names
+        start = bisect_left(names, name[0])
+        end = bisect_right(names, name[0] + "￿")
+        return any(_within_distance(name, candidate, limit) for candidate in names[start:end])
+
+    def _postcode_area(self, text: str) -> Optional[str]:
+        for area, district, inward in _POSTCODE.findall(text.upper()):
+            # A bare outward code ("M14") is only trusted when it is the whole answer
+            if area in self._postcode_areas and (inward or text.strip().upper() == area + district):
+                return area
+        return None
+
+    def _ngrams(self, words: List[str]) -> Iterator[Tuple[int, int]]:
+        for size in range(min(self._max_words, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                yield start, start + size
+
+    def lookup(self, location: str) -> Optional[bool]:
+        """Return True/False when the location is known to be in/outside the UK, None if unknown or mixed"""
+        if not location or not location.strip():
+            return None
+        text = _clean(location)
+        if _negated(text):
+            return None
+        segments = location.split(',')
+        if len(segments) > 1 and _clean(segments[-1]) in _FOREIGN_QUALIFIERS:
+            return None
+        if self._postcode_area(location):
+            return True
+
+        if self._contains(self._uk_names, text):
+            return True
+        if self._contains(self._non_uk_names, text):
+            return False
+
+        # Longest matches first so "new york" is consumed before "york"
+        words = text.split()
+        consumed = [False] * len(words)
+        found_uk = found_non_uk = False
+        for start, end in self._ngrams(words):
+            if any(consumed[start:end]):
+                continue
+            phrase = " ".join(words[start:end])
+            if end - start == 1 and (phrase in _COMMON_WORDS or phrase in _STOPWORDS):
+                continue
+            if self._contains(self._uk_names, phrase):
+                found_uk = True
+            elif self._contains(self._non_uk_names, phrase):
+                found_non_uk = True
+            else:
+                continue
+            consumed[start:end] = [True] * (end - start)
+        if found_uk and found_non_uk:
+            # Many UK names recur abroad, mixed evidence is left to the LLM
+            return None
+        if found_uk:
+            return True
+        if found_non_uk:
+            return False
+
+        for segment in segments:
+            stripped = " ".join(w for w in _clean(segment).split() if w not in _STOPWORDS)
+            if stripped and self._fuzzy_contains(stripped):
+                return True
+        return None
+
+
+_gazetteer: Optional[UKGazetteer] = None
+
+
+def get_gazetteer() -> UKGazetteer:
+    """Load the bundled gazetteer once per process"""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = UKGazetteer()
+    return _gazetteer
@@ -0,0 +1,109 @@
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.config import constants
+from app.database.validation_cache import ValidationCacheModel
+from app.util import json_codec
+from app.util.logging import log_event
+from app.util.lru_cache import LRUCache
+from app.util.question_catalog import get_question_catalog
+
+
+def normalize_answer_key(answer: str) -> str:
+    """Case-fold and collapse whitespace so trivially different answers share an entry"""
+    return " ".join(answer.casefold().split())
+
+
+class ValidationCache:
+    """
+    Cache of LLM validation results shared across workers.
+
+    Entries are keyed by (kind, question id, prompt version, normalized answer).
+    Lookups go through an in-process LRU first and the ``validation_cache``
+    table second. The prompt version is a hash of the question catalog version and
+    the prompt templates, so editing either invalidates every cached result.
+    """
+
+    PURGE_EVERY = 500
+
+    def __init__(self, templates: Iterable[str]):
+        self.ttl = constants.VALIDATION_CACHE_TTL_SECONDS
+        self.local = LRUCache(constants.VALIDATION_CACHE_LRU_SIZE)
+        self._templates_digest = hashlib.sha256("\x00".join(templates).encode()).hexdigest()
+        self._catalog_version: Optional[str] = None
+        self._version = ""
+        self._writes = 0
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+    @property
+    def version(self) -> str:
+        """Prompt version, follows the question catalog version so edits to questions.json invalidate entries"""
+        catalog_version = get_question_catalog().version
+        if catalog_version != self._catalog_version:
+            if self._catalog_version is not None:
+                self.local.clear()
+            self._catalog_version = catalog_version
+            self._version = hashlib.sha256(f"{self._templates_digest}|{catalog_version}".encode()).hexdigest()[:16]
+        return self._version
+
+    def _key(self, kind: str, question_id: Any, answer: str) -> Tuple[str, str]:
+        answer_key = normalize_answer_key(answer)
+        raw = f"{kind}|{question_id}|{self.version}|{answer_key}"
+        return hashlib.sha256(raw.encode()).hexdigest(), answer_key
+
+    async def get(self, kind: str, question_id: Any, answer: str) -> Optional[Any]:
+        key, _ = self._key(kind, question_id, answer)
+        value = self.local.get(key)
+        if value is not None:
+            self._stats["memory_hits"] += 1
+            return value
+
+        try:
+            entry = await ValidationCacheModel.get_valid(key)
+        except Exception as e:
+            self._stats["errors"] += 1
+            log_event("validation_cache_read_error", logging.WARNING, error=str(e))
+            entry = None
+
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        self._stats["db_hits"] += 1
+        value = json_codec.loads(entry.result)
+        remaining = (entry.expires_at - datetime.now()).total_seconds()
+        self.local.set(key, value, min(self.ttl, max(remaining, 0)))
+        return value
+
+    async def set(self, kind: str, question_id: Any, answer: str, value: Any) -> None:
+        key, answer_key = self._key(kind, question_id, answer)
+        self.local.set(key, value, self.ttl)
+        try:
+            await ValidationCacheModel.upsert(
+                key=key,
+                question_id=str(question_id),
+                prompt_version=self.version,
+                answer=answer_key,
+                result=json_codec.dumps(value),
+                ttl=self.ttl,
+            )
+            self._stats["writes"] += 1
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                await ValidationCacheModel.purge_expired()
+        except Exception as e:
+            self._stats["errors"] += 1
+            log_event("validation_cache_write_error", logging.WARNING, error=str(e))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["memory_hits"] + self._stats["db_hits"] + self._stats["misses"]
+        hits = self._stats["memory_hits"] + self._stats["db_hits"]
+        return {
+            **self._stats,
+            "lookups": lookups,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.local),
+            "prompt_version": self.version,
+        }
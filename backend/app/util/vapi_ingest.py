@@ -0,0 +1,212 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from app.config import constants
+from app.database.candidate import CandidateCRUD, CandidateModel
+from app.util.idempotency import IdempotencyStore
+from app.util.logging import log_event
+from app.util.transcript_archive import transcript_archive
+from app.util.transcript_extractor import TranscriptExtractor
+
+# Only these event types change state, the rest (transcript, speech-update, ...) are acknowledged and dropped
+ACTIONABLE_TYPES = frozenset({"status-update", "end-of-call-report"})
+
+# Call outcomes after which the interview falls back to SMS
+SMS_FALLBACK_REASONS = frozenset({
+    'customer-busy', 'no-answer', 'declined', 'voicemail', 'customer-did-not-answer', 'assistant-said-end-call-phrase',
+})
+
+
+class VapiEvent(NamedTuple):
+    key: Optional[str]
+    call_id: Optional[str]
+    type: str
+    customer_number: Optional[str]
+    message: Dict[str, Any]
+
+
+def parse_vapi_event(data: Dict[str, Any]) -> VapiEvent:
+    message_data = data.get('message', {})
+    call_data = message_data.get('call', {})
+    customer_data = call_data.get('customer', {}) or message_data.get('customer', {})
+    call_id = call_data.get('id')
+    key = IdempotencyStore.key("vapi", message_data.get('id')) or IdempotencyStore.key(
+        "vapi", call_id, message_data.get('type'), message_data.get('timestamp')
+    )
+    return VapiEvent(key, call_id, message_data.get('type', ''), customer_data.get('number'), message_data)
+
+
+class VapiIngestQueue:
+    """
+    Takes VAPI webhook events off the request path.
+
+    The webhook only parses the payload and offers actionable events to a
+    bounded queue. When the queue is full the webhook waits briefly for space
+    and is refused if none frees up, so back-pressure reaches VAPI rather than
+    memory. A consumer drains micro-batches, drops retried deliveries and
+    coalesces events per call so only the latest status update and end of
+    call report count. End of call transcripts are turned into per-question
+    answers and the candidate is queued for evaluation. Candidates are looked up and answers written in one query and
+    one transaction per batch. Events are only marked as seen once their
+    batch is stored, a failed batch releases them so VAPI's retries go through.
+    """
+
+    def __init__(self, interview_bot, idempotency: IdempotencyStore):
+        self.interview_bot = interview_bot
+        self.idempotency = idempotency
+        self.extractor = TranscriptExtractor(interview_bot.openai_client.normalizer)
+        self.batch_size = constants.VAPI_INGEST_BATCH_SIZE
+        self.batch_wait = constants.VAPI_INGEST_BATCH_WAIT_SECONDS
+        self.put_timeout = constants.VAPI_INGEST_PUT_TIMEOUT_SECONDS
+        self._queue: "asyncio.Queue[VapiEvent]" = asyncio.Queue(maxsize=constants.VAPI_INGEST_QUEUE_SIZE)
+        self._task: Optional[asyncio.Task] = None
+        self._max_depth = 0
+        self._stats = {
+            "accepted": 0, "ignored": 0, "rejected": 0, "waited_for_space": 0,
+            "batches": 0, "events_processed": 0, "coalesced": 0, "duplicates": 0, "missing_number": 0, "answers_extracted": 0, "errors": 0,
+        }
+
+    async def offer(self, data: Dict[str, Any]) -> bool:
+        """Queue an event, False when the queue stayed full for the put timeout"""
+        event = parse_vapi_event(data)
+        if event.type not in ACTIONABLE_TYPES:
+            self._stats["ignored"] += 1
+            return True
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._stats["waited_for_space"] += 1
+            try:
+                await asyncio.wait_for(self._queue.put(event), timeout=self.put_timeout)
+            except asyncio.TimeoutError:
+                self._stats["rejected"] += 1
+                return False
+        self._stats["accepted"] += 1
+        self._max_depth = max(self._max_depth, self._queue.qsize())
+        return True
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.batch_wait + constants.EVALUATION_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            log_event("vapi_ingest_stopped", logging.WARNING, queued=self._queue.qsize())
+        self._task.cancel()
+        self._task = None
+
+    async def _next_batch(self) -> List[VapiEvent]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self.process_batch(batch)
+            except Exception as e:
+                self._stats["errors"] += 1
+                log_event("vapi_ingest_batch_error", logging.ERROR, exc_info=e, size=len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def process_batch(self, events: List[VapiEvent]) -> None:
+        self._stats["batches"] += 1
+        claimed = await self.idempotency.claim_many([e.key for e in events if e.key])
+        keys = set(claimed)
+        try:
+            completed, fallbacks = await self._store(events, claimed)
+        except Exception:
+            await self.idempotency.release_many(keys)
+            raise
+        await self.idempotency.complete_many(keys)
+
+        # Finished calls are evaluated like finished SMS interviews, which also lets them be archived
+        for candidate_id in completed:
+            self.interview_bot.evaluation_worker.enqueue(candidate_id)
+
+        for candidate in fallbacks:
+            sms_status = await self.interview_bot.try_sms(candidate)
+            if not sms_status.get("success"):
+                log_event("sms_fallback_failed", logging.WARNING, candidate_id=candidate.id, error=sms_status.get("error"))
+
+    async def _store(self, events: List[VapiEvent], claimed: Set[str]) -> Tuple[List[int], List[CandidateModel]]:
+        """
+        Write the batch's answers, returns the ids of candidates whose call ended
+        with answers and the candidates whose call should fall back to SMS
+        """
+        fresh = []
+        for event in events:
+            if event.key is None:
+                fresh.append(event)
+            elif event.key in claimed:
+                # A retry of an event in the same batch is dropped too
+                claimed.discard(event.key)
+                fresh.append(event)
+        self._stats["duplicates"] += len(events) - len(fresh)
+
+        # Keep the latest event of each type per call, later events supersede earlier ones
+        latest: Dict[tuple, VapiEvent] = {}
+        missing = 0
+        for event in fresh:
+            if not event.customer_number:
+                missing += 1
+                log_event("vapi_event_missing_number", logging.WARNING, type=event.type, call_id=event.call_id)
+                continue
+            latest[(event.call_id or event.customer_number, event.type)] = event
+        self._stats["missing_number"] += missing
+        self._stats["coalesced"] += len(fresh) - missing - len(latest)
+        if not latest:
+            return [], []
+
+        candidates = await CandidateCRUD.get_candidates_by_phones([e.customer_number for e in latest.values()])
+        entries: Dict[int, List[Dict]] = {}
+        fallbacks: Dict[int, CandidateModel] = {}
+        for event in latest.values():
+            candidate = candidates.get(CandidateModel.normalize_phone(event.customer_number))
+            if candidate is None:
+                log_event("vapi_event_unknown_number", logging.WARNING, type=event.type, number=event.customer_number)
+                continue
+            if event.type == 'end-of-call-report':
+                transcript = event.message.get('artifact', {}).get('messages', [])
+                if transcript:
+                    # Structured answers for the flow and evaluation, the raw transcript is kept alongside
+                    answers = self.extractor.extract(transcript)
+                    self._stats["answers_extracted"] += len(answers)
+                    entries.setdefault(candidate.id, []).extend(answers)
+                    entries[candidate.id].append({"transcript": transcript, "timestamp": datetime.utcnow().isoformat()})
+            elif event.type == 'status-update':
+                ended_reason = event.message.get('endedReason')
+                if event.message.get('status') == 'ended' and ended_reason in SMS_FALLBACK_REASONS:
+                    log_event("vapi_call_ended_sms_fallback", candidate_id=candidate.id, reason=ended_reason)
+                    fallbacks[candidate.id] = candidate
+
+        # A late report for an archived candidate brings the archived answers back into the row
+        await CandidateCRUD.bulk_append_answers(entries, transcript_archive.read)
+        self._stats["events_processed"] += len(latest)
+        return list(entries), list(fallbacks.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "depth": self._queue.qsize(),
+            "max_depth": self._max_depth,
+            "capacity": self._queue.maxsize,
+        }
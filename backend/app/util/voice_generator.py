@@ -4,15 +4,20 @@ import os
 from datetime import datetime
 from app.config import constants
 import hashlib
+import logging
+from app.util.logging import log_event, span
+from app.util.providers import providers
 
 class VoiceGenerator:
     def __init__(self):
         self.eleven_labs_api_key = constants.ELEVEN_LABS_API_KEY
         self.voice_id = constants.ELEVEN_LABS_VOICE_ID
-        self.static_dir = os.path.join('app', 'static', 'audio')
-        os.makedirs(self.static_dir, exist_ok=True)
         self.audio_cache = {}
 
+    @property
+    def static_dir(self) -> str:
+        return providers.get("audio_dir")
+
     def _get_filename_for_text(self, text: str) -> str:
         """Generate a consistent filename for given text"""
         # Create a hash of the text to use as filename
@@ -30,7 +35,6 @@ class VoiceGenerator:
             filename = self._get_filename_for_text(text)
             filepath = os.path.join(self.static_dir, filename)
 
-            print(filepath)
             # Check if file already exists
             if os.path.exists(filepath):
                 audio_url = f"{constants.BASE_URL}/static/audio/{filename}"
@@ -38,7 +42,7 @@ class VoiceGenerator:
                 return audio_url
 
             # If not exists, generate new audio
-            url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}"
+            url = f"{constants.ELEVEN_LABS_API_URL}/v1/text-to-speech/{self.voice_id}"
             headers = {
                 "Accept": "audio/mpeg",
                 "xi-api-key": self.eleven_labs_api_key,
@@ -56,15 +60,16 @@ class VoiceGenerator:
                 "optimize_streaming_latency": 4
             }
 
-            response = requests.post(
-                url, 
-                json=data, 
-                headers=headers,
-                timeout=5
-            )
+            with span("elevenlabs.tts"):
+                response = requests.post(
+                    url, 
+                    json=data, 
+                    headers=headers,
+                    timeout=5
+                )
             
             if response.status_code != 200:
-                print(f"ElevenLabs error: {response.text}")
+                log_event("elevenlabs_error", logging.ERROR, status_code=response.status_code, error=response.text)
                 return None
 
             # Save the audio file
@@ -77,7 +82,7 @@ class VoiceGenerator:
             return audio_url
 
         except Exception as e:
-            print(f"Error generating speech: {str(e)}")
+            log_event("speech_generation_error", logging.ERROR, error=str(e))
             return None
 
     def _cleanup_old_files(self, keep_last: int = 50):
@@ -93,4 +98,4 @@ class VoiceGenerator:
             for file in files[:-keep_last]:
                 os.remove(file)
         except Exception as e:
-            print(f"Error cleaning up files: {str(e)}")
\ No newline at end of file
+            log_event("speech_cleanup_error", logging.WARNING, error=str(e))
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Microbenchmarks for app.util.json_codec backends.
+
+Times the JSON work one request does on the hot paths: parsing a VAPI
+end-of-call report, the read-modify-write of a candidate's ``answers``
+column, and rendering an API response. Each step is timed with both the
+stdlib and the orjson codec.
+
+    python scripts/bench_json_codec.py [--number 2000]
+
+Needs the application settings in the environment, like the app itself.
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.util.json_codec import OrjsonCodec, StdlibCodec, orjson  # noqa: E402
+
+
+def vapi_report(turns: int = 40) -> bytes:
+    messages = []
+    for i in range(turns):
+        messages.append({
+            "role": "bot" if i % 2 == 0 else "user",
+            "message": "Do you have any restrictions on your availability due to childcare, study, or other commitments?"
+            if i % 2 == 0 else "No, I'm free Monday to Thursday most weeks.",
+            "time": 1734000000000 + i * 4000,
+            "endTime": 1734000000000 + i * 4000 + 3500,
+            "secondsFromStart": i * 4.0,
+            "duration": 3500,
+        })
+    payload = {
+        "message": {
+            "type": "end-of-call-report",
+            "endedReason": "assistant-said-end-call-phrase",
+            "call": {"id": "c0ffee00-0000-4000-8000-000000000000", "customer": {"number": "+447700900123"}},
+            "artifact": {"messages": messages, "transcript": " ".join(m["message"] for m in messages)},
+            "timestamp": 1734000200000,
+        }
+    }
+    return StdlibCodec().dumps_bytes(payload)
+
+
+def answers_column(entries: int = 12) -> str:
+    now = datetime.utcnow().isoformat()
+    answers = [
+        {"question": i % 6 + 1, "answer": "Yes" if i % 2 else "Leeds", "raw": "yes I am", "confidence": 0.95,
+         "source": "vapi", "timestamp": now}
+        for i in range(entries)
+    ]
+    return StdlibCodec().dumps(answers)
+
+
+def metrics_response() -> dict:
+    return {
+        str(q): {"answers": 1200, "fast_path_hits": 1100, "llm_calls": 100, "hit_rate": 0.9167,
+                 "avg_llm_latency_ms": 812.4, "latency_saved_ms": 893640.0}
+        for q in range(1, 7)
+    }
+
+
+def bench(codec, number: int):
+    report, answers, response = vapi_report(), answers_column(), metrics_response()
+    new_answer = {"question": 3, "answer": "Leeds", "timestamp": datetime.utcnow().isoformat()}
+
+    def request():
+        codec.loads(report)
+        stored = codec.loads(answers)
+        stored.append(new_answer)
+        codec.dumps(stored)
+        codec.dumps_bytes(response)
+
+    steps = {
+        "parse VAPI report": lambda: codec.loads(report),
+        "answers read-modify-write": lambda: codec.dumps(codec.loads(answers) + [new_answer]),
+        "render response": lambda: codec.dumps_bytes(response),
+        "whole request": request,
+    }
+    return {name: min(timeit.repeat(fn, number=number, repeat=5)) / number for name, fn in steps.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2000, help="iterations per timing run")
+    args = parser.parse_args()
+
+    codecs = [StdlibCodec()] + ([OrjsonCodec()] if orjson is not None else [])
+    results = {codec.name: bench(codec, args.number) for codec in codecs}
+
+    print(f"{'step':<28}" + "".join(f"{name + ' (us)':>16}" for name in results) + f"{'saved (us)':>14}")
+    for step in results["json"]:
+        row = [results[name][step] * 1e6 for name in results]
+        saved = f"{row[0] - row[-1]:>14.1f}" if len(row) > 1 else f"{'-':>14}"
+        print(f"{step:<28}" + "".join(f"{value:>16.1f}" for value in row) + saved)
+    if orjson is None:
+        print("orjson is not installed, only the stdlib codec was measured")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,463 @@
+"""
+Offline load test for the interview webhooks.
+
+Starts local fakes for Twilio, VAPI, ElevenLabs, OpenAI and Relevance AI
+with configurable latency, runs the app against them with uvicorn, then
+drives concurrent conversations through the SMS, voice and VAPI webhooks
+and reports per-endpoint latency percentiles and throughput as JSON.
+
+    python scripts/loadtest.py --database-url postgresql+asyncpg://u:p@localhost/loadtest \\
+        --migrate --conversations 200 --concurrency 50 \\
+        --latency twilio=0.15,vapi=0.3,elevenlabs=0.4,openai=0.8,relevance=1.0 \\
+        --output loadtest.json
+
+The app needs Postgres (row locking, LISTEN/NOTIFY), SQLite is not supported.
+Use a throwaway database, the run registers its own candidates.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from twilio.request_validator import RequestValidator
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_LATENCY = "twilio=0.15,vapi=0.3,elevenlabs=0.4,openai=0.8,relevance=1.0"
+
+TWILIO_ACCOUNT_SID = "AC" + "0" * 32
+TWILIO_AUTH_TOKEN = "loadtest-auth-token"
+
+# Answers by question id that take a candidate through app/data/questions.json without disqualifying them,
+# follow-up answers are keyed by the answer that triggers the follow-up
+ANSWERS = {1: "Yes", 2: "4 days", 3: "Leeds", 4: "Yes", 5: "No", 6: "Yes"}
+FOLLOW_UP_ANSWERS = {(4, "Yes"): "Teach Supply Agency"}
+
+# Final statuses of a candidate who completed the interview
+COMPLETED_STATUSES = ("pending", "qualified")
+
+
+def interview_turns(questions: List[Dict], follow_ups: bool) -> List[Tuple[str, str]]:
+    """
+    (question text, answer) for each turn of the interview, in catalog order.
+    A follow-up turn is only added where the answer triggers one and the
+    channel asks follow-ups at all.
+    """
+    turns = []
+    for question in questions:
+        answer = ANSWERS.get(question["id"], question.get("options", ["Yes"])[0])
+        turns.append((question["text"], answer))
+        follow_up = question.get("follow_up", {}).get(answer)
+        if follow_ups and follow_up is not None:
+            turns.append((follow_up["text"], FOLLOW_UP_ANSWERS.get((question["id"], answer), "Yes")))
+    return turns
+
+
+def parse_pairs(value: str, cast=float) -> Dict[str, float]:
+    pairs = {}
+    for item in filter(None, value.split(",")):
+        name, _, number = item.partition("=")
+        pairs[name.strip()] = cast(number)
+    return pairs
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class FakeProviders:
+    """One local server standing in for every provider API the app calls"""
+
+    def __init__(self, latency: Dict[str, float], jitter: float, whatsapp_share: float):
+        self.latency = latency
+        self.jitter = jitter
+        self.whatsapp_share = whatsapp_share
+        self.calls: Counter = Counter()
+        self.validator = RequestValidator(TWILIO_AUTH_TOKEN)
+        self.callbacks = httpx.AsyncClient(timeout=10)
+        self._tasks = set()
+        self.app = self._build()
+
+    async def _delay(self, provider: str) -> None:
+        self.calls[provider] += 1
+        base = self.latency.get(provider, 0.0)
+        if base > 0:
+            await asyncio.sleep(base * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def _callback(self, url: Optional[str], params: Dict[str, str]) -> None:
+        """Send a signed Twilio status callback after the provider latency"""
+        if not url:
+            return
+
+        async def send():
+            await self._delay("twilio_callback")
+            headers = {"X-Twilio-Signature": self.validator.compute_signature(url, params)}
+            try:
+                await self.callbacks.post(url, data=params, headers=headers)
+            except httpx.HTTPError:
+                self.calls["twilio_callback_error"] += 1
+
+        task = asyncio.create_task(send())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _build(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.post("/2010-04-01/Accounts/{account_sid}/Messages.json")
+        async def create_message(account_sid: str, request: Request):
+            form = await request.form()
+            await self._delay("twilio")
+            sid = f"SM{uuid.uuid4().hex}"
+            to = form.get("To", "")
+            status = "delivered"
+            if to.startswith("whatsapp:") and random.random() >= self.whatsapp_share:
+                status = "undelivered"
+            self._callback(form.get("StatusCallback"), {"MessageSid": sid, "MessageStatus": status})
+            return Response(json.dumps({
+                "sid": sid, "account_sid": account_sid, "to": to, "from": form.get("From"),
+                "body": form.get("Body"), "status": "queued", "num_segments": "1", "direction": "outbound-api",
+                "date_created": None, "date_updated": None, "date_sent": None, "price": None, "error_code": None,
+                "uri": f"/2010-04-01/Accounts/{account_sid}/Messages/{sid}.json",
+            }), status_code=201, media_type="application/json")
+
+        @app.post("/2010-04-01/Accounts/{account_sid}/Calls.json")
+        async def create_call(account_sid: str, request: Request):
+            form = await request.form()
+            await self._delay("twilio")
+            sid = f"CA{uuid.uuid4().hex}"
+            answered = random.random() < self.whatsapp_share
+            self._callback(form.get("StatusCallback"), {"CallSid": sid, "CallStatus": "completed" if answered else "no-answer"})
+            return Response(json.dumps({
+                "sid": sid, "account_sid": account_sid, "to": form.get("To"), "from": form.get("From"),
+                "status": "queued", "direction": "outbound-api",
+                "uri": f"/2010-04-01/Accounts/{account_sid}/Calls/{sid}.json",
+            }), status_code=201, media_type="application/json")
+
+        @app.post("/call/phone")
+        async def vapi_call():
+            await self._delay("vapi")
+            return {"id": str(uuid.uuid4()), "status": "queued"}
+
+        @app.post("/v1/text-to-speech/{voice_id}")
+        async def text_to_speech(voice_id: str):
+            await self._delay("elevenlabs")
+            return Response(b"\xff\xfb" + bytes(2046), media_type="audio/mpeg")
+
+        @app.post("/v1/chat/completions")
+        async def chat_completion(request: Request):
+            body = await request.json()
+            await self._delay("openai")
+            prompt = body["messages"][-1]["content"]
+            match = re.search(r"^Answer: (.*)$", prompt, re.M)
+            answer = match.group(1).strip() if match else ""
+            content = json.dumps({"valid": True, "reason": "", "normalized": answer, "disqualified": False})
+            return {
+                "id": f"chatcmpl-{uuid.uuid4().hex}", "object": "chat.completion", "created": int(time.time()),
+                "model": body.get("model", "gpt-4o-mini"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 200, "completion_tokens": 30, "total_tokens": 230},
+            }
+
+        @app.post("/latest/evaluate")
+        async def evaluate():
+            await self._delay("relevance")
+            return {"evaluation": {"experience": 0.8, "availability": 0.9, "location": 1.0, "motivation": 0.7}}
+
+        return app
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await self.callbacks.aclose()
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.outcomes: Dict[str, Counter] = defaultdict(Counter)
+
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.errors[name] += 1
+            self.statuses[name][type(e).__name__] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - started)
+        self.statuses[name][str(response.status_code)] += 1
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+    def report(self, duration: float) -> Dict[str, Dict]:
+        endpoints = {}
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            ordered = sorted(self.latencies[name])
+            count = len(ordered) + sum(v for k, v in self.statuses[name].items() if not k.isdigit())
+            endpoints[name] = {
+                "requests": count,
+                "errors": self.errors[name],
+                "throughput_rps": round(count / duration, 2) if duration else 0.0,
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+                **{f"p{p}_ms": round(percentile(ordered, p) * 1000, 2) for p in (50, 90, 95, 99)},
+                "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+                "statuses": dict(self.statuses[name]),
+            }
+        return endpoints
+
+    def report_outcomes(self) -> Dict[str, Dict]:
+        """Final candidate statuses per channel, a run only measures the interview when all of them completed it"""
+        return {
+            channel: {
+                "completed": sum(counts[s] for s in COMPLETED_STATUSES),
+                "not_completed": sum(n for s, n in counts.items() if s not in COMPLETED_STATUSES),
+                "statuses": dict(counts),
+            }
+            for channel, counts in sorted(self.outcomes.items())
+        }
+
+
+class Conversation:
+    """One candidate going through the interview on a single channel"""
+
+    def __init__(self, index: int, channel: str, run_id: str, questions: List[Dict]):
+        self.index = index
+        self.channel = channel
+        self.phone = f"+44770{run_id}{index:05d}"
+        self.email = f"loadtest-{run_id}-{index}@example.com"
+        self.questions = questions
+        self.candidate_id: Optional[int] = None
+        self.contacted_by: Optional[str] = None
+
+    async def register(self, client: httpx.AsyncClient, recorder: Recorder) -> None:
+        response = await recorder.call(client, "POST /register", "POST", "/api/qualification/register", json={
+            "name": f"Load Test {self.index}", "email": self.email, "phone": self.phone,
+        })
+        if response is None or response.status_code >= 400:
+            return
+        body = response.json()
+        self.candidate_id = body["data"]["id"]
+        # "Registration successful. We'll contact you via <method>"
+        match = re.search(r"via (\w+)$", body["message"])
+        self.contacted_by = match.group(1) if match else None
+
+    async def run(self, client: httpx.AsyncClient, recorder: Recorder, think: float) -> None:
+        if self.candidate_id is None:
+            recorder.outcomes[self.channel]["not_registered"] += 1
+            return
+        await getattr(self, f"_{self.channel}")(client, recorder, think)
+
+    async def settle(self, client: httpx.AsyncClient, recorder: Recorder, timeout: float) -> None:
+        """Wait for the candidate to reach a final status, evaluation runs in the background"""
+        if self.candidate_id is None:
+            return
+        status = "unknown"
+        deadline = time.monotonic() + timeout
+        while True:
+            response = await recorder.call(client, "GET /status", "GET", f"/api/qualification/status/{self.candidate_id}")
+            if response is not None and response.status_code == 200:
+                status = response.json()["status"]
+            if status in COMPLETED_STATUSES + ("disqualified",) or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(0.5)
+        recorder.outcomes[self.channel][status] += 1
+
+    async def _sms(self, client, recorder, think):
+        # Only the SMS contact path asks for consent first (current_question == -1)
+        bodies = ["Yes"] if self.contacted_by == "sms" else []
+        bodies += [answer for _, answer in interview_turns(self.questions, follow_ups=True)]
+        for body in bodies:
+            await recorder.call(client, "POST /webhook/sms", "POST", "/api/qualification/webhook/sms", data={
+                "From": self.phone, "To": "+447700900000", "Body": body, "MessageSid": f"SM{uuid.uuid4().hex}",
+            })
+            await asyncio.sleep(think)
+
+    async def _voice(self, client, recorder, think):
+        call_sid = f"CA{uuid.uuid4().hex}"
+        await recorder.call(client, "GET /webhook/voice", "GET", "/api/qualification/webhook/voice",
+                            params={"To": self.phone, "CallSid": call_sid})
+        # The voice webhook asks the catalog questions in order, without follow-ups
+        turns = [{"Digits": "1"}] + [
+            {"SpeechResult": answer} for _, answer in interview_turns(self.questions, follow_ups=False)
+        ]
+        for seq, turn in enumerate(turns):
+            await asyncio.sleep(think)
+            await recorder.call(client, "GET /webhook/voice/response", "GET", "/api/qualification/webhook/voice/response",
+                                params={"To": self.phone, "CallSid": call_sid, "seq": str(seq), **turn})
+
+    async def _vapi(self, client, recorder, think):
+        call = {"id": str(uuid.uuid4()), "customer": {"number": self.phone}}
+        started = int(time.time() * 1000)
+
+        async def event(message):
+            message = {"call": call, "timestamp": int(time.time() * 1000), **message}
+            await recorder.call(client, "POST /webhook/vapi", "POST", "/api/qualification/webhook/vapi",
+                                json={"message": message})
+
+        await event({"type": "status-update", "status": "in-progress"})
+        transcript = []
+        for question, answer in interview_turns(self.questions, follow_ups=True):
+            transcript += [{"role": "bot", "message": question, "time": started},
+                           {"role": "user", "message": answer, "time": started}]
+            # Streaming updates VAPI sends during the call, acknowledged and dropped by the app
+            await event({"type": "speech-update", "status": "stopped", "role": "user"})
+            await asyncio.sleep(think)
+        await event({"type": "status-update", "status": "ended", "endedReason": "customer-ended-call"})
+        await event({"type": "end-of-call-report", "endedReason": "customer-ended-call",
+                     "artifact": {"messages": transcript}})
+
+
+async def wait_until_up(url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url, timeout=1)
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def app_environment(args, fakes_url: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "PG_DATABASE_URL": args.database_url,
+        "BASE_URL": f"http://127.0.0.1:{args.app_port}",
+        "TWILIO_API_BASE_URL": fakes_url, "VAPI_API_URL": fakes_url, "ELEVEN_LABS_API_URL": fakes_url,
+        "OPENAI_BASE_URL": f"{fakes_url}/v1", "RELEVANCE_AI_API_URL": fakes_url,
+        "TWILIO_ACCOUNT_SID": TWILIO_ACCOUNT_SID, "TWILIO_AUTH_TOKEN": TWILIO_AUTH_TOKEN,
+        "LOG_LEVEL": args.log_level,
+    })
+    for name in ("SECRET_KEY", "TWILIO_FROM_PHONE", "TWILIO_WHATSAPP_NUMBER", "ELEVEN_LABS_API_KEY", "ELEVEN_LABS_VOICE_ID",
+                 "VAPI_KEY", "VAPI_VOICE_ID", "VAPI_PHONE_NUMBER_ID", "RELEVANCE_AI_PROJECT", "RELEVANCE_AI_API_KEY",
+                 "RELEVANCE_AI_AUTH_TOKEN", "RELEVANCE_AI_REGION", "OPENAI_API_KEY"):
+        env.setdefault(name, "loadtest")
+    env.setdefault("ALGORITHM", "HS256")
+    env.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+    return env
+
+
+async def main(args) -> Dict:
+    latency = {**parse_pairs(DEFAULT_LATENCY), **parse_pairs(args.latency)}
+    fakes = FakeProviders(latency, args.jitter, args.whatsapp_share)
+    fakes_server = uvicorn.Server(uvicorn.Config(fakes.app, host="127.0.0.1", port=args.fakes_port, log_level="warning"))
+    fakes_task = asyncio.create_task(fakes_server.serve())
+    fakes_url = f"http://127.0.0.1:{args.fakes_port}"
+    await wait_until_up(f"{fakes_url}/docs", 10)
+
+    env = app_environment(args, fakes_url)
+    if args.migrate:
+        subprocess.run(["alembic", "upgrade", "head"], cwd=BACKEND_DIR, env=env, check=True)
+    app_process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.server:app", "--host", "127.0.0.1", "--port", str(args.app_port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    try:
+        await wait_until_up(f"http://127.0.0.1:{args.app_port}/", 60)
+
+        with open(os.path.join(BACKEND_DIR, "app", "data", "questions.json")) as f:
+            questions = json.load(f)["questions"]
+        mix = parse_pairs(args.mix)
+        channels = random.Random(args.seed).choices(list(mix), weights=list(mix.values()), k=args.conversations)
+        run_id = f"{random.randrange(100):02d}"
+        conversations = [Conversation(i, channel, run_id, questions) for i, channel in enumerate(channels)]
+
+        recorder = Recorder()
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.app_port}", limits=limits,
+                                     timeout=args.request_timeout) as client:
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def bounded(coro):
+                async with semaphore:
+                    await coro
+
+            started = time.perf_counter()
+            await asyncio.gather(*(bounded(c.register(client, recorder)) for c in conversations))
+            await asyncio.gather(*(bounded(c.run(client, recorder, args.think_seconds)) for c in conversations))
+            duration = time.perf_counter() - started
+            await asyncio.gather(*(bounded(c.settle(client, recorder, args.settle_seconds)) for c in conversations))
+
+        return {
+            "config": {
+                "conversations": args.conversations, "concurrency": args.concurrency, "workers": args.workers,
+                "mix": mix, "latency_seconds": latency, "jitter": args.jitter, "think_seconds": args.think_seconds,
+            },
+            "duration_seconds": round(duration, 3),
+            "channels": dict(Counter(channels)),
+            "endpoints": recorder.report(duration),
+            "outcomes": recorder.report_outcomes(),
+            "provider_calls": dict(fakes.calls),
+        }
+    finally:
+        app_process.terminate()
+        try:
+            app_process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            app_process.kill()
+        await fakes.close()
+        fakes_server.should_exit = True
+        await fakes_task
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=os.environ.get("PG_DATABASE_URL"),
+                        help="Postgres URL for the app (default: PG_DATABASE_URL)")
+    parser.add_argument("--migrate", action="store_true", help="run alembic upgrade head first")
+    parser.add_argument("--conversations", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20, help="conversations in flight at once")
+    parser.add_argument("--mix", default="sms=0.5,voice=0.3,vapi=0.2", help="share of conversations per channel")
+    parser.add_argument("--latency", default="", help=f"provider latency in seconds (default: {DEFAULT_LATENCY})")
+    parser.add_argument("--jitter", type=float, default=0.25, help="latency varies by +/- this fraction")
+    parser.add_argument("--whatsapp-share", type=float, default=0.0, help="share of numbers that answer on WhatsApp")
+    parser.add_argument("--think-seconds", type=float, default=0.0, help="pause between a candidate's turns")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the app")
+    parser.add_argument("--app-port", type=int, default=8765)
+    parser.add_argument("--fakes-port", type=int, default=8766)
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--settle-seconds", type=float, default=30.0,
+                        help="how long to wait for each candidate's final status after the run")
+    parser.add_argument("--log-level", default="WARNING", help="LOG_LEVEL for the app")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the channel mix")
+    parser.add_argument("--output", help="write results here instead of stdout")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or PG_DATABASE_URL is required")
+
+    results = asyncio.run(main(args))
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    incomplete = sum(o["not_completed"] for o in results["outcomes"].values())
+    if incomplete:
+        sys.exit(f"{incomplete} conversations did not complete the interview, see outcomes")
+
+
+if __name__ == "__main__":
+    cli()
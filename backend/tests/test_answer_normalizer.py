@@ -0,0 +1,40 @@
+import pytest
+
+from app.config import constants
+from app.util.answer_normalizer import AnswerNormalizer
+
+normalizer = AnswerNormalizer()
+
+
+@pytest.mark.parametrize("answer", [
+    "no problem", "no worries, happy to", "no bother", "no, no problem", "not a problem", "i wouldn't mind",
+    "yes but i need a visa", "no, but I could get one",
+])
+def test_negative_idioms_are_left_to_the_llm(answer):
+    assert normalizer.normalize_boolean(answer).confidence < constants.ANSWER_NORMALIZER_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("answer, value", [("no", "No"), ("nope, never", "No"), ("no problem, yes", "Yes")])
+def test_boolean_answers(answer, value):
+    result = normalizer.normalize_boolean(answer)
+    assert result.value == value
+    assert result.confidence >= constants.ANSWER_NORMALIZER_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("answer", [
+    "1 or 2 weeks", "2 or 3", "3-4 days", "6 hours", "two weekends", "2 weekdays", "i can do many days",
+    "any day except monday and tuesday", "every day apart from friday", "3 days, mondays off", "half a day",
+    "3 days per fortnight",
+])
+def test_ranges_and_other_units_are_left_to_the_llm(answer):
+    assert normalizer.normalize_days_per_week(answer).confidence < constants.ANSWER_NORMALIZER_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("answer, value", [
+    ("4 days a week", "4"), ("four", "4"), ("mon to fri", "5"), ("Monday and Tuesday", "2"), ("weekdays", "5"),
+    ("every day", "5"),
+])
+def test_days_per_week(answer, value):
+    result = normalizer.normalize_days_per_week(answer)
+    assert result.value == value
+    assert result.confidence >= constants.ANSWER_NORMALIZER_MIN_CONFIDENCE
@@ -0,0 +1,81 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.database.candidate import CandidateCRUD
+from app.util.conversation_actors import CONVERSATION_LOCK_NAMESPACE, ConversationActors
+
+
+def test_sms_whatsapp_and_voice_numbers_share_one_actor():
+    async def scenario():
+        actors = ConversationActors(cross_worker=False)
+        order = []
+
+        async def turn(name, delay):
+            await asyncio.sleep(delay)
+            order.append(name)
+
+        await asyncio.gather(
+            actors.run("whatsapp:+447700900123", lambda: turn("first", 0.02)),
+            actors.run("+44 7700 900123", lambda: turn("second", 0)),
+        )
+        stats = actors.stats()
+        await actors.stop()
+        return order, stats
+
+    order, stats = asyncio.run(scenario())
+    assert order == ["first", "second"]
+    assert stats["started"] == 1
+
+
+def test_cancelled_turn_resolves_its_future():
+    async def scenario():
+        actors = ConversationActors(cross_worker=False)
+
+        async def turn():
+            raise asyncio.CancelledError()
+
+        try:
+            with pytest.raises(asyncio.CancelledError):
+                await asyncio.wait_for(actors.run("+447700900123", turn), timeout=1)
+            # The actor carries on with the next turn
+            return await asyncio.wait_for(actors.run("+447700900123", lambda: asyncio.sleep(0, "ok")), timeout=1)
+        finally:
+            await actors.stop()
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+def test_stop_resolves_turns_still_queued():
+    async def scenario():
+        actors = ConversationActors(cross_worker=False)
+        running = actors.submit("+447700900123", lambda: asyncio.sleep(10))
+        queued = actors.submit("+447700900123", lambda: asyncio.sleep(0))
+        await asyncio.sleep(0)
+        await actors.stop()
+        return running.cancelled(), queued.cancelled()
+
+    assert asyncio.run(scenario()) == (True, True)
+
+
+def test_turns_hold_the_cross_worker_lock(monkeypatch):
+    held = []
+
+    @asynccontextmanager
+    async def conversation_lock(namespace, key):
+        held.append((namespace, key))
+        yield
+        held.remove((namespace, key))
+
+    monkeypatch.setattr(CandidateCRUD, "conversation_lock", conversation_lock)
+
+    async def scenario():
+        actors = ConversationActors()
+        try:
+            return await actors.run("whatsapp:+447700900123", lambda: asyncio.sleep(0, list(held)))
+        finally:
+            await actors.stop()
+
+    assert asyncio.run(scenario()) == [(CONVERSATION_LOCK_NAMESPACE, "+447700900123")]
+    assert held == []
@@ -0,0 +1,26 @@
+import asyncio
+
+from app.database.candidate import CandidateCRUD
+from app.util.evaluation_worker import EvaluationWorker
+
+
+def test_recover_queues_lost_evaluations_once(monkeypatch):
+    async def claim_unevaluated(stale_before, claimed_at):
+        assert stale_before < claimed_at
+        return [1, 2, 3]
+
+    monkeypatch.setattr(CandidateCRUD, "claim_unevaluated", claim_unevaluated)
+
+    async def scenario():
+        worker = EvaluationWorker(interview_bot=None)
+        worker.enqueue(1)
+        # Already waiting for a retry, it must not be evaluated twice
+        worker._retries[3] = asyncio.get_running_loop().call_later(60, lambda: None)
+        recovered = await worker.recover()
+        worker._retries.pop(3).cancel()
+        return recovered, worker.stats()
+
+    recovered, stats = asyncio.run(scenario())
+    assert recovered == 2
+    assert stats["queued"] == 2
+    assert stats["recovered"] == 2
@@ -0,0 +1,21 @@
+import pytest
+
+from app.util.interview_flow import compile_predicate
+
+not_uk_location = compile_predicate({"op": "not_uk_location"})
+
+
+@pytest.mark.parametrize("value, verdict, disqualified", [
+    # The model saw "Perth, Western Australia" and "London, Ontario", only the city survived normalization
+    ("Perth", True, True),
+    ("London", True, True),
+    # and "Paris, Kent"
+    ("Paris", False, False),
+])
+def test_model_verdict_wins_over_the_normalized_value(value, verdict, disqualified):
+    assert not_uk_location(value, verdict) is disqualified
+
+
+@pytest.mark.parametrize("value, disqualified", [("Manchester", False), ("Dublin", True), ("Atlantis", False)])
+def test_locally_normalized_answers_use_the_gazetteer(value, disqualified):
+    assert not_uk_location(value, None) is disqualified
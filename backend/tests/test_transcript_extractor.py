@@ -0,0 +1,36 @@
+from app.util.answer_normalizer import AnswerNormalizer
+from app.util.transcript_extractor import TranscriptExtractor
+
+
+def turn(role, message):
+    return {"role": role, "message": message}
+
+
+def test_extracts_answers_from_the_vapi_script_wording():
+    # Worded the way the assistant prompt in InterviewBot.try_voice_call asks the questions
+    messages = [
+        turn("bot", "Hello, I'm calling from rtribe. You have sent your details to us for school based work so I "
+                    "just wanted to run through some initial questions if that's ok?"),
+        turn("user", "Yes, that's fine."),
+        turn("bot", "Are you eligible to work in the UK?"),
+        turn("user", "Yes."),
+        turn("bot", "How many days per week are you available to work?"),
+        turn("user", "Four days."),
+        turn("bot", "Where do you currently live?"),
+        turn("user", "Manchester."),
+        turn("bot", "Have you previously worked in a supply role?"),
+        turn("user", "Yes."),
+        turn("bot", "Which agency did you work with?"),
+        turn("user", "Teach Supply Agency."),
+        turn("bot", "Do you have any restrictions on your availability due to childcare, study, or other commitments?"),
+        turn("user", "No."),
+        turn("bot", "Do you have a current DBS certificate that is registered on the Update Service?"),
+        turn("user", "Yes, I do."),
+    ]
+
+    answers = {a["question"]: a for a in TranscriptExtractor(AnswerNormalizer()).extract(messages)}
+
+    assert list(answers) == [1, 2, 3, 4, "4_followup", 5, 6]
+    assert answers[2]["raw"] == "Four days."
+    assert answers[3]["raw"] == "Manchester."
+    assert answers["4_followup"]["raw"] == "Teach Supply Agency."
@@ -0,0 +1,26 @@
+import pytest
+
+from app.util.uk_gazetteer import get_gazetteer
+
+gazetteer = get_gazetteer()
+
+
+@pytest.mark.parametrize("location", ["Birmingham, Alabama", "Richmond Virginia", "Canterbury New Zealand", "Paris, Kent"])
+def test_mixed_uk_and_non_uk_names_are_left_to_the_llm(location):
+    assert gazetteer.lookup(location) is None
+
+
+@pytest.mark.parametrize("location", [
+    "Not in the UK", "not uk", "Outside the UK", "I live abroad, not in England", "Kent, Washington",
+    "I don't live in England", "no longer in Leeds",
+])
+def test_negated_or_foreign_qualified_answers_are_left_to_the_llm(location):
+    assert gazetteer.lookup(location) is None
+
+
+@pytest.mark.parametrize("location, in_uk", [
+    ("Manchester", True), ("Maidstone, Kent", True), ("Kent", True), ("SW1A 1AA", True),
+    ("Paris", False), ("Austin, Texas", False), ("Dublin", False),
+])
+def test_lookup(location, in_uk):
+    assert gazetteer.lookup(location) is in_uk